@@ -0,0 +1,213 @@
+"""
+Benchmarks for the scheduling core and the export path. Runs headless.
+
+    python benchmark.py                       # Data.csv at 1x, 10x and 100x
+    python benchmark.py --scales 1 10 --out results.json
+    python benchmark.py --compare results.json
+
+Larger catalogs are made by replicating every program of Data.csv under
+new names (BSCS~2, BSCS~3, ...), so the course mix stays realistic while
+the number of programs, sections and room demand grows with the scale.
+--synthetic N adds a full run over a synthetic.py catalog of N programs.
+
+Each case reports throughput (sections or calls per second), peak traced
+memory, and for full runs the placement rate (placed / requested courses).
+Results are written as JSON tagged with the current git commit, and
+--compare prints the change against a previous results file.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from scheduler import (
+    CourseCatalog, SlotGrid, balance_and_shuffle_courses,
+    generate_schedule, get_available_rooms, get_consecutive_time_slots, room_pools
+)
+from export import export_workbook
+from synthetic import write_synthetic_catalog
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data.csv")
+YEARS = ["First", "Second", "Third"]
+
+
+def scale_dataframe(df: pd.DataFrame, factor: int) -> pd.DataFrame:
+    """
+    Data.csv with every program repeated factor times under new names.
+    The shared BSIT rows are not copied: the BSIT fallback only applies to
+    the original specialization names, so copies of BSIT specializations
+    have no courses in the fallback (year, trimester) combos.
+    """
+    if factor <= 1:
+        return df
+    copies = [df]
+    for i in range(2, factor + 1):
+        copy = df[df['Program'] != 'BSIT'].copy()
+        copy['Program'] = copy['Program'] + f"~{i}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def section_counts_for(catalog: CourseCatalog, per_year: int) -> Dict[str, Dict[str, int]]:
+    # BSIT itself is only a fallback source, not an offered program
+    programs = sorted({program for program, _, _ in catalog.index if program != 'BSIT'})
+    return {program: {year: per_year for year in YEARS} for program in programs}
+
+
+def measure(fn: Callable[[], int], repeat: int = 3) -> Dict[str, float]:
+    """
+    Best-of-repeat wall time for fn (which returns how many units it did),
+    plus the peak traced memory of one extra run.
+    """
+    best = float('inf')
+    units = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        units = fn()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'seconds': best,
+        'units': units,
+        'per_second': units / best if best > 0 else float('inf'),
+        'peak_kib': peak / 1024,
+    }
+
+
+def run_benchmarks(scales: List[int], sections_per_year: int, repeat: int,
+                   trimester: str = "Second", seed: int = 1,
+                   synthetic_programs: int = 0) -> Dict[str, Dict[str, float]]:
+    base = pd.read_csv(DATA_CSV)
+    results = {}
+
+    # Micro-benchmarks on the bundled catalog
+    catalog = CourseCatalog.from_dataframe(base)
+    courses = [c for group in catalog.index.values() for c in group]
+    pools = room_pools(frozenset(catalog.rooms))
+
+    def slots():
+        grid = SlotGrid()
+        grid.mark_used(3, True)
+        for _ in range(10000):
+            get_consecutive_time_slots(grid, True, 2)
+        return 10000
+    results['get_consecutive_time_slots'] = measure(slots, repeat)
+
+    def rooms():
+        for c in courses:
+            get_available_rooms(c, catalog.rooms, "First", trimester, pools=pools)
+        return len(courses)
+    results['get_available_rooms'] = measure(rooms, repeat)
+
+    def lookups():
+        n = 0
+        for program, year, tri in catalog.index:
+            catalog.get_courses(program, year, tri)
+            n += 1
+        return n
+    results['catalog_lookup'] = measure(lookups, repeat)
+
+    def balance():
+        n = 0
+        for (program, year, tri), group in catalog.index.items():
+            balance_and_shuffle_courses(group, year, tri)
+            n += 1
+        return n
+    results['balance_and_shuffle_courses'] = measure(balance, repeat)
+
+    catalogs = [(f"x{scale}", scale_dataframe(base, scale)) for scale in scales]
+    if synthetic_programs:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "synthetic.csv")
+            write_synthetic_catalog(path, programs=synthetic_programs, seed=seed)
+            catalogs.append((f"synthetic{synthetic_programs}", pd.read_csv(path)))
+
+    # Full runs (catalog build, generation, export) per catalog
+    for label, df in catalogs:
+
+        def build():
+            CourseCatalog.from_dataframe(df)
+            return len(df)
+        results[f'catalog_build_{label}'] = measure(build, repeat)
+
+        scaled = CourseCatalog.from_dataframe(df)
+        counts = section_counts_for(scaled, sections_per_year)
+        sections = []
+
+        def generate():
+            sections[:] = generate_schedule(scaled, counts, trimester, seed=seed)
+            return len(sections)
+        result = measure(generate, repeat)
+        requested = sum(len(scaled.get_courses(s.program, s.year, trimester)) for s in sections)
+        placed = sum(len(s.courses) for s in sections)
+        result['placement_rate'] = placed / requested if requested else 1.0
+        results[f'generate_{label}'] = result
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.xlsx")
+
+            def export():
+                export_workbook(sections, path)
+                return len(sections)
+            results[f'export_xlsx_{label}'] = measure(export, repeat)
+
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(DATA_CSV)).stdout.strip()
+    except OSError:
+        return ""
+
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]] = None):
+    print(f"{'case':32} {'per sec':>12} {'seconds':>9} {'peak KiB':>10} {'placed':>7} {'vs base':>8}")
+    for name, r in results.items():
+        rate = f"{r['placement_rate']:.1%}" if 'placement_rate' in r else ""
+        change = ""
+        if baseline and name in baseline and baseline[name]['per_second']:
+            change = f"{r['per_second'] / baseline[name]['per_second']:.2f}x"
+        print(f"{name:32} {r['per_second']:12.1f} {r['seconds']:9.4f} {r['peak_kib']:10.1f} "
+              f"{rate:>7} {change:>8}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark schedule generation and export.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="catalog scale factors for full runs")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="PROGRAMS",
+                        help="also run on a synthetic catalog with this many programs")
+    parser.add_argument("--sections", type=int, default=3, help="sections per program and year")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best is kept")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scales, args.sections, args.repeat,
+                             synthetic_programs=args.synthetic)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'commit': git_commit(), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
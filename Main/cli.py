@@ -0,0 +1,386 @@
+"""
+Command-line entry point for generating schedules without the GUI.
+
+    python cli.py generate --csv Data.csv --sections config.json \
+        --trimester Second --out sched.xlsx
+
+    python cli.py validate sched.xlsx
+
+    python cli.py reschedule sched.xlsx --csv Data.csv --group A \
+        --program BSCS --section 2B --out sched-edited.xlsx
+
+    python cli.py diff sched.xlsx sched-edited.xlsx
+
+The output format follows the --out extension: .xlsx, .csv or .jsonl.
+generate lists the catalog courses that could not be placed (no eligible
+room or free slot) and records them in the workbook's Run Info sheet.
+validate checks an exported workbook for room double-bookings, section
+overlaps, split lec/lab pairs and rooms of the wrong class, and exits
+with status 1 when it finds any. reschedule re-places one section of an
+exported workbook from the current catalog and keeps every other section
+as it is (see reschedule.py). diff lists the course placements that
+differ between two exported workbooks and exits with status 1 if any do.
+
+The sections file is JSON mapping program -> year -> number of sections,
+e.g. {"BSCS": {"First": 3, "Second": 2}}. Programs or years left out get
+no sections. Without --sections every program/year in PROGRAM_YEARS gets
+three sections, the GUI default.
+
+--faculty assigns instructors after placement from a CSV with columns
+Name, Max_Units and Courses (codes separated by ';'), and adds an
+INSTRUCTOR column to the output.
+
+--time-grid (every command) replaces the standard 9-slot, 80-minute grid
+with one from a JSON file; see scheduler.TimeGrid.from_config, e.g.
+{"slots": ["8:00am", "9:00am", ...], "duration": 50,
+ "durations": {"MW": 75, "TTH": 75}}. validate and reschedule otherwise
+use the grid recorded in the workbook's Run Info sheet.
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+from scheduler import (
+    GROUPS, PROGRAM_YEARS, GROUP_MODES, SectionSchedule, iter_sections,
+    balance_and_shuffle_courses, load_time_grid, new_seed, set_time_grid
+)
+from export import export_sections, run_metadata
+from faculty import assign_faculty
+from ingest import load_catalog_cached, load_faculty
+from instrument import RunStats, collecting, run_profiled, write_report
+from schedule_cache import ScheduleCache
+from validate import UnplacedCourses, validate_workbook
+from solver import solve_section_courses, DEFAULT_TIME_BUDGET
+from quality import BestOfN
+from optimizer import optimize_schedule
+from reschedule import find_section, reschedule_section
+from workbook import (
+    diff_sections, iter_sections as read_sections, read_metadata, read_workbook, recorded_time_grid
+)
+
+ENGINES = {
+    "greedy": balance_and_shuffle_courses,
+    "solver": solve_section_courses,
+}
+
+
+def default_section_counts(count: int = 3) -> Dict[str, Dict[str, int]]:
+    return {program: {year: count for year in years} for program, years in PROGRAM_YEARS.items()}
+
+
+def load_section_counts(path: str) -> Dict[str, Dict[str, int]]:
+    with open(path) as f:
+        return section_counts_from_config(json.load(f))
+
+
+def section_counts_from_config(config: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+    # Keep the GUI's program/year order so workbooks look the same
+    counts = {}
+    for program, years in PROGRAM_YEARS.items():
+        if program in config:
+            counts[program] = {y: int(config[program][y]) for y in years if y in config[program]}
+    for program, year_dict in config.items():
+        if program not in counts:
+            counts[program] = {y: int(n) for y, n in year_dict.items()}
+    return counts
+
+
+def report_path(out_path: str, suffix: str) -> str:
+    return os.path.splitext(out_path)[0] + suffix
+
+
+def run_generate(csv_path: str, out_path: str, trimester: str,
+                 section_counts: Dict[str, Dict[str, int]] = None, workers: int = 1,
+                 engine: str = "greedy", time_budget: float = DEFAULT_TIME_BUDGET,
+                 seed: int = None, share_rooms: bool = True, candidates: int = 1,
+                 candidate_budget: float = 0.1, optimize: float = 0.0,
+                 use_cache: bool = True, cache_dir: str = None,
+                 group_mode: str = "shared", report: bool = False,
+                 profile: bool = False, faculty_path: str = None) -> Dict[str, object]:
+    """
+    Generate and export one schedule, streaming each section to out_path
+    as it is placed. The format follows the extension (.xlsx, .csv, .jsonl).
+    With optimize > 0 the whole run is kept in memory and improved by the
+    local-search optimizer for that many seconds before export.
+    The seed (drawn fresh when not given) is recorded in the workbook.
+    The catalog is validated on import and cached unless use_cache is False.
+    With cache_dir, placed sections are kept there and reused by later runs
+    with the same catalog, seed and engine settings.
+    report writes phase timings, skip reasons and slot use as JSON next to
+    out_path (sched.report.json); profile also runs everything under
+    cProfile and saves the raw profile as sched.prof.
+    faculty_path assigns instructors to the whole run before export.
+    Courses the engine could not place are listed in the workbook's Run
+    Info. Returns a summary: sections written, the UnplacedCourses and,
+    with cache_dir, how many sections were reused from the cache.
+    """
+    if section_counts is None:
+        section_counts = default_section_counts()
+    if seed is None:
+        seed = new_seed()
+    run_stats = RunStats()
+    metadata = run_metadata(seed, trimester, engine, group_mode)
+    written = 0
+    unplaced = None
+
+    def run():
+        nonlocal written, unplaced
+        with run_stats.phase("ingest"):
+            catalog = load_catalog_cached(csv_path, use_cache=use_cache)
+            faculty = load_faculty(faculty_path) if faculty_path else None
+        unplaced = UnplacedCourses(catalog)
+        place = ENGINES[engine]
+        if place is solve_section_courses:
+            place = functools.partial(solve_section_courses, time_budget=time_budget)
+        if candidates > 1:
+            place = BestOfN(place, candidates, candidate_budget)
+        cache = ScheduleCache(directory=cache_dir) if cache_dir and use_cache else None
+        generating = 0.0
+
+        def counted():
+            nonlocal written, generating
+            sections = iter_sections(catalog, section_counts, trimester, workers, seed, place,
+                                     share_rooms, cache, group_mode)
+            while True:
+                started = time.perf_counter()
+                section = next(sections, None)
+                generating += time.perf_counter() - started
+                if section is None:
+                    # Before the exporter writes Run Info
+                    unplaced.record(metadata)
+                    return
+                written += 1
+                unplaced.add(section)
+                yield section
+
+        sections = counted()
+        if optimize > 0:
+            sections = list(sections)
+            with run_stats.phase("optimize"):
+                # The time budget alone decides how long the optimizer runs
+                result = optimize_schedule(sections, catalog, iterations=None,
+                                           time_budget=optimize, seed=seed)
+            metadata["Optimized Cost"] = f"{result['initial_cost']:g} -> {result['final_cost']:g}"
+            # The optimizer inserts and drops courses, so count what it left
+            unplaced = UnplacedCourses(catalog)
+            for section in sections:
+                unplaced.add(section)
+            unplaced.record(metadata)
+        if faculty is not None:
+            sections = list(sections)
+            with run_stats.phase("faculty"):
+                result = assign_faculty(sections, faculty)
+            metadata["Faculty"] = (f"{result['assigned']} of "
+                                   f"{result['assigned'] + result['unassigned']} courses assigned")
+        # Streaming interleaves generation with writing; only the writing is export
+        export_started = time.perf_counter()
+        generating_before = generating
+        export_sections(sections, out_path, metadata)
+        run_stats.add_time("export", time.perf_counter() - export_started
+                           - (generating - generating_before))
+        run_stats.add_time("generate", generating)
+        if cache is not None:
+            # After export, so this only goes into the report
+            metadata["Cache Hits"] = cache.hits
+
+    with collecting(run_stats if report or profile else None):
+        if profile:
+            run_profiled(run, report_path(out_path, ".prof"), run_stats)
+        else:
+            run()
+    if report or profile:
+        write_report(run_stats, report_path(out_path, ".report.json"), metadata)
+    return {"written": written, "unplaced": unplaced, "cache_hits": metadata.get("Cache Hits")}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate subject offering schedules.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="generate sections and export a workbook")
+    gen.add_argument("--csv", required=True, help="course catalog CSV")
+    gen.add_argument("--sections", help="JSON file of program -> year -> section count")
+    gen.add_argument("--trimester", default="First", choices=["First", "Second", "Third"])
+    gen.add_argument("--out", required=True, help="output path (.xlsx, .csv or .jsonl)")
+    gen.add_argument("--workers", type=int, default=1,
+                     help="generate sections in N processes (rooms are not shared across sections)")
+    gen.add_argument("--candidates", type=int, default=1,
+                     help="generate N candidates per section and keep the best scoring one")
+    gen.add_argument("--candidate-budget", type=float, default=0.1,
+                     help="seconds per section for generating candidates")
+    gen.add_argument("--optimize", type=float, default=0.0, metavar="SECONDS",
+                     help="run the local-search optimizer over the whole run before export")
+    gen.add_argument("--seed", type=int, help="seed for a reproducible schedule")
+    gen.add_argument("--no-shared-rooms", dest="share_rooms", action="store_false",
+                     help="place rooms per section only (what --workers does)")
+    gen.add_argument("--group-mode", default="shared", choices=GROUP_MODES,
+                     help="groups share all rooms, split the rooms, or split the day "
+                          "(morning/afternoon); split modes run groups in parallel with --workers")
+    gen.add_argument("--engine", default="greedy", choices=sorted(ENGINES),
+                     help="placement engine: random greedy or constraint solver")
+    gen.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET,
+                     help="solver search seconds per section")
+    gen.add_argument("--report", action="store_true",
+                     help="write timings, skip reasons and slot use to <out>.report.json")
+    gen.add_argument("--profile", action="store_true",
+                     help="also profile the run with cProfile (<out>.prof); implies --report")
+    gen.add_argument("--no-cache", dest="use_cache", action="store_false",
+                     help="ignore the catalog and section caches")
+    gen.add_argument("--cache-dir", help="keep placed sections here and reuse them in later runs")
+    gen.add_argument("--time-grid", help="JSON file of slot times, meeting lengths and day patterns")
+    gen.add_argument("--faculty", help="faculty CSV (Name, Max_Units, Courses) to assign instructors from")
+
+    val = sub.add_parser("validate", help="check an exported workbook for conflicts")
+    val.add_argument("workbook", help="exported .xlsx schedule")
+    val.add_argument("--time-grid", help="time grid the workbook was generated with")
+
+    res = sub.add_parser("reschedule", help="re-place one section of an exported workbook")
+    res.add_argument("workbook", help="exported .xlsx schedule")
+    res.add_argument("--csv", required=True, help="course catalog CSV, with the edits")
+    res.add_argument("--group", default=GROUPS[0], choices=GROUPS)
+    res.add_argument("--program", required=True)
+    res.add_argument("--section", required=True, help='section name, e.g. "2B"')
+    res.add_argument("--out", required=True, help="output path (.xlsx, .csv or .jsonl)")
+    res.add_argument("--seed", type=int, help="seed for a reproducible edit")
+    res.add_argument("--engine", default="greedy", choices=sorted(ENGINES))
+    res.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET,
+                     help="solver engine: seconds of search for the section")
+    res.add_argument("--group-mode", choices=GROUP_MODES,
+                     help="group mode the workbook was generated with (default: from Run Info)")
+    res.add_argument("--no-cache", dest="use_cache", action="store_false",
+                     help="ignore the catalog cache")
+    res.add_argument("--time-grid", help="time grid the workbook was generated with")
+
+    diff = sub.add_parser("diff", help="list placements that differ between two workbooks")
+    diff.add_argument("before", help="exported .xlsx schedule")
+    diff.add_argument("after", help="exported .xlsx schedule")
+    return parser
+
+
+def print_unplaced(unplaced: UnplacedCourses):
+    print(unplaced.summary())
+    for line in unplaced.lines():
+        print(f"  {line}")
+
+
+def run_validate(workbook_path: str) -> int:
+    """
+    Print every issue in an exported workbook and return how many there are.
+    """
+    issues = validate_workbook(workbook_path)
+    for issue in issues:
+        print(f"{issue.kind}: {issue.section}: {issue.code} {issue.days} {issue.time} "
+              f"{issue.room}: {issue.detail}")
+    counts = Counter(issue.kind for issue in issues)
+    summary = ", ".join(f"{count} {kind}" for kind, count in counts.items()) or "no issues"
+    print(f"{workbook_path}: {summary}")
+    return len(issues)
+
+
+def run_reschedule(workbook_path: str, csv_path: str, out_path: str, group: str,
+                   program: str, section_name: str, seed: int = None, engine: str = "greedy",
+                   time_budget: float = DEFAULT_TIME_BUDGET, group_mode: str = None,
+                   use_cache: bool = True) -> SectionSchedule:
+    """
+    Re-place one section of an exported workbook and export the result to
+    out_path, keeping the workbook's Run Info. group_mode defaults to the
+    one recorded there. Returns the new section.
+    """
+    if seed is None:
+        seed = new_seed()
+    catalog = load_catalog_cached(csv_path, use_cache=use_cache)
+    sections, metadata = read_workbook(workbook_path)
+    if group_mode is None:
+        group_mode = metadata.get("Groups") or "shared"
+    target = find_section(sections, group, program, section_name)
+    place = ENGINES[engine]
+    if place is solve_section_courses:
+        place = functools.partial(solve_section_courses, time_budget=time_budget)
+    edited = reschedule_section(sections, catalog, target, seed, place, group_mode)
+    metadata["Rescheduled"] = f"Group {group}: {edited.title}"
+    metadata["Reschedule Seed"] = seed
+    unplaced = UnplacedCourses(catalog)
+    for section in sections:
+        unplaced.add(section)
+    unplaced.record(metadata)
+    export_sections(sections, out_path, metadata)
+    return edited
+
+
+def run_diff(before_path: str, after_path: str) -> int:
+    """
+    Print every placement that differs between two workbooks and return
+    how many there are.
+    """
+    def placement(p):
+        return " ".join(p) if p is not None else "-"
+
+    changes = diff_sections(list(read_sections(before_path)), list(read_sections(after_path)))
+    for change in changes:
+        print(f"{change.section}: {change.code}: {placement(change.before)} -> "
+              f"{placement(change.after)}")
+    print(f"{len(changes)} changed placements")
+    return len(changes)
+
+
+def fail(message: str) -> int:
+    print(f"Error: {message}", file=sys.stderr)
+    return 2
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, "time_grid", None):
+        try:
+            set_time_grid(load_time_grid(args.time_grid))
+        except (OSError, ValueError) as e:
+            return fail(f"bad time grid {args.time_grid}: {e}")
+    elif args.command in ("validate", "reschedule"):
+        try:
+            metadata = read_metadata(args.workbook)
+        except (OSError, ValueError) as e:
+            return fail(str(e))
+        try:
+            grid = recorded_time_grid(metadata)
+        except ValueError as e:
+            return fail(f"bad time grid recorded in {args.workbook}: {e}")
+        if grid is not None:
+            set_time_grid(grid)
+
+    # Unreadable inputs (missing files, CSVs that fail validation, files
+    # that are not workbooks) end the run with a message, not a traceback
+    try:
+        if args.command == "generate":
+            counts = load_section_counts(args.sections) if args.sections else None
+            result = run_generate(args.csv, args.out, args.trimester, counts, args.workers,
+                                  args.engine, args.time_budget, args.seed, args.share_rooms,
+                                  args.candidates, args.candidate_budget, args.optimize,
+                                  args.use_cache, args.cache_dir, args.group_mode,
+                                  args.report, args.profile, args.faculty)
+            print(f"Wrote {result['written']} sections to {args.out}")
+            if result["cache_hits"] is not None:
+                print(f"Reused {result['cache_hits']} of {result['written']} sections from the cache")
+            print_unplaced(result["unplaced"])
+        elif args.command == "validate":
+            return 1 if run_validate(args.workbook) else 0
+        elif args.command == "diff":
+            return 1 if run_diff(args.before, args.after) else 0
+        elif args.command == "reschedule":
+            started = time.perf_counter()
+            edited = run_reschedule(args.workbook, args.csv, args.out, args.group, args.program,
+                                    args.section, args.seed, args.engine, args.time_budget,
+                                    args.group_mode, args.use_cache)
+            print(f"Rescheduled {len(edited.courses)} courses of Group {args.group}: {edited.title} "
+                  f"in {(time.perf_counter() - started) * 1000:.0f} ms; wrote {args.out}")
+    except (OSError, ValueError) as e:
+        return fail(str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
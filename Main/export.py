@@ -0,0 +1,137 @@
+"""
+Exporters for generated sections. Every exporter consumes sections as an
+iterable and writes them out as they arrive, so memory stays flat however
+many sections are configured.
+
+The .xlsx layout is one sheet per group, each section written as a title
+row, a column header row, the MWF courses, a separator and the TTH
+courses. The .csv and .jsonl formats write one flat record per course.
+"""
+import csv
+import json
+import openpyxl
+from typing import Dict, Iterable, Iterator
+
+from scheduler import SectionSchedule, TimeGrid, time_grid
+
+HEADERS = ["COURSE CODE", "DESCRIPTION", "UNITS", "TIME", "DAYS", "ROOM"]
+# Added after HEADERS for sections with assigned instructors
+INSTRUCTOR_HEADER = "INSTRUCTOR"
+MWF_SEPARATOR = "----- End of MWF Schedule -----"
+
+RUN_INFO_SHEET = "Run Info"
+
+RECORD_FIELDS = ["Group", "Program", "Year_Level", "Trimester", "Section",
+                 "Course_Code", "Description", "Units", "Time", "Days", "Room", "Instructor"]
+
+
+def run_metadata(seed: int, trimester: str, engine: str = "greedy",
+                 group_mode: str = "shared") -> Dict[str, object]:
+    """
+    The Run Info a generated workbook starts with: what reschedule and
+    validate need to redo or check the run. The time grid is only recorded
+    when it is not the standard one.
+    """
+    metadata = {"Seed": seed, "Trimester": trimester, "Engine": engine, "Groups": group_mode}
+    grid = time_grid().to_config()
+    if grid != TimeGrid().to_config():
+        metadata["Time Grid"] = json.dumps(grid)
+    return metadata
+
+
+def _course_row(c, instructor: bool = True) -> list:
+    row = [c.code, c.description, c.units, c.time, c.days, c.room]
+    if instructor:
+        row.append(c.instructor)
+    return row
+
+
+def section_rows(section: SectionSchedule) -> Iterator[list]:
+    """
+    Rows of one section in workbook layout, ending with the blank spacer row.
+    """
+    has_instructors = any(c.instructor for c in section.courses)
+    yield [section.title]
+    yield HEADERS + [INSTRUCTOR_HEADER] if has_instructors else HEADERS
+
+    mwf_courses = section.mwf_courses
+    tth_courses = section.tth_courses
+
+    for c in mwf_courses:
+        yield _course_row(c, has_instructors)
+
+    if mwf_courses and tth_courses:
+        yield [MWF_SEPARATOR]
+
+    for c in tth_courses:
+        yield _course_row(c, has_instructors)
+
+    yield []
+
+
+def course_records(section: SectionSchedule) -> Iterator[list]:
+    for c in section.mwf_courses + section.tth_courses:
+        yield [section.group, section.program, section.year, section.trimester,
+               section.section_name] + _course_row(c)
+
+
+def export_workbook(sections: Iterable[SectionSchedule], file_path: str,
+                    metadata: Dict[str, object] = None):
+    """
+    Stream sections into a write-only workbook, opening a new sheet
+    whenever the group changes. metadata (e.g. the seed) is written as
+    key/value rows on a trailing "Run Info" sheet.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    sheets = {}
+
+    for section in sections:
+        ws = sheets.get(section.group)
+        if ws is None:
+            ws = sheets[section.group] = wb.create_sheet(f"Group {section.group}")
+        for row in section_rows(section):
+            ws.append(row)
+
+    if metadata:
+        info = wb.create_sheet(RUN_INFO_SHEET)
+        for key, value in metadata.items():
+            info.append([key, value])
+
+    wb.save(file_path)
+
+
+def export_csv(sections: Iterable[SectionSchedule], file_path: str,
+               metadata: Dict[str, object] = None):
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(RECORD_FIELDS)
+        for section in sections:
+            writer.writerows(course_records(section))
+
+
+def export_jsonl(sections: Iterable[SectionSchedule], file_path: str,
+                 metadata: Dict[str, object] = None):
+    with open(file_path, 'w') as f:
+        for section in sections:
+            for record in course_records(section):
+                f.write(json.dumps(dict(zip(RECORD_FIELDS, record)), default=int) + "\n")
+
+
+EXPORTERS = {
+    '.xlsx': export_workbook,
+    '.csv': export_csv,
+    '.jsonl': export_jsonl,
+}
+
+
+def export_sections(sections: Iterable[SectionSchedule], file_path: str,
+                    metadata: Dict[str, object] = None):
+    """
+    Export with the format picked from the file extension. Only workbooks
+    have room for metadata; the flat record formats leave it out.
+    """
+    for suffix, exporter in EXPORTERS.items():
+        if file_path.lower().endswith(suffix):
+            return exporter(sections, file_path, metadata)
+    raise ValueError(f"Unsupported export format: {file_path} "
+                     f"(expected one of {', '.join(EXPORTERS)})")
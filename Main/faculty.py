@@ -0,0 +1,294 @@
+"""
+Faculty loading: give every placed course of a run an instructor.
+
+Runs after placement (balance_and_shuffle_courses or any other engine)
+over the whole run at once, since one instructor teaches across sections
+and groups. An instructor only takes courses on their qualified list, at
+most max_units units in all (Course.units), and never two courses that
+meet on a shared day at overlapping times.
+
+Courses are placed one at a time along cheapest augmenting paths, in
+the style of a min-cost flow: an instructor takes the course directly or
+passes one of their own courses on to another instructor, and so on.
+Units and overlaps are checked on every arc as the path is searched.
+Costs grow with the square of each instructor's share of max_units and
+drop when the instructor already teaches the other half of a lec/lab
+pair. This is a heuristic with search budgets (MAX_CHAIN,
+MAX_EXPANSIONS, FINAL_EXPANSIONS), so a course can stay unassigned even
+when another assignment would have placed it.
+"""
+import heapq
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from scheduler import BASE_SLOTS, Course, SectionSchedule, day_mask
+
+# Cost of a full load; a half-loaded instructor costs a quarter of this
+LOAD_WEIGHT = 10.0
+# Discount for teaching the lecture and the lab of one pair
+PAIR_BONUS = 5.0
+# Cost per hand-off, so shorter chains win ties
+EJECT_COST = 1.0
+
+MAX_CHAIN = 4
+# Search states per course before settling for the best path found
+MAX_EXPANSIONS = 50
+# Courses an instructor may give up per step of a chain, most movable first
+MAX_GIVE_UPS = 2
+# Search states per course of the run for the last, uncapped pass
+FINAL_EXPANSIONS = 10
+
+# Bits per slot in a footprint, one per DAY_BITS weekday
+WEEKDAYS = 7
+
+
+class Instructor(NamedTuple):
+    name: str
+    max_units: int
+    courses: FrozenSet[str]
+
+    def qualified(self, course: Course) -> bool:
+        return course.code in self.courses or course.base_code in self.courses
+
+
+def footprint(course: Course) -> int:
+    """
+    Bitmask of the (slot, weekday) cells a course meets in. Slot k covers
+    the time from its start to the next slot's start, so two courses that
+    overlap in time always share a cell; on-grid courses share one only
+    if they really overlap.
+    """
+    mask = day_mask(course.days)
+    cells = 0
+    for k, slot in enumerate(BASE_SLOTS):
+        begins = slot.start_minute if k > 0 else -1
+        ends = BASE_SLOTS[k + 1].start_minute if k + 1 < len(BASE_SLOTS) else 24 * 60
+        if begins < course.end_minute and course.start_minute < ends:
+            cells |= mask << (k * WEEKDAYS)
+    return cells
+
+
+class FacultyAssigner:
+    """
+    Assignment state for one run: who teaches each course (owner), each
+    instructor's courses, units and busy cells, and the augmenting-path
+    search. Courses are referred to by index into self.courses.
+    """
+    def __init__(self, sections: Iterable[SectionSchedule], faculty: List[Instructor]):
+        self.faculty = list(faculty)
+        self.courses: List[Course] = []
+        pair_groups: Dict[Tuple[int, str], List[int]] = {}
+        for sid, section in enumerate(sections):
+            for c in section.courses:
+                if not c.time:
+                    continue
+                if c.is_lec or c.is_lab:
+                    pair_groups.setdefault((sid, c.pair_key), []).append(len(self.courses))
+                self.courses.append(c)
+
+        n = len(self.courses)
+        self.units = [c.units for c in self.courses]
+        self.cells = [footprint(c) for c in self.courses]
+        self.partners: List[List[int]] = [[] for _ in range(n)]
+        for group in pair_groups.values():
+            for i in group:
+                self.partners[i] = [j for j in group if j != i]
+
+        by_code: Dict[str, List[int]] = {}
+        for f, instructor in enumerate(self.faculty):
+            for code in instructor.courses:
+                by_code.setdefault(code, []).append(f)
+        self.qualified = [
+            sorted(set(by_code.get(c.code, ())) | set(by_code.get(c.base_code, ())))
+            for c in self.courses
+        ]
+        # Courses with more qualified instructors are easier to hand on
+        self.mobility = [-len(q) for q in self.qualified]
+
+        self.owner = [-1] * n
+        self.load = [0] * len(self.faculty)
+        self.teaching: List[set] = [set() for _ in self.faculty]
+        self.busy = [0] * len(self.faculty)
+        # Search states expanded so far, across every search
+        self.expansions = 0
+
+    def teaches_partner(self, f: int, i: int, excluding: int = None) -> bool:
+        return any(self.owner[p] == f for p in self.partners[i] if p != excluding)
+
+    def marginal(self, f: int, i: int, removed: int = None) -> float:
+        """
+        Cost change of f taking course i, giving up removed if given.
+        """
+        limit = self.faculty[f].max_units
+        before = self.load[f]
+        after = before + self.units[i] - (self.units[removed] if removed is not None else 0)
+        cost = LOAD_WEIGHT * (after * after - before * before) / (limit * limit)
+        if self.teaches_partner(f, i, removed):
+            cost -= PAIR_BONUS
+        if removed is not None and self.teaches_partner(f, removed, removed):
+            cost += PAIR_BONUS
+        return cost
+
+    def assign(self, i: int, f: int):
+        self.owner[i] = f
+        self.load[f] += self.units[i]
+        self.teaching[f].add(i)
+        self.busy[f] |= self.cells[i]
+
+    def unassign(self, i: int):
+        f = self.owner[i]
+        self.owner[i] = -1
+        self.load[f] -= self.units[i]
+        self.teaching[f].discard(i)
+        self.busy[f] &= ~self.cells[i]
+
+    def shortest_path(self, start: int, max_chain: int = MAX_CHAIN,
+                      max_expansions: Optional[int] = MAX_EXPANSIONS,
+                      max_give_ups: Optional[int] = MAX_GIVE_UPS, dead: set = None
+                      ) -> Optional[Tuple[Tuple[int, Optional[int]], ...]]:
+        """
+        Cheapest chain ((instructor, course they give up), ...) that places
+        start, ending with (instructor, None); None if there is none.
+        max_expansions and max_give_ups of None search without that cap.
+        Courses in dead are never handed on; when the search exhausts every
+        state without a chain, every course it reached is added to dead.
+        """
+        best_cost, best_chain = None, None
+        labels = {start: 0.0}
+        heap = [(0.0, 0, start, ())]
+        pushed = 1
+        expanded = 0
+        while heap and (max_expansions is None or expanded < max_expansions):
+            g, _, i, chain = heapq.heappop(heap)
+            if best_cost is not None and g >= best_cost:
+                break
+            if g > labels.get(i, g):
+                continue
+            expanded += 1
+            self.expansions += 1
+            moved = {start}.union(d for _, d in chain)
+            # Load and busy cells of the instructors the chain already changes
+            load, busy = self.chain_state(start, chain)
+            cells, units = self.cells[i], self.units[i]
+            for f in self.qualified[i]:
+                limit = self.faculty[f].max_units
+                clashing = busy.get(f, self.busy[f]) & cells
+                f_load = load.get(f, self.load[f])
+                if not clashing and f_load + units <= limit:
+                    cost = g + self.marginal(f, i)
+                    if best_cost is None or cost < best_cost:
+                        best_cost, best_chain = cost, chain + ((f, None),)
+                    continue
+                if len(chain) >= max_chain:
+                    continue
+                # Room is made by giving up the one clashing course, or any
+                # course if f is only out of units
+                if clashing:
+                    give_ups = [d for d in self.teaching[f] if d not in moved and self.cells[d] & cells]
+                    # Courses f took earlier in the chain cannot be given up
+                    if len(give_ups) != 1 or clashing & ~self.cells[give_ups[0]]:
+                        continue
+                else:
+                    give_ups = sorted(self.teaching[f], key=self.mobility.__getitem__)
+                give_ups = [d for d in give_ups if d not in moved and self.mobility[d] < -1
+                            and f_load - self.units[d] + units <= limit][:max_give_ups]
+                for d in give_ups:
+                    if dead is not None and d in dead:
+                        continue
+                    cost = g + self.marginal(f, i, d) + EJECT_COST
+                    if cost < labels.get(d, float('inf')):
+                        labels[d] = cost
+                        heapq.heappush(heap, (cost, pushed, d, chain + ((f, d),)))
+                        pushed += 1
+        if best_chain is None and dead is not None and not heap:
+            dead.update(labels)
+        return best_chain
+
+    def chain_state(self, start: int, chain: Tuple[Tuple[int, Optional[int]], ...]
+                    ) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Load and busy cells, after the chain, of the instructors it touches.
+        An instructor may appear in a chain more than once, taking one
+        course early on and another one later.
+        """
+        load: Dict[int, int] = {}
+        busy: Dict[int, int] = {}
+        moving = start
+        for f, given_up in chain:
+            load[f] = load.get(f, self.load[f]) + self.units[moving]
+            busy[f] = busy.get(f, self.busy[f])
+            if given_up is not None:
+                load[f] -= self.units[given_up]
+                busy[f] &= ~self.cells[given_up]
+            busy[f] |= self.cells[moving]
+            moving = given_up
+        return load, busy
+
+    def augment(self, start: int, max_chain: int = MAX_CHAIN,
+                max_expansions: Optional[int] = MAX_EXPANSIONS,
+                max_give_ups: Optional[int] = MAX_GIVE_UPS, dead: set = None) -> bool:
+        chain = self.shortest_path(start, max_chain, max_expansions, max_give_ups, dead)
+        if chain is None:
+            return False
+        moving = start
+        for f, given_up in chain:
+            if given_up is not None:
+                self.unassign(given_up)
+            self.assign(moving, f)
+            moving = given_up
+        return True
+
+    def run(self):
+        # Hardest first: fewest qualified instructors, then most units
+        order = sorted(range(len(self.courses)),
+                       key=lambda i: (len(self.qualified[i]), -self.units[i], i))
+        for i in order:
+            if self.qualified[i]:
+                self.augment(i, 0)
+        # Placing courses only fills instructors up, so a course just like
+        # one that already found no path would not find one either
+        failed = set()
+        for i in order:
+            if not self.qualified[i] or self.owner[i] >= 0:
+                continue
+            signature = (self.units[i], self.cells[i], tuple(self.qualified[i]))
+            if signature not in failed and not self.augment(i):
+                failed.add(signature)
+        # Whatever the capped pass left over gets longer chains, sharing one
+        # budget of search states. As in Kuhn's matching algorithm, courses a
+        # failed search reached cannot lead anywhere until some chain succeeds
+        budget = self.expansions + FINAL_EXPANSIONS * len(self.courses)
+        dead = set()
+        for i in order:
+            if self.expansions >= budget:
+                break
+            if not self.qualified[i] or self.owner[i] >= 0 or i in dead:
+                continue
+            if self.augment(i, len(self.courses), budget - self.expansions, None, dead):
+                dead.clear()
+
+    def apply(self):
+        for c, f in zip(self.courses, self.owner):
+            c.instructor = self.faculty[f].name if f >= 0 else ''
+
+    def loads(self) -> Dict[str, int]:
+        return {instructor.name: load for instructor, load in zip(self.faculty, self.load)}
+
+
+def assign_faculty(sections: List[SectionSchedule], faculty: List[Instructor]) -> Dict[str, float]:
+    """
+    Set Course.instructor on every placed course of sections ('' where the
+    search found no qualified instructor with room) and return a summary: courses assigned
+    and unassigned, courses nobody is qualified for, and the highest
+    load as a share of max_units.
+    """
+    assigner = FacultyAssigner(sections, faculty)
+    assigner.run()
+    assigner.apply()
+    assigned = sum(1 for f in assigner.owner if f >= 0)
+    return {
+        'assigned': assigned,
+        'unassigned': len(assigner.courses) - assigned,
+        'unqualified': sum(1 for q in assigner.qualified if not q),
+        'max_load': max((load / instructor.max_units
+                         for instructor, load in zip(assigner.faculty, assigner.load)), default=0.0),
+    }
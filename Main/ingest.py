@@ -0,0 +1,206 @@
+"""
+Validated, cached CSV ingestion for course catalogs and faculty lists.
+
+read_catalog_csv reads with explicit dtypes (categoricals for the
+low-cardinality Program / Year_Level / Trimester / Days / Room columns),
+then validate_catalog checks every row in one vectorized pass, including
+parsing all Time ranges, and raises one CatalogValidationError listing
+every bad row before anything reaches Course(). load_catalog_cached adds
+a pickle cache keyed by the file's content hash and mtime, so re-importing
+an unchanged file skips parsing entirely.
+
+load_faculty reads a faculty CSV (Name, Max_Units, Courses) the same way
+and raises FacultyValidationError for bad rows. Courses is a list of
+course codes separated by ';'; a base code such as CC4 qualifies for
+both CC4(Lec) and CC4(Lab).
+"""
+import hashlib
+import os
+import pickle
+from typing import List, Tuple
+
+import pandas as pd
+
+from faculty import Instructor
+from scheduler import CourseCatalog
+
+CATALOG_DTYPES = {
+    'Course_Code': 'string',
+    'Description': 'string',
+    'Units': 'string',
+    'Time': 'string',
+    'Days': 'category',
+    'Room': 'category',
+    'Program': 'category',
+    'Year_Level': 'category',
+    'Trimester': 'category',
+}
+
+TIME_RANGE_PATTERN = (r'^\s*(\d{1,2}):(\d{2})\s*([AaPp][Mm])\s*-'
+                      r'\s*(\d{1,2}):(\d{2})\s*([AaPp][Mm])\s*$')
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "subject-offering")
+
+# Bump when CourseCatalog's pickled layout changes so old caches are ignored
+CACHE_VERSION = 2
+
+FACULTY_COLUMNS = ['Name', 'Max_Units', 'Courses']
+COURSE_SEPARATOR = ';'
+
+# How many bad rows to spell out in the exception message
+MAX_REPORTED_ERRORS = 20
+
+
+class CatalogValidationError(ValueError):
+    """
+    Raised with every problem found in a catalog; errors holds
+    (CSV line number, message) pairs.
+    """
+    subject = "catalog"
+
+    def __init__(self, errors: List[Tuple[int, str]]):
+        self.errors = errors
+        lines = [f"line {line}: {message}" for line, message in errors[:MAX_REPORTED_ERRORS]]
+        if len(errors) > MAX_REPORTED_ERRORS:
+            lines.append(f"... and {len(errors) - MAX_REPORTED_ERRORS} more")
+        super().__init__(f"{len(errors)} invalid {self.subject} rows:\n" + "\n".join(lines))
+
+
+class FacultyValidationError(CatalogValidationError):
+    subject = "faculty"
+
+
+def read_catalog_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=CATALOG_DTYPES)
+
+
+def _minutes(hours: pd.Series, minutes: pd.Series, suffix: pd.Series) -> pd.Series:
+    pm = suffix.str.lower() == 'pm'
+    return (hours % 12 + pm * 12) * 60 + minutes
+
+
+def validate_catalog(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Check a raw catalog frame and return it with Units as integers.
+    Raises CatalogValidationError listing every bad row.
+    """
+    missing_columns = [c for c in CourseCatalog.COLUMNS if c not in df.columns]
+    if missing_columns:
+        raise CatalogValidationError([(1, f"missing column {c}") for c in missing_columns])
+
+    # CSV line of each row: header is line 1
+    lines = df.index.to_series() + 2
+    problems: List[Tuple[int, str]] = []
+
+    def report(mask: pd.Series, message):
+        for idx in mask[mask].index:
+            text = message(idx) if callable(message) else message
+            problems.append((int(lines[idx]), text))
+
+    for column in CourseCatalog.COLUMNS:
+        report(df[column].isna(), f"{column} is empty")
+
+    units = pd.to_numeric(df['Units'], errors='coerce')
+    report(df['Units'].notna() & (units.isna() | (units % 1 != 0)),
+           lambda i: f"Units {df['Units'][i]!r} is not a whole number")
+
+    parts = df['Time'].str.extract(TIME_RANGE_PATTERN)
+    matched = parts[0].notna()
+    report(df['Time'].notna() & ~matched,
+           lambda i: f"Time {df['Time'][i]!r} is not like '7:30am-8:50am'")
+
+    numbers = parts[[0, 1, 3, 4]].apply(pd.to_numeric)
+    bad_clock = matched & (
+        ~numbers[0].between(1, 12) | ~numbers[3].between(1, 12) |
+        ~numbers[1].between(0, 59) | ~numbers[4].between(0, 59)
+    )
+    report(bad_clock, lambda i: f"Time {df['Time'][i]!r} has an impossible clock time")
+
+    start = _minutes(numbers[0], numbers[1], parts[2])
+    end = _minutes(numbers[3], numbers[4], parts[5])
+    report(matched & ~bad_clock & (end <= start),
+           lambda i: f"Time {df['Time'][i]!r} ends before it starts")
+
+    if problems:
+        problems.sort()
+        raise CatalogValidationError(problems)
+
+    df = df.copy()
+    df['Units'] = units.astype(int)
+    return df
+
+
+def _cache_path(path: str, cache_dir: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    key = f"{digest.hexdigest()[:32]}-{os.stat(path).st_mtime_ns}-v{CACHE_VERSION}"
+    return os.path.join(cache_dir, f"catalog-{key}.pkl")
+
+
+def load_catalog_cached(path: str, cache_dir: str = DEFAULT_CACHE_DIR,
+                        use_cache: bool = True) -> CourseCatalog:
+    """
+    Read, validate and index a catalog CSV, reusing the pickled catalog
+    from an earlier import of the same file (same content and mtime).
+    Pass cache_dir=None or use_cache=False to skip the cache.
+    """
+    if not use_cache or cache_dir is None:
+        return CourseCatalog.from_dataframe(validate_catalog(read_catalog_csv(path)))
+
+    cache_file = _cache_path(path, cache_dir)
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    catalog = CourseCatalog.from_dataframe(validate_catalog(read_catalog_csv(path)))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError:
+        # A read-only or full cache directory only costs the speed-up
+        pass
+    return catalog
+
+
+def validate_faculty(df: pd.DataFrame) -> List[Instructor]:
+    """
+    Check a raw faculty frame and build its instructors.
+    Raises FacultyValidationError listing every bad row.
+    """
+    missing_columns = [c for c in FACULTY_COLUMNS if c not in df.columns]
+    if missing_columns:
+        raise FacultyValidationError([(1, f"missing column {c}") for c in missing_columns])
+
+    problems: List[Tuple[int, str]] = []
+    instructors = []
+    seen = set()
+    for idx, row in enumerate(df[FACULTY_COLUMNS].itertuples(index=False)):
+        line = idx + 2
+        name, max_units, courses = (None if pd.isna(v) else str(v).strip() for v in row)
+        codes = frozenset(c.strip() for c in (courses or '').split(COURSE_SEPARATOR) if c.strip())
+        if not name:
+            problems.append((line, "Name is empty"))
+        elif name in seen:
+            problems.append((line, f"{name} is listed twice"))
+        seen.add(name)
+        if not max_units or not max_units.isdigit() or int(max_units) == 0:
+            problems.append((line, f"Max_Units {max_units!r} is not a positive whole number"))
+        if not codes:
+            problems.append((line, "Courses is empty"))
+        if name and max_units and max_units.isdigit() and codes:
+            instructors.append(Instructor(name, int(max_units), codes))
+
+    if problems:
+        raise FacultyValidationError(problems)
+    return instructors
+
+
+def load_faculty(path: str) -> List[Instructor]:
+    return validate_faculty(pd.read_csv(path, dtype='string'))
@@ -0,0 +1,141 @@
+"""
+Instrumentation for generation runs: per-phase timers, counters for every
+reason a course is left out, and slot-utilization histograms per day
+pattern, written out as one JSON report.
+
+The scheduler reports into whichever RunStats is active (see collecting);
+with none active every hook returns immediately, so normal runs pay
+almost nothing. Sections placed in other processes (workers > 1) still
+count towards totals and histograms, but their phase timers and skip
+reasons stay in those processes.
+"""
+import cProfile
+import json
+import pstats
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+# Skip reasons, in report order; counts are courses, not pairs
+SKIP_REASONS = [
+    "no_eligible_room",      # the course's room class has no rooms
+    "missing_partner",       # a lecture without its lab or a lab without its lecture
+    "extra_pair_member",     # more than one lecture or lab under one pair key
+    "no_consecutive_slots",  # no free two-slot block (with free rooms) for a pair
+    "no_free_slot",          # no free slot (with a free room) for a standalone course
+    "solver_dropped",        # the constraint solver found no place for it
+]
+
+# Top entries of the profile kept in the report
+PROFILE_TOP = 25
+
+
+class RunStats:
+    """
+    Everything measured during one run.
+    """
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.skips: Counter = Counter()
+        self.slot_use: Dict[str, Counter] = {}
+        self.sections = 0
+        self.requested = 0
+        self.placed = 0
+        # Set by run_profiled; None when the run was not profiled
+        self.profile: Optional[List[Dict[str, object]]] = None
+
+    def add_time(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def record_section(self, requested: int, courses: Sequence):
+        self.sections += 1
+        self.requested += requested
+        self.placed += len(courses)
+        for c in courses:
+            self.slot_use.setdefault(c.days, Counter())[c.time.split('-')[0]] += 1
+
+    def to_dict(self) -> Dict[str, object]:
+        # scheduler imports this module for its hooks, so import it late
+        from scheduler import parse_time
+
+        skips = {reason: self.skips[reason] for reason in SKIP_REASONS if self.skips[reason]}
+        skips.update((r, n) for r, n in self.skips.items() if r not in skips and n)
+        report = {
+            "sections": self.sections,
+            "courses_requested": self.requested,
+            "courses_placed": self.placed,
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "skips": skips,
+            "slot_utilization": {
+                pattern: dict(sorted(counts.items(), key=lambda item: parse_time(item[0])))
+                for pattern, counts in sorted(self.slot_use.items())
+            },
+        }
+        if self.profile is not None:
+            report["profile"] = self.profile
+        return report
+
+
+# The RunStats the scheduler's hooks report into, if any
+_active: Optional[RunStats] = None
+
+
+@contextmanager
+def collecting(stats: Optional[RunStats]) -> Iterator[Optional[RunStats]]:
+    global _active
+    previous, _active = _active, stats
+    try:
+        yield stats
+    finally:
+        _active = previous
+
+
+def active() -> Optional[RunStats]:
+    return _active
+
+
+def count_skip(reason: str, courses: int = 1):
+    if _active is not None and courses:
+        _active.skips[reason] += courses
+
+
+def add_time(phase: str, seconds: float):
+    if _active is not None:
+        _active.add_time(phase, seconds)
+
+
+def run_profiled(fn: Callable[[], object], prof_path: str, stats: RunStats = None,
+                 top: int = PROFILE_TOP):
+    """
+    Run fn under cProfile, dump the raw profile to prof_path (for pstats
+    or snakeviz) and keep the top entries by cumulative time in stats.
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn)
+    finally:
+        profiler.dump_stats(prof_path)
+        if stats is not None:
+            entries = sorted(pstats.Stats(profiler).stats.items(),
+                             key=lambda item: item[1][3], reverse=True)[:top]
+            stats.profile = [
+                {"function": f"{file}:{line}({name})", "calls": calls,
+                 "total_seconds": round(total, 6), "cumulative_seconds": round(cumulative, 6)}
+                for (file, line, name), (_, calls, total, cumulative, _) in entries
+            ]
+
+
+def write_report(stats: RunStats, path: str, metadata: Dict[str, object] = None):
+    report = dict(metadata or {})
+    report.update(stats.to_dict())
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
@@ -0,0 +1,476 @@
+"""
+Local-search optimizer over the complete output of one generation run.
+
+Takes every SectionSchedule of a run and improves it by simulated
+annealing. The schedule is held as flat occupancy counters (per room cell
+and per section cell), so each move is priced by a constant-time delta
+instead of rescoring the whole schedule. Moves:
+
+  - relocate a unit (a single course or a lec+lab pair) to another start
+    slot, possibly flipping it between the MWF and TTH sides
+  - swap the slots of two same-sized units of one section
+  - reassign one meeting to another room of its class (lab / major / regular)
+  - insert a dropped unit into free cells of its section, or drop a
+    placed one to make room for it
+
+New rooms are drawn from the ones free at the target cells when there
+are any. Drops never take the run below the number of courses the input
+placed: a course is only dropped while another one has been inserted in
+its stead, so over-subscribed rooms stay conflicts (which validate
+reports) instead of silently becoming unplaced courses.
+
+The cost counts room double-bookings, dropped courses and per-section
+MWF/TTH imbalance. Room conflicts weigh more than drops, so a dropped
+course is only put back where it fits cleanly. The best state seen is
+kept, so the result is never worse than the input.
+"""
+import math
+import random
+import time
+from collections import Counter
+from typing import List, Dict, Optional, Sequence
+
+from scheduler import (
+    BASE_SLOTS, RESTRICTED_ROOMS, SLOT_BY_MINUTE, Course, CourseCatalog,
+    SectionSchedule, room_pools, time_grid
+)
+
+CONFLICT_WEIGHT = 200.0
+DROP_WEIGHT = 100.0
+IMBALANCE_WEIGHT = 1.0
+
+
+def pair_patterns() -> Dict[bool, List[str]]:
+    grid = time_grid()
+    return {side: [grid.lecture[side], grid.lab[side]] for side in (True, False)}
+
+
+def single_patterns(course: Course) -> Dict[bool, List[str]]:
+    grid = time_grid()
+    if 'PathFit' in course.code or 'PATHFit' in course.code:
+        by_side = grid.pathfit
+    elif course.is_lec:
+        by_side = grid.lecture
+    elif course.is_lab:
+        by_side = grid.lab
+    else:
+        by_side = grid.standalone
+    return {side: [by_side[side]] for side in (True, False)}
+
+
+class Unit:
+    """
+    One movable block of a section: one course, or a lec+lab pair in two
+    consecutive slots. side/start are None while the unit is dropped.
+    """
+    __slots__ = ('section', 'courses', 'patterns', 'pools', 'rooms', 'side', 'start')
+
+    def __init__(self, section: int, courses: List[Course], patterns: Dict[bool, List[str]],
+                 pools: List[Sequence[str]]):
+        self.section = section
+        self.courses = courses
+        self.patterns = patterns
+        self.pools = pools
+        self.rooms: List[str] = [c.room for c in courses]
+        self.side: Optional[bool] = None
+        self.start: Optional[int] = None
+
+
+class ScheduleState:
+    """
+    Flat counters for a whole run: room_count[(room, side, slot)] and
+    section_used[(section, side, slot)], plus per-section side totals.
+    """
+    def __init__(self, rooms: Sequence[str], num_sections: int):
+        self.room_ids = {room: i for i, room in enumerate(sorted(rooms))}
+        self.shared = [room in RESTRICTED_ROOMS for room in sorted(rooms)]
+        self.num_slots = len(BASE_SLOTS)
+        self.room_count = [0] * (len(self.room_ids) * 2 * self.num_slots)
+        self.section_used = [0] * (num_sections * 2 * self.num_slots)
+        self.side_totals = [[0, 0] for _ in range(num_sections)]
+        self.conflicts = 0
+        self.dropped = 0
+
+    def room_cell(self, room: str, side: bool, slot: int) -> int:
+        return (self.room_ids[room] * 2 + (0 if side else 1)) * self.num_slots + slot
+
+    def section_cell(self, section: int, side: bool, slot: int) -> int:
+        return (section * 2 + (0 if side else 1)) * self.num_slots + slot
+
+    def imbalance(self, section: int) -> int:
+        mwf, tth = self.side_totals[section]
+        return abs(mwf - tth)
+
+    def cost(self) -> float:
+        imbalance = sum(abs(m - t) for m, t in self.side_totals)
+        return (CONFLICT_WEIGHT * self.conflicts + DROP_WEIGHT * self.dropped
+                + IMBALANCE_WEIGHT * imbalance)
+
+    # Each helper applies one change and returns its cost delta
+
+    def add_room(self, room: str, side: bool, slot: int) -> float:
+        cell = self.room_cell(room, side, slot)
+        self.room_count[cell] += 1
+        if self.shared[self.room_ids[room]] or self.room_count[cell] == 1:
+            return 0.0
+        self.conflicts += 1
+        return CONFLICT_WEIGHT
+
+    def remove_room(self, room: str, side: bool, slot: int) -> float:
+        cell = self.room_cell(room, side, slot)
+        self.room_count[cell] -= 1
+        if self.shared[self.room_ids[room]] or self.room_count[cell] == 0:
+            return 0.0
+        self.conflicts -= 1
+        return -CONFLICT_WEIGHT
+
+    def place(self, unit: Unit, side: bool, start: int) -> float:
+        delta = 0.0
+        for k, room in enumerate(unit.rooms):
+            delta += self.add_room(room, side, start + k)
+            self.section_used[self.section_cell(unit.section, side, start + k)] = 1
+        before = self.imbalance(unit.section)
+        self.side_totals[unit.section][0 if side else 1] += len(unit.courses)
+        delta += IMBALANCE_WEIGHT * (self.imbalance(unit.section) - before)
+        unit.side, unit.start = side, start
+        return delta
+
+    def unplace(self, unit: Unit) -> float:
+        side, start = unit.side, unit.start
+        delta = 0.0
+        for k, room in enumerate(unit.rooms):
+            delta += self.remove_room(room, side, start + k)
+            self.section_used[self.section_cell(unit.section, side, start + k)] = 0
+        before = self.imbalance(unit.section)
+        self.side_totals[unit.section][0 if side else 1] -= len(unit.courses)
+        delta += IMBALANCE_WEIGHT * (self.imbalance(unit.section) - before)
+        unit.side = unit.start = None
+        return delta
+
+    def pick_room(self, pool: Sequence[str], side: bool, slot: int, rng: random.Random) -> str:
+        """
+        A random room of pool that is free at (side, slot), or any room of
+        the pool when all of them are booked.
+        """
+        free = [room for room in pool if not self.room_count[self.room_cell(room, side, slot)]]
+        return rng.choice(free or pool)
+
+    def fits(self, unit: Unit, side: bool, start: int) -> bool:
+        """
+        Whether the section's own cells for the unit at (side, start) are free.
+        """
+        if start < 0 or start + len(unit.courses) > self.num_slots:
+            return False
+        return not any(self.section_used[self.section_cell(unit.section, side, start + k)]
+                       for k in range(len(unit.courses)))
+
+
+def build_units(sections: List[SectionSchedule], catalog: CourseCatalog,
+                universe: frozenset) -> List[Unit]:
+    """
+    Split every section into units. Placed lec+lab pairs stay together when
+    the lab sits right after its lecture on the same side; courses the
+    catalog lists for a section but missing from it become dropped units.
+    """
+    grid = time_grid()
+    pools = room_pools(universe)
+    units = []
+    for sid, section in enumerate(sections):
+        placed = [c for c in section.courses if c.start_minute in SLOT_BY_MINUTE]
+        by_pair = {}
+        singles = []
+        for c in placed:
+            if c.is_lec or c.is_lab:
+                by_pair.setdefault(c.pair_key, []).append(c)
+            else:
+                singles.append(c)
+
+        def pool_for(course):
+            return pools[course.template.room_class]
+
+        for group in by_pair.values():
+            lecs = [c for c in group if c.is_lec]
+            labs = [c for c in group if c.is_lab]
+            while lecs and labs:
+                lec, lab = lecs.pop(0), labs.pop(0)
+                same_side = grid.side(lec.days) == grid.side(lab.days)
+                lec_slot = SLOT_BY_MINUTE.get(lec.start_minute)
+                if (same_side and lec_slot is not None
+                        and SLOT_BY_MINUTE.get(lab.start_minute) == lec_slot + 1):
+                    units.append(Unit(sid, [lec, lab], pair_patterns(),
+                                      [pool_for(lec), pool_for(lab)]))
+                else:
+                    singles.extend([lec, lab])
+            singles.extend(lecs + labs)
+
+        for c in singles:
+            units.append(Unit(sid, [c], single_patterns(c), [pool_for(c)]))
+
+        # Catalog courses the section is missing are dropped units
+        missing = Counter(c.template for c in catalog.get_courses(section.program, section.year,
+                                                                  section.trimester))
+        missing.subtract(c.template for c in section.courses)
+        dropped = []
+        for template, count in missing.items():
+            for _ in range(count):
+                course = Course.__new__(Course)
+                course.template = template
+                course.time = course.days = course.room = course.instructor = ''
+                course.start_minute = course.end_minute = 0
+                dropped.append(course)
+        dropped_pairs = {}
+        for c in dropped:
+            if c.is_lec or c.is_lab:
+                dropped_pairs.setdefault(c.pair_key, []).append(c)
+            else:
+                units.append(Unit(sid, [c], single_patterns(c), [pool_for(c)]))
+        for group in dropped_pairs.values():
+            lecs = [c for c in group if c.is_lec]
+            labs = [c for c in group if c.is_lab]
+            while lecs and labs:
+                lec, lab = lecs.pop(0), labs.pop(0)
+                units.append(Unit(sid, [lec, lab], pair_patterns(),
+                                  [pool_for(lec), pool_for(lab)]))
+            for c in lecs + labs:
+                units.append(Unit(sid, [c], single_patterns(c), [pool_for(c)]))
+    return units
+
+
+class Optimizer:
+    def __init__(self, sections: List[SectionSchedule], catalog: CourseCatalog,
+                 rng: random.Random):
+        self.sections = sections
+        self.rng = rng
+        universe = set(catalog.rooms) | RESTRICTED_ROOMS
+        for section in sections:
+            universe.update(c.room for c in section.courses)
+        universe = frozenset(universe)
+
+        self.units = build_units(sections, catalog, universe)
+        self.state = ScheduleState(universe, len(sections))
+        for unit in self.units:
+            if unit.courses[0].start_minute in SLOT_BY_MINUTE and unit.courses[0].days:
+                side = time_grid().side(unit.courses[0].days) is True
+                self.state.place(unit, side, SLOT_BY_MINUTE[unit.courses[0].start_minute])
+            else:
+                unit.rooms = [rng.choice(pool) if pool else '' for pool in unit.pools]
+                self.state.dropped += len(unit.courses)
+        self.by_section: Dict[int, List[Unit]] = {}
+        for unit in self.units:
+            self.by_section.setdefault(unit.section, []).append(unit)
+        # move_drop never leaves fewer courses placed than the input had
+        self.max_dropped = self.state.dropped
+
+    # Moves return (delta, undo) after applying themselves, or None if not applicable
+
+    def move_relocate(self, unit: Unit):
+        side = unit.side if self.rng.random() < 0.5 else not unit.side
+        start = self.rng.randrange(self.state.num_slots - len(unit.courses) + 1)
+        old_side, old_start, old_rooms = unit.side, unit.start, unit.rooms
+        delta = self.state.unplace(unit)
+        if not self.state.fits(unit, side, start):
+            self.state.place(unit, old_side, old_start)
+            return None
+        # Rooms booked at the new cells are swapped for free ones of the class
+        rooms = []
+        for k, (room, pool) in enumerate(zip(old_rooms, unit.pools)):
+            if pool and self.state.room_count[self.state.room_cell(room, side, start + k)]:
+                room = self.state.pick_room(pool, side, start + k, self.rng)
+            rooms.append(room)
+        unit.rooms = rooms
+        delta += self.state.place(unit, side, start)
+
+        def undo():
+            self.state.unplace(unit)
+            unit.rooms = old_rooms
+            self.state.place(unit, old_side, old_start)
+        return delta, undo
+
+    def move_swap(self, unit: Unit):
+        peers = [u for u in self.by_section[unit.section]
+                 if u is not unit and u.side is not None and len(u.courses) == len(unit.courses)]
+        if not peers:
+            return None
+        other = self.rng.choice(peers)
+        a, b = (unit.side, unit.start), (other.side, other.start)
+        delta = self.state.unplace(unit) + self.state.unplace(other)
+        delta += self.state.place(unit, *b) + self.state.place(other, *a)
+
+        def undo():
+            self.state.unplace(unit)
+            self.state.unplace(other)
+            self.state.place(unit, *a)
+            self.state.place(other, *b)
+        return delta, undo
+
+    def move_room(self, unit: Unit):
+        k = self.rng.randrange(len(unit.courses))
+        pool = unit.pools[k]
+        if len(pool) < 2:
+            return None
+        old_room = unit.rooms[k]
+        slot = unit.start + k
+        new_room = self.state.pick_room([room for room in pool if room != old_room],
+                                        unit.side, slot, self.rng)
+        delta = self.state.remove_room(old_room, unit.side, slot)
+        unit.rooms[k] = new_room
+        delta += self.state.add_room(new_room, unit.side, slot)
+
+        def undo():
+            self.state.remove_room(new_room, unit.side, slot)
+            unit.rooms[k] = old_room
+            self.state.add_room(old_room, unit.side, slot)
+        return delta, undo
+
+    def move_insert(self, unit: Unit):
+        side = self.rng.random() < 0.5
+        start = self.rng.randrange(self.state.num_slots - len(unit.courses) + 1)
+        if not all(unit.pools) or not self.state.fits(unit, side, start):
+            return None
+        unit.rooms = [self.state.pick_room(pool, side, start + k, self.rng)
+                      for k, pool in enumerate(unit.pools)]
+        delta = self.state.place(unit, side, start) - DROP_WEIGHT * len(unit.courses)
+        self.state.dropped -= len(unit.courses)
+
+        def undo():
+            self.state.unplace(unit)
+            self.state.dropped += len(unit.courses)
+        return delta, undo
+
+    def move_drop(self, unit: Unit):
+        if self.state.dropped + len(unit.courses) > self.max_dropped:
+            return None
+        old_side, old_start = unit.side, unit.start
+        delta = self.state.unplace(unit) + DROP_WEIGHT * len(unit.courses)
+        self.state.dropped += len(unit.courses)
+
+        def undo():
+            self.state.place(unit, old_side, old_start)
+            self.state.dropped -= len(unit.courses)
+        return delta, undo
+
+    def step(self, temperature: float) -> float:
+        """
+        Try one random move; returns the accepted cost delta (0 if rejected).
+        """
+        unit = self.rng.choice(self.units)
+        if unit.side is None:
+            result = self.move_insert(unit)
+        else:
+            roll = self.rng.random()
+            if roll < 0.4:
+                result = self.move_relocate(unit)
+            elif roll < 0.65:
+                result = self.move_swap(unit)
+            elif roll < 0.95:
+                result = self.move_room(unit)
+            else:
+                result = self.move_drop(unit)
+        if result is None:
+            return 0.0
+        delta, undo = result
+        if delta <= 0 or self.rng.random() < math.exp(-delta / temperature):
+            return delta
+        undo()
+        return 0.0
+
+    def snapshot(self):
+        return [(unit.side, unit.start, list(unit.rooms)) for unit in self.units]
+
+    def restore(self, snapshot):
+        for unit in self.units:
+            if unit.side is not None:
+                self.state.unplace(unit)
+                self.state.dropped += len(unit.courses)
+        for unit, (side, start, rooms) in zip(self.units, snapshot):
+            unit.rooms = rooms
+            if side is not None:
+                self.state.place(unit, side, start)
+                self.state.dropped -= len(unit.courses)
+
+    def run(self, iterations: Optional[int], time_budget: float,
+            start_temperature: float, end_temperature: float) -> int:
+        """
+        Anneal for iterations moves or time_budget seconds. With iterations
+        None only the clock stops the run and the temperature follows it.
+        """
+        if not self.units:
+            return 0
+        started = time.perf_counter()
+        deadline = started + time_budget
+        ratio = end_temperature / start_temperature
+        cost = best_cost = self.state.cost()
+        best = self.snapshot()
+        done = 0
+        progress = 0.0
+        while iterations is None or done < iterations:
+            # Check the clock and the best state every 1024 moves, not every move
+            if done % 1024 == 0:
+                if cost < best_cost:
+                    best_cost, best = cost, self.snapshot()
+                now = time.perf_counter()
+                if now > deadline:
+                    break
+                if iterations is None:
+                    progress = (now - started) / time_budget
+            if iterations is not None:
+                progress = done / iterations
+            temperature = start_temperature * ratio ** progress
+            cost += self.step(temperature)
+            done += 1
+        if cost > best_cost:
+            self.restore(best)
+        return done
+
+    def apply(self):
+        """
+        Write unit placements back onto the sections' Course objects,
+        adding inserted courses and keeping the MWF-then-TTH order.
+        """
+        for sid, section in enumerate(self.sections):
+            placed = []
+            for unit in self.by_section.get(sid, []):
+                if unit.side is None:
+                    continue
+                for k, course in enumerate(unit.courses):
+                    slot = BASE_SLOTS[unit.start + k]
+                    course.assign_slot(slot, unit.patterns[unit.side][k])
+                    course.room = unit.rooms[k]
+                    placed.append(course)
+            fixed = [c for c in section.courses if c.start_minute not in SLOT_BY_MINUTE]
+            grid = time_grid()
+            mwf = sorted((c for c in placed if grid.side(c.days) is True), key=lambda x: x.start_minute)
+            tth = sorted((c for c in placed if grid.side(c.days) is not True), key=lambda x: x.start_minute)
+            section.courses = mwf + tth + fixed
+
+
+def optimize_schedule(sections: List[SectionSchedule], catalog: CourseCatalog,
+                      iterations: Optional[int] = 200000, time_budget: float = 5.0,
+                      seed: int = None, start_temperature: float = 20.0,
+                      end_temperature: float = 0.5) -> Dict[str, float]:
+    """
+    Improve a generated run in place by simulated annealing and return
+    before/after statistics. Stops after iterations moves or time_budget
+    seconds, whichever comes first; iterations None runs for the whole
+    time_budget.
+    """
+    rng = random.Random(seed)
+    optimizer = Optimizer(sections, catalog, rng)
+    state = optimizer.state
+    before = {'cost': state.cost(), 'conflicts': state.conflicts, 'dropped': state.dropped}
+
+    started = time.perf_counter()
+    done = optimizer.run(iterations, time_budget, start_temperature, end_temperature)
+    elapsed = time.perf_counter() - started
+    optimizer.apply()
+
+    return {
+        'iterations': done,
+        'seconds': elapsed,
+        'initial_cost': before['cost'],
+        'initial_conflicts': before['conflicts'],
+        'initial_dropped': before['dropped'],
+        'final_cost': state.cost(),
+        'final_conflicts': state.conflicts,
+        'final_dropped': state.dropped,
+    }
@@ -0,0 +1,123 @@
+"""
+Schedule quality scoring and best-of-N section generation.
+
+A placed section is reduced to a small feature vector (dropped courses,
+MWF/TTH imbalance, idle gaps, late classes, lec/lab room hops) and scored
+as a weighted sum; lower is better. BestOfN wraps any placement engine,
+runs it several times per section and keeps the best-scoring candidate.
+"""
+import random
+import time
+import numpy as np
+from typing import Callable, Dict, List
+
+from instrument import RunStats, active as active_stats, collecting
+from scheduler import (
+    BASE_SLOTS, SLOT_BY_MINUTE, Course, RoomOccupancy, balance_and_shuffle_courses, time_grid
+)
+
+FEATURES = ['dropped', 'imbalance', 'idle_gaps', 'late', 'room_hops']
+
+# Penalty per unit of each feature, in FEATURES order
+SCORE_WEIGHTS = np.array([100.0, 5.0, 2.0, 3.0, 1.0])
+
+
+def section_features(courses: List[Course], expected: int) -> np.ndarray:
+    """
+    Feature vector of one placed section, in FEATURES order.
+
+      dropped    - courses asked for but not placed
+      imbalance  - |MWF-side courses - TTH-side courses|
+      idle_gaps  - empty slots between the first and last class, per side
+      late       - classes starting in the last slot of the day (6:10pm)
+      room_hops  - lec/lab pairs whose two meetings are in different rooms
+    """
+    if not courses:
+        return np.array([expected, 0, 0, 0, 0], dtype=float)
+
+    starts = np.fromiter((c.start_minute for c in courses), dtype=np.int64, count=len(courses))
+    grid = time_grid()
+    mwf = np.fromiter((grid.side(c.days) is True for c in courses), dtype=bool, count=len(courses))
+    slots = np.fromiter((SLOT_BY_MINUTE.get(c.start_minute, -1) for c in courses),
+                        dtype=np.int64, count=len(courses))
+
+    idle = 0
+    for side in (mwf, ~mwf):
+        used = np.unique(slots[side])
+        if used.size:
+            idle += int(used[-1] - used[0] + 1 - used.size)
+
+    pair_rooms: Dict[str, set] = {}
+    for c in courses:
+        if c.is_lec or c.is_lab:
+            pair_rooms.setdefault(c.pair_key, set()).add(c.room)
+    hops = sum(len(rooms) - 1 for rooms in pair_rooms.values())
+
+    n_mwf = int(mwf.sum())
+    return np.array([
+        expected - len(courses),
+        abs(n_mwf - (len(courses) - n_mwf)),
+        idle,
+        int((starts >= BASE_SLOTS[-1].start_minute).sum()),
+        hops,
+    ], dtype=float)
+
+
+def score_candidates(features: np.ndarray) -> np.ndarray:
+    """
+    Scores for a (candidates x FEATURES) matrix in one product; lower is better.
+    """
+    return features @ SCORE_WEIGHTS
+
+
+def score_section(courses: List[Course], expected: int) -> float:
+    return float(score_candidates(section_features(courses, expected)[None, :])[0])
+
+
+class BestOfN:
+    """
+    Placement engine that runs another engine up to n times per section and
+    keeps the best-scoring result. Same call signature as
+    balance_and_shuffle_courses, so it can be passed anywhere an engine is.
+
+    Each candidate draws its own Random from the section rng and works on
+    a scratch copy of the occupancy model; only the winner's bookings are
+    kept. Candidates stop early once time_budget seconds have passed (at
+    least one always runs), so seeded output can differ when the budget
+    is hit.
+    """
+    def __init__(self, engine: Callable = None, n: int = 8, time_budget: float = 0.1):
+        self.engine = engine or balance_and_shuffle_courses
+        self.n = max(1, n)
+        self.time_budget = time_budget
+
+    def __call__(self, courses: List[Course], year_level: str, trimester: str,
+                 occupancy: RoomOccupancy = None, rng: random.Random = None) -> List[Course]:
+        if rng is None:
+            rng = random.Random()
+        seeds = [rng.getrandbits(32) for _ in range(self.n)]
+        deadline = time.perf_counter() + self.time_budget
+
+        # Time spent by every candidate counts, but only the winner's skips
+        outer = active_stats()
+        candidates = []
+        for seed in seeds:
+            trial = occupancy.copy() if occupancy is not None else None
+            trial_stats = RunStats()
+            with collecting(trial_stats if outer is not None else None):
+                placed = self.engine(courses, year_level, trimester, trial, random.Random(seed))
+            if outer is not None:
+                for phase, seconds in trial_stats.phases.items():
+                    outer.add_time(phase, seconds)
+            candidates.append((placed, trial, trial_stats))
+            if time.perf_counter() > deadline:
+                break
+
+        features = np.stack([section_features(placed, len(courses)) for placed, _, _ in candidates])
+        best = int(np.argmin(score_candidates(features)))
+        placed, trial, trial_stats = candidates[best]
+        if occupancy is not None:
+            occupancy.update_from(trial)
+        if outer is not None:
+            outer.skips.update(trial_stats.skips)
+        return placed
@@ -0,0 +1,73 @@
+"""
+Incremental rescheduling: re-place one section of a published schedule
+and leave every other assignment exactly where it is.
+
+    python cli.py reschedule sched.xlsx --csv Data.csv --group A \
+        --program BSCS --section 2B --out sched-edited.xlsx
+
+The workbook is read back with workbook.read_workbook, every other section's courses are booked
+into a fresh RoomOccupancy, and only the edited section is placed again,
+from the current catalog, so a room change or an added course in the CSV
+shows up in that section alone. Placement is seeded through section_rng
+like a normal run, so the same seed always gives the same edit.
+"""
+from typing import Callable, List, Set
+
+from scheduler import (
+    GROUPS, CourseCatalog, RoomOccupancy, SectionSchedule,
+    balance_and_shuffle_courses, group_occupancy, new_seed, section_rng
+)
+
+
+def find_section(sections: List[SectionSchedule], group: str, program: str,
+                 section_name: str) -> SectionSchedule:
+    """
+    The section named like "2B" of program in group.
+    """
+    for section in sections:
+        if (section.group, section.program, section.section_name) == (group, program, section_name):
+            return section
+    raise ValueError(f"No section {program} {section_name} in group {group}")
+
+
+def locked_occupancy(sections: List[SectionSchedule], target: SectionSchedule,
+                     rooms: Set[str], group_mode: str = "shared") -> RoomOccupancy:
+    """
+    Room bookings of every section but target, inside target's group
+    share when the groups split campus resources.
+    """
+    if group_mode == "shared":
+        occupancy = RoomOccupancy(rooms)
+    else:
+        occupancy = group_occupancy(rooms, GROUPS.index(target.group), len(GROUPS), group_mode)
+    for section in sections:
+        if section is not target:
+            occupancy.reserve_courses(section.courses)
+    return occupancy
+
+
+def reschedule_section(sections: List[SectionSchedule], catalog: CourseCatalog,
+                       target: SectionSchedule, seed: int = None, engine: Callable = None,
+                       group_mode: str = "shared") -> SectionSchedule:
+    """
+    Place target's courses again from catalog around everything else in
+    sections, replace it in sections (in place) and return the new
+    section. Other sections are not touched.
+    """
+    if engine is None:
+        engine = balance_and_shuffle_courses
+    if seed is None:
+        seed = new_seed()
+    rooms = set(catalog.rooms)
+    rooms.update(c.room for section in sections for c in section.courses)
+    occupancy = locked_occupancy(sections, target, rooms, group_mode)
+
+    courses = engine(
+        catalog.get_courses(target.program, target.year, target.trimester),
+        target.year, target.trimester, occupancy,
+        section_rng(seed, target.program, target.year, target.section_index, target.group)
+    )
+    edited = SectionSchedule(target.group, target.program, target.year, target.trimester,
+                             target.section_index, courses)
+    sections[sections.index(target)] = edited
+    return edited
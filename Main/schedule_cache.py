@@ -0,0 +1,162 @@
+"""
+Cache of generated sections, so regenerating after a small change only
+recomputes the sections whose inputs changed.
+
+A section's key is (catalog fingerprint, time grid, trimester, seed,
+engine version, group, program, year, section index), plus a digest of
+the room occupancy the section was placed into when rooms are shared.
+That last part keeps cached runs identical to fresh ones: with shared
+rooms a section depends on every section placed before it, so a change
+(say one more BSCS Second year section) reuses every section before it
+in workbook order and recomputes the ones after.
+
+That limits reuse in the default group mode, "shared", where both groups
+book into one occupancy model: Group B comes after all of Group A in
+workbook order, so any change in Group A recomputes all of Group B.
+With group_mode "rooms" or "halves" each group books into its own share,
+so a change only recomputes later sections of its own group. On Data.csv
+with the GUI's default counts, going from 3 to 4 BSCS Second year
+sections reuses 33 of 110 sections in "shared" mode and 66 in "rooms".
+With share_rooms=False or workers > 1 sections are independent and only
+the changed ones are recomputed. The GUI and the CLI report how many
+sections came from the cache.
+
+Entries live in an in-memory LRU; give a directory to also keep them on
+disk between runs.
+"""
+import functools
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from scheduler import Course, CourseCatalog, RoomOccupancy, time_grid
+
+# Bump when a placement engine changes what it produces for the same inputs,
+# or when Course's pickled layout changes
+ENGINE_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def catalog_fingerprint(catalog: CourseCatalog) -> str:
+    digest = hashlib.sha256()
+    for key in sorted(catalog.index):
+        digest.update(repr(key).encode())
+        for c in catalog.index[key]:
+            digest.update(repr((c.code, c.description, c.units, c.time, c.days, c.room)).encode())
+    digest.update(repr(sorted(catalog.rooms)).encode())
+    return digest.hexdigest()
+
+
+def engine_version(engine) -> str:
+    """
+    Stable description of an engine and its settings, e.g.
+    "quality.BestOfN(engine=solver.solve_section_courses(time_budget=0.2), n=8, ...)".
+    """
+    if isinstance(engine, functools.partial):
+        args = [engine_version(a) for a in engine.args]
+        args += [f"{k}={engine_version(v)}" for k, v in sorted(engine.keywords.items())]
+        return f"{engine_version(engine.func)}({', '.join(args)})"
+    if hasattr(engine, '__qualname__'):
+        return f"{engine.__module__}.{engine.__qualname__}"
+    if hasattr(engine, '__dict__'):
+        fields = [f"{k}={engine_version(v)}" for k, v in sorted(vars(engine).items())]
+        return f"{type(engine).__module__}.{type(engine).__qualname__}({', '.join(fields)})"
+    return repr(engine)
+
+
+def occupancy_digest(occupancy: RoomOccupancy = None) -> str:
+    if occupancy is None:
+        return ""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(sorted(occupancy.room_ids.items(), key=lambda item: item[1])).encode())
+    digest.update(bytes(occupancy.grid))
+    return digest.hexdigest()
+
+
+class ScheduleCache:
+    """
+    LRU of section key -> placed courses, optionally backed by one pickle
+    file per key in directory. Courses are cloned on the way in and out,
+    so callers (and the optimizer) may modify what they get back.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, directory: str = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries: "OrderedDict[Tuple, List[Course]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints = {}
+
+    def run_key(self, catalog: CourseCatalog, trimester: str, seed: int, engine) -> Tuple:
+        """
+        The part of every section key that is fixed for one run.
+        """
+        # Catalogs are not changed after loading, so fingerprint each once
+        fingerprint = self._fingerprints.get(id(catalog))
+        if fingerprint is None or fingerprint[0] is not catalog:
+            fingerprint = (catalog, catalog_fingerprint(catalog))
+            self._fingerprints = {id(catalog): fingerprint}
+        grid = repr(sorted(time_grid().to_config().items()))
+        return (ENGINE_VERSION, fingerprint[1], grid, trimester, seed, engine_version(engine))
+
+    @staticmethod
+    def section_key(run_key: Tuple, group: str, program: str, year: str, section_num: int,
+                    occupancy: RoomOccupancy = None) -> Tuple:
+        return run_key + (group, program, year, section_num, occupancy_digest(occupancy))
+
+    def get(self, key: Tuple) -> Optional[List[Course]]:
+        courses = self.entries.get(key)
+        if courses is not None:
+            self.entries.move_to_end(key)
+        elif self.directory is not None:
+            courses = self._load(key)
+            if courses is not None:
+                self._remember(key, courses)
+        if courses is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [c.clone() for c in courses]
+
+    def put(self, key: Tuple, courses: List[Course]):
+        courses = [c.clone() for c in courses]
+        self._remember(key, courses)
+        if self.directory is not None:
+            self._store(key, courses)
+
+    def clear(self):
+        self.entries.clear()
+
+    def _remember(self, key: Tuple, courses: List[Course]):
+        self.entries[key] = courses
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _path(self, key: Tuple) -> str:
+        name = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"section-{name}.pkl")
+
+    def _load(self, key: Tuple) -> Optional[List[Course]]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                stored_key, courses = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        # Guard against a (vanishingly unlikely) file name collision
+        return courses if stored_key == key else None
+
+    def _store(self, key: Tuple, courses: List[Course]):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                pickle.dump((key, courses), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            # A read-only or full cache directory only costs the speed-up
+            pass
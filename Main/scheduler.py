@@ -0,0 +1,1330 @@
+"""
+Scheduling core: course data model, catalog, room occupancy and the
+section placement logic. Has no GUI dependencies so it can be driven by
+the tkinter app, the command line, or other scripts.
+"""
+import json
+import os
+import re
+import pandas as pd
+import random
+import time
+from typing import List, Dict, Tuple, Set, Iterator, Callable, NamedTuple, Optional, Sequence, FrozenSet
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+from instrument import active as active_stats, add_time, count_skip
+
+############################################
+#               DATA CLASSES               #
+############################################
+
+def parse_time(value: str) -> int:
+    """
+    '7:30am' -> minutes after midnight (450). Same format strptime's
+    '%I:%M%p' accepts, without building a datetime.
+    """
+    value = value.strip()
+    suffix = value[-2:].lower()
+    hours, minutes = value[:-2].split(':')
+    hours, minutes = int(hours), int(minutes)
+    if suffix not in ('am', 'pm') or not (1 <= hours <= 12) or not (0 <= minutes <= 59):
+        raise ValueError(f"time data {value!r} does not match format '%I:%M%p'")
+    return (hours % 12 + (12 if suffix == 'pm' else 0)) * 60 + minutes
+
+
+def format_time(minutes: int) -> str:
+    """
+    Minutes after midnight -> '08:50AM', the strftime('%I:%M%p') layout
+    used for slot end times in exported schedules.
+    """
+    hours, mins = divmod(minutes % (24 * 60), 60)
+    return f"{(hours % 12) or 12:02d}:{mins:02d}{'AM' if hours < 12 else 'PM'}"
+
+
+class CourseTemplate(NamedTuple):
+    """
+    The immutable catalog part of a course, shared by every section's copy.
+    """
+    code: str
+    description: str
+    units: int
+    is_lab: bool
+    is_lec: bool
+    base_code: str
+    pair_key: str
+    is_restricted_room_course: bool
+    room_class: str
+
+    @classmethod
+    def create(cls, code: str, description: str, units: int) -> 'CourseTemplate':
+        base_code = code.split('(')[0].strip()
+        base_desc = description.split('(')[0].strip()
+        restricted_codes = {'NSTP1', 'PathFit', 'PATHFit'}
+        is_lab = '(Lab)' in description
+        return cls(
+            code, description, units,
+            is_lab,
+            '(Lec)' in description,
+            base_code,
+            f"{base_code}_{base_desc}",
+            any(c in code for c in restricted_codes),
+            classify_room_class(code, is_lab)
+        )
+
+
+class Course:
+    """
+    One course meeting of a section. Catalog fields live on a shared
+    CourseTemplate; only the assignment (time, days, room, instructor and
+    the start/end as minutes after midnight) is stored per instance, so
+    clone() is a shallow copy of a handful of slots.
+    """
+    __slots__ = ('template', 'time', 'days', 'room', 'instructor', 'start_minute', 'end_minute')
+
+    def __init__(self, code: str, description: str, units: int, time: str, days: str, room: str):
+        self.template = CourseTemplate.create(code, description, units)
+        self.time = time
+        self.days = days
+        self.room = room
+        self.instructor = ''
+        self.start_minute = parse_time(time.split('-')[0])
+        self.end_minute = parse_time(time.split('-')[1])
+
+    code = property(lambda self: self.template.code)
+    description = property(lambda self: self.template.description)
+    units = property(lambda self: self.template.units)
+    is_lab = property(lambda self: self.template.is_lab)
+    is_lec = property(lambda self: self.template.is_lec)
+    base_code = property(lambda self: self.template.base_code)
+    pair_key = property(lambda self: self.template.pair_key)
+
+    def get_base_code(self) -> str:
+        return self.template.base_code
+    
+    def get_pair_key(self) -> str:
+        return self.template.pair_key
+
+    @classmethod
+    def from_template(cls, template: CourseTemplate, time: str, days: str, room: str,
+                      instructor: str = '') -> 'Course':
+        """
+        A course sharing an existing template, skipping CourseTemplate.create.
+        """
+        course = cls.__new__(cls)
+        course.template = template
+        course.time = time
+        course.days = days
+        course.room = room
+        course.instructor = instructor
+        course.start_minute = parse_time(time.split('-')[0])
+        course.end_minute = parse_time(time.split('-')[1])
+        return course
+
+    def __lt__(self, other):
+        return self.start_minute < other.start_minute
+
+    def clone(self):
+        clone = Course.__new__(Course)
+        clone.template = self.template
+        clone.time = self.time
+        clone.days = self.days
+        clone.room = self.room
+        clone.instructor = self.instructor
+        clone.start_minute = self.start_minute
+        clone.end_minute = self.end_minute
+        return clone
+
+    def assign_slot(self, slot: 'TimeSlot', days: str = None):
+        """
+        Move the course into slot. With days, also set its day pattern and
+        end it after that pattern's meeting length in the active TimeGrid.
+        """
+        end_minute = slot.end_minute
+        if days is not None:
+            self.days = days
+            end_minute = slot.start_minute + TIME_GRID.duration_for(days)
+        self.time = f"{slot.start_time_str}-{format_time(end_minute)}"
+        self.start_minute = slot.start_minute
+        self.end_minute = end_minute
+
+    def is_restricted_room_course(self) -> bool:
+        return self.template.is_restricted_room_course
+
+
+class TimeSlot:
+    def __init__(self, start_time: str, index: int = None, duration: int = None):
+        self.start_minute = parse_time(start_time)
+        self.end_minute = self.start_minute + (duration or DEFAULT_SLOT_MINUTES)
+        self.start_time_str = start_time
+        self.end_time_str = format_time(self.end_minute)
+        self.index = index if index is not None else SLOT_INDEX.get(start_time)
+
+    def __lt__(self, other):
+        return self.start_minute < other.start_minute
+
+
+class SlotGrid:
+    """
+    Per-section slot usage: one bitmask per day side (MWF / TTH), bit i set
+    when BASE_TIMES[i] is taken. The TimeSlot objects themselves are the
+    shared, stateless BASE_SLOTS.
+    """
+    def __init__(self):
+        self.slots = BASE_SLOTS
+        self.full_mask = (1 << len(self.slots)) - 1
+        self.used = {True: 0, False: 0}
+
+    def is_available(self, index: int, is_mwf: bool) -> bool:
+        return not (self.used[is_mwf] >> index) & 1
+
+    def mark_used(self, index: int, is_mwf: bool):
+        self.used[is_mwf] |= 1 << index
+
+    def free_mask(self, is_mwf: bool) -> int:
+        return self.full_mask & ~self.used[is_mwf]
+
+
+class CourseCatalog:
+    """
+    Course templates indexed by (Program, Year_Level, Trimester).
+
+    Built once from the imported CSV so each section lookup is a dict hit
+    instead of a DataFrame filter. The BSIT fallback rule is applied while
+    building the index, so specializations resolve directly to the shared
+    BSIT templates. Templates are never mutated; scheduling works on clones.
+    """
+    COLUMNS = ['Course_Code', 'Description', 'Units', 'Time', 'Days', 'Room',
+               'Program', 'Year_Level', 'Trimester']
+
+    def __init__(self):
+        self.index: Dict[Tuple[str, str, str], List[Course]] = {}
+        self.rooms: Set[str] = set()
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'CourseCatalog':
+        catalog = cls()
+        for code, desc, units, time, days, room, program, year, tri in \
+                df[cls.COLUMNS].itertuples(index=False, name=None):
+            catalog.index.setdefault((program, year, tri), []).append(
+                Course(code, desc, units, time, days, room)
+            )
+            catalog.rooms.add(room)
+        catalog.apply_bsit_fallback()
+        return catalog
+
+    def apply_bsit_fallback(self):
+        for program in BSIT_SPECIALIZATIONS:
+            for year, tri in BSIT_FALLBACK_COMBINATIONS:
+                self.index[(program, year, tri)] = self.index.get(("BSIT", year, tri), [])
+
+    def get_courses(self, program: str, year: str, trimester: str) -> List[Course]:
+        return self.index.get((program, year, trimester), [])
+
+
+class RoomOccupancy:
+    """
+    Campus-wide room bookings shared by every section of one generation run.
+
+    One byte per (room, day pattern, slot) cell in a flat bytearray, so
+    checking or reserving a cell is a single index operation. The day pattern
+    is the MWF side (MW/MWF) or the TTH side (TTH/TTHS), matching TimeSlot.
+    Restricted rooms (Gym, Aud) are shared venues: placing a course never
+    books them out, only close does.
+    """
+    def __init__(self, rooms: Set[str], num_slots: int = None):
+        self.num_slots = num_slots if num_slots is not None else len(BASE_TIMES)
+        self.rooms: Set[str] = set()
+        self.room_ids: Dict[str, int] = {}
+        self.grid = bytearray()
+        for room in sorted(rooms):
+            self.add_room(room)
+
+    def add_room(self, room: str) -> int:
+        if room not in self.room_ids:
+            self.room_ids[room] = len(self.room_ids)
+            self.rooms.add(room)
+            self.grid.extend(bytes(2 * self.num_slots))
+        return self.room_ids[room]
+
+    def _cell(self, room: str, is_mwf: bool, slot_index: int) -> int:
+        room_id = self.room_ids.get(room)
+        if room_id is None:
+            room_id = self.add_room(room)
+        return (room_id * 2 + (0 if is_mwf else 1)) * self.num_slots + slot_index
+
+    def is_free(self, room: str, is_mwf: bool, slot_index: int) -> bool:
+        return not self.grid[self._cell(room, is_mwf, slot_index)]
+
+    def reserve(self, room: str, is_mwf: bool, slot_index: int):
+        if room in RESTRICTED_ROOMS:
+            return
+        self.grid[self._cell(room, is_mwf, slot_index)] = 1
+
+    def close(self, room: str, is_mwf: bool, slot_index: int):
+        """
+        Take a cell out of use, shared venues included (see group_occupancy).
+        """
+        self.grid[self._cell(room, is_mwf, slot_index)] = 1
+
+    def reserve_courses(self, courses: Sequence['Course']):
+        """
+        Book already placed courses, e.g. a section taken from a cache.
+        """
+        for course in courses:
+            slot_index = SLOT_BY_MINUTE.get(course.start_minute)
+            side = TIME_GRID.side(course.days)
+            if slot_index is not None and side is not None:
+                self.reserve(course.room, side, slot_index)
+
+    def free_rooms(self, rooms: Sequence[str], is_mwf: bool, slot_index: int) -> List[str]:
+        return [r for r in rooms if self.is_free(r, is_mwf, slot_index)]
+
+    def copy(self) -> 'RoomOccupancy':
+        """
+        Scratch copy for trial placements; see update_from to keep one.
+        """
+        clone = RoomOccupancy.__new__(RoomOccupancy)
+        clone.num_slots = self.num_slots
+        clone.rooms = set(self.rooms)
+        clone.room_ids = dict(self.room_ids)
+        clone.grid = bytearray(self.grid)
+        return clone
+
+    def update_from(self, other: 'RoomOccupancy'):
+        self.rooms = set(other.rooms)
+        self.room_ids = dict(other.room_ids)
+        self.grid[:] = other.grid
+
+
+############################################
+#        HELPER FUNCTIONS / CONSTANTS      #
+############################################
+
+MAJOR_SUBJECTS = {
+    'CC1', 'CC10', 'CC11', 'CC12', 'CC13', 'CC14', 'CC15', 'CC16', 'CC17', 'CC18', 'CC19', 'CC2',
+    'CC21', 'CC22', 'CC23', 'CC24', 'CC3', 'CC4', 'CC5', 'CC6', 'CC7', 'CC8', 'CC9', 'CCS10',
+    'CCS11', 'CCS12', 'CCS13', 'CCS14', 'CCS15', 'CCS16', 'CCS2', 'CCS3', 'CCS4', 'CCS5', 'CCS6',
+    'CCS7', 'CCS8', 'CCS9', 'CDA1', 'CDA10', 'CDA11', 'CDA12', 'CDA2', 'CDA3', 'CDA4', 'CDA5',
+    'CDA6', 'CDA7', 'CDA8', 'CDA9', 'CIT1', 'CIT10', 'CIT11', 'CIT12', 'CIT14', 'CIT15', 'CIT16',
+    'CIT17', 'CIT18', 'CIT19', 'CIT26', 'CIT22', 'CIT23', 'CIT24', 'CIT25', 'CIT3', 'CIT4', 'CIT5',
+    'CIT6', 'CIT7', 'CIT8', 'CIT9', 'CCS1', 'MCC1', 'MCC2', 'MCC3', 'MCC4', 'MCC5', 'MCC6', 'MCC7', 
+    'MCC8', 'MM12', 'MMC1', 'MMC11', 'MMC13','MMC14', 'MMC15', 'MMC16', 'MMC17', 'MMC18', 'MMC19', 
+    'MMC2', 'MMC3', 'MMC4', 'MMC5', 'MMC6', 'MMC7', 'MMC8', 'MMC9', 'CIT13'
+}
+
+LAB_ROOMS = {'M303', 'M304', 'M305', 'M306', 'M307', 'N3001', 'N3002', 'S312'}
+MAJOR_ROOMS = {'M301', 'M303', 'M304', 'M305', 'M306', 'M307', 'N3001', 'N3002', 'S312'}
+RESTRICTED_ROOMS = {'Gym', 'Aud'}
+
+# BSIT specializations share the common BSIT curriculum for these
+# (year, trimester) combos instead of their own rows.
+BSIT_SPECIALIZATIONS = ["BSIT(WebTech)", "BSIT(Netsec)", "BSIT(ERP)"]
+BSIT_FALLBACK_COMBINATIONS = {
+    ("Third", "Third"),  # 3rd year, 3rd trimester
+    ("First", "Second"), # 1st year, 2nd trimester
+    ("First", "First"),  # 1st year, 1st trimester
+    ("First", "Third")   # 1st year, 3rd trimester
+}
+
+############################################
+#                TIME GRID                 #
+############################################
+
+DEFAULT_SLOT_TIMES = [
+    '7:30am', '8:50am', '10:10am', '11:30am',
+    '12:50pm', '2:10pm', '3:30pm', '4:50pm', '6:10pm'
+]
+DEFAULT_SLOT_MINUTES = 80
+
+# What each day family uses its patterns for
+FAMILY_ROLES = ["lecture", "lab", "standalone", "pathfit"]
+
+DEFAULT_DAY_FAMILIES = [
+    # If lecture is MW, lab must be MWF
+    {"lecture": "MW", "lab": "MWF", "standalone": "MWF", "pathfit": "MW"},
+    # If lecture is TTH, lab must be TTHS
+    {"lecture": "TTH", "lab": "TTHS", "standalone": "TTHS", "pathfit": "TTH"},
+]
+
+DAY_BITS = {'M': 1, 'T': 2, 'W': 4, 'TH': 8, 'F': 16, 'S': 32, 'SAT': 32, 'SUN': 64}
+_DAY_TOKEN = re.compile(r'TH|SAT|SUN|[MTWFS]')
+
+
+def day_mask(days: str) -> int:
+    """
+    Bitmask of the weekdays in a pattern: 'MWF' -> M|W|F, 'TTHS' -> T|TH|S.
+    """
+    mask = 0
+    for token in _DAY_TOKEN.findall(str(days).upper()):
+        mask |= DAY_BITS[token]
+    return mask
+
+
+class TimeGrid:
+    """
+    The weekly grid a run schedules into: slot start times, the meeting
+    length of each day pattern, and which patterns the engines use.
+
+    Patterns belong to one of two day families that share no weekday: the
+    MWF side (True) and the TTH side (False) of SlotGrid and RoomOccupancy.
+    Each family names its lecture, lab, standalone and PathFit pattern and
+    may list extra patterns (e.g. a Saturday-only "S") to recognise. The
+    lecture pattern of a family pairs with its lab pattern.
+
+    Everything is compiled once into slot indices, a start minute -> slot
+    lookup and per-pattern weekday bitmasks; see set_time_grid.
+    """
+    def __init__(self, slot_times: Sequence[str] = None, duration: int = DEFAULT_SLOT_MINUTES,
+                 durations: Dict[str, int] = None, families: Sequence[Dict] = None):
+        self.slot_times = list(slot_times or DEFAULT_SLOT_TIMES)
+        self.duration = int(duration)
+        self.durations = {pattern: int(m) for pattern, m in (durations or {}).items()}
+        self.families = [dict(f) for f in (families or DEFAULT_DAY_FAMILIES)]
+        if len(self.families) != 2:
+            raise ValueError("A time grid needs exactly two day families (MWF side, TTH side)")
+
+        self.start_minutes = [parse_time(t) for t in self.slot_times]
+        if any(b <= a for a, b in zip(self.start_minutes, self.start_minutes[1:])):
+            raise ValueError("Slot times must be in increasing order")
+
+        self.pattern_sides: Dict[str, bool] = {}
+        for side, family in zip((True, False), self.families):
+            missing = [role for role in FAMILY_ROLES if role not in family]
+            if missing:
+                raise ValueError(f"Day family {family} has no {', '.join(missing)} pattern")
+            for pattern in [family[role] for role in FAMILY_ROLES] + list(family.get("patterns", [])):
+                if self.pattern_sides.get(pattern, side) != side:
+                    raise ValueError(f"Day pattern {pattern} is in both day families")
+                self.pattern_sides[pattern] = side
+        self.lecture = {side: f["lecture"] for side, f in zip((True, False), self.families)}
+        self.lab = {side: f["lab"] for side, f in zip((True, False), self.families)}
+        self.standalone = {side: f["standalone"] for side, f in zip((True, False), self.families)}
+        self.pathfit = {side: f["pathfit"] for side, f in zip((True, False), self.families)}
+        self.pairs = {self.lecture[side]: self.lab[side] for side in (True, False)}
+
+        self.day_masks = {pattern: day_mask(pattern) for pattern in self.pattern_sides}
+        side_days = {True: 0, False: 0}
+        for pattern, side in self.pattern_sides.items():
+            side_days[side] |= self.day_masks[pattern]
+        if side_days[True] & side_days[False]:
+            raise ValueError("The two day families share a weekday")
+
+        for pattern in self.pattern_sides:
+            length = self.duration_for(pattern)
+            if length <= 0:
+                raise ValueError(f"Meeting length for {pattern} must be positive")
+            if any(a + length > b for a, b in zip(self.start_minutes, self.start_minutes[1:])):
+                raise ValueError(f"{length}-minute {pattern} meetings would run into the next slot")
+
+    def duration_for(self, days: str) -> int:
+        return self.durations.get(days, self.duration)
+
+    def side(self, days: str) -> Optional[bool]:
+        """
+        True for the MWF family, False for the TTH family, None if unknown.
+        """
+        return self.pattern_sides.get(days)
+
+    def to_config(self) -> Dict[str, object]:
+        return {"slots": self.slot_times, "duration": self.duration,
+                "durations": self.durations, "families": self.families}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, object]) -> 'TimeGrid':
+        """
+        Build from a dict like
+        {"slots": ["7:30am", ...], "duration": 80, "durations": {"MWF": 50},
+         "families": [{"lecture": "MW", "lab": "MWF", "standalone": "MWF",
+                       "pathfit": "MW", "patterns": ["M"]}, {...}]}.
+        Every key is optional and defaults to the standard grid.
+        """
+        unknown = set(config) - {"slots", "duration", "durations", "families"}
+        if unknown:
+            raise ValueError(f"Unknown time grid settings: {', '.join(sorted(unknown))}")
+        return cls(config.get("slots"), config.get("duration", DEFAULT_SLOT_MINUTES),
+                   config.get("durations"), config.get("families"))
+
+
+def load_time_grid(path: str) -> TimeGrid:
+    with open(path) as f:
+        return TimeGrid.from_config(json.load(f))
+
+
+# The active grid and its compiled views. set_time_grid updates the views
+# in place, so modules that imported them by name always see the active grid.
+TIME_GRID: TimeGrid = None
+BASE_TIMES: List[str] = []
+BASE_SLOTS: List[TimeSlot] = []
+SLOT_INDEX: Dict[str, int] = {}
+SLOT_BY_MINUTE: Dict[int, int] = {}
+DAY_PATTERN_PAIRS: Dict[str, str] = {}
+
+# (num_slots, free_mask) -> consecutive block starts, filled lazily per grid
+_sequence_starts: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+
+
+def set_time_grid(grid: TimeGrid):
+    global TIME_GRID
+    TIME_GRID = grid
+    BASE_TIMES[:] = grid.slot_times
+    SLOT_INDEX.clear()
+    SLOT_INDEX.update((t, i) for i, t in enumerate(grid.slot_times))
+    BASE_SLOTS[:] = [TimeSlot(t, i, grid.duration) for i, t in enumerate(grid.slot_times)]
+    SLOT_BY_MINUTE.clear()
+    SLOT_BY_MINUTE.update((slot.start_minute, slot.index) for slot in BASE_SLOTS)
+    DAY_PATTERN_PAIRS.clear()
+    DAY_PATTERN_PAIRS.update(grid.pairs)
+    _sequence_starts.clear()
+
+
+def time_grid() -> TimeGrid:
+    return TIME_GRID
+
+
+set_time_grid(TimeGrid())
+
+
+############################################
+#          ROOM ELIGIBILITY INDEX          #
+############################################
+
+# Room classes a course template is sorted into once, when it is created
+ROOM_CLASS_NSTP = 'NSTP'
+ROOM_CLASS_PATHFIT = 'PATHFIT'
+ROOM_CLASS_LAB = 'LAB'
+ROOM_CLASS_MAJOR = 'MAJOR'
+ROOM_CLASS_REGULAR = 'REGULAR'
+
+
+def build_prefix_trie(codes: Set[str]) -> dict:
+    """
+    Character trie over codes; a node's '$' key holds the code ending there.
+    """
+    trie = {}
+    for code in codes:
+        node = trie
+        for ch in code:
+            node = node.setdefault(ch, {})
+        node['$'] = code
+    return trie
+
+
+MAJOR_SUBJECT_TRIE = build_prefix_trie(MAJOR_SUBJECTS)
+
+
+def match_major_subject(code: str) -> Optional[str]:
+    """
+    Longest MAJOR_SUBJECTS entry that code starts with, or None.
+
+    Major subjects are matched by prefix, not by exact code: 'CC1' also
+    claims 'CC100' or 'CC1A', and 'CC10' matches both 'CC1' and 'CC10'.
+    The longest entry is returned so callers can tell an exact match
+    (result == base code) from one that only holds through a shorter entry.
+    """
+    node = MAJOR_SUBJECT_TRIE
+    match = None
+    for ch in code:
+        node = node.get(ch)
+        if node is None:
+            break
+        match = node.get('$', match)
+    return match
+
+
+def major_prefix_collisions(codes: Set[str] = MAJOR_SUBJECTS) -> Dict[str, List[str]]:
+    """
+    Entries that are a prefix of other entries, e.g. {'CC1': ['CC10', ...]}.
+    These are the codes whose prefix match is ambiguous.
+    """
+    collisions = {}
+    for code in sorted(codes):
+        longer = sorted(c for c in codes if c != code and c.startswith(code))
+        if longer:
+            collisions[code] = longer
+    return collisions
+
+
+def classify_room_class(code: str, is_lab: bool) -> str:
+    """
+    Which room pool a course draws from, in get_available_rooms' precedence:
+    NSTP, PathFit, lab, major subject, everything else.
+    """
+    if 'NSTP' in code:
+        return ROOM_CLASS_NSTP
+    if 'PathFit' in code or 'PATHFit' in code:
+        return ROOM_CLASS_PATHFIT
+    if is_lab:
+        return ROOM_CLASS_LAB
+    if match_major_subject(code) is not None:
+        return ROOM_CLASS_MAJOR
+    return ROOM_CLASS_REGULAR
+
+
+@lru_cache(maxsize=256)
+def room_pools(all_rooms: FrozenSet[str]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Candidate rooms per room class for one room universe, as shared sorted
+    tuples (sorted so a seeded Random picks the same room in every process).
+    Cached, so each distinct universe is computed once.
+    """
+    return {
+        ROOM_CLASS_NSTP: ('Aud',),
+        ROOM_CLASS_PATHFIT: ('Gym',),
+        ROOM_CLASS_LAB: tuple(sorted(LAB_ROOMS)),
+        ROOM_CLASS_MAJOR: tuple(sorted(MAJOR_ROOMS)),
+        # All rooms except restricted (Gym, Aud), lab, and major rooms
+        ROOM_CLASS_REGULAR: tuple(sorted(all_rooms - RESTRICTED_ROOMS - LAB_ROOMS - MAJOR_ROOMS)),
+    }
+
+
+def get_available_rooms(course: Course, all_rooms: Set[str], year_level: str, trimester: str,
+                        occupancy: RoomOccupancy = None, slot_index: int = None,
+                        is_mwf: bool = True,
+                        pools: Dict[str, Tuple[str, ...]] = None) -> Sequence[str]:
+    """
+    Return the possible rooms for the course based on:
+      - Whether it's an NSTP or PathFit (restricted specific rooms).
+      - If it's a lab course (use only lab rooms).
+      - If it's a major subject (use major rooms).
+      - Otherwise return all rooms except restricted ones, labs, and major rooms.
+    The class is precomputed on the course template and the rooms come from
+    room_pools; pass pools to skip even the cache lookup.
+    When an occupancy model and slot are given, rooms already booked at that
+    slot/day pattern are left out.
+    """
+    if pools is None:
+        pools = room_pools(frozenset(all_rooms))
+    rooms = pools[course.template.room_class]
+    if occupancy is not None and slot_index is not None:
+        return occupancy.free_rooms(rooms, is_mwf, slot_index)
+    return rooms
+
+
+##########################################
+#   CONSECUTIVE SLOT SEQUENCE TABLES     #
+##########################################
+def _scan_sequence_starts(free_mask: int, num_slots: int) -> Tuple[int, ...]:
+    """
+    Start indices the original slot scan yields for one availability mask.
+    Each scan start skips ahead to the first free slot and then needs
+    num_slots free slots in a row, so a start can appear more than once;
+    that is kept so the random pick is weighted exactly as before.
+    """
+    n = len(BASE_TIMES)
+    starts = []
+    for i in range(n - num_slots + 1):
+        j = i
+        while j < n and not (free_mask >> j) & 1:
+            j += 1
+        if j + num_slots <= n and all((free_mask >> (j + k)) & 1 for k in range(num_slots)):
+            starts.append(j)
+    return tuple(starts)
+
+
+def get_consecutive_time_slots(time_slots: SlotGrid, is_mwf: bool, num_slots: int) -> List[List[TimeSlot]]:
+    """
+    Find available consecutive time slots with strictly enforced gap rules
+    (each next slot starts exactly where the previous one ended).
+    Starts are scanned once per (num_slots, free-slot mask) and memoized,
+    so only the masks that actually occur are ever computed.
+    """
+    if num_slots > len(BASE_TIMES):
+        return []
+    key = (num_slots, time_slots.free_mask(is_mwf))
+    starts = _sequence_starts.get(key)
+    if starts is None:
+        starts = _sequence_starts[key] = _scan_sequence_starts(key[1], num_slots)
+    slots = time_slots.slots
+    return [slots[start:start + num_slots] for start in starts]
+
+
+############################################
+#        COURSE SCHEDULING LOGIC           #
+############################################
+
+def balance_and_shuffle_courses(courses: List[Course], year_level: str, trimester: str,
+                                occupancy: RoomOccupancy = None,
+                                rng: random.Random = None) -> List[Course]:
+    """
+    Distribute courses among MWF or TTH schedules, taking into account 
+    whether a course is lab or lecture (paired) or standalone, 
+    trying to keep a balance between MWF and TTH usage.
+    If an occupancy model is passed, rooms are drawn from the campus-wide
+    pool and every placement is booked in it, so sections sharing the model
+    never double-book a room.
+    All randomness comes from rng, so a seeded Random reproduces the result.
+    """
+    if rng is None:
+        rng = random.Random()
+    
+    # Initialize base time slots
+    time_slots = SlotGrid()
+    
+    # Track room assignments per (base) course code
+    course_room_history = {}
+    
+    # Group courses by pairing (lec+lab) or standalone
+    paired_courses = {}
+    standalone_courses = []
+    
+    # Track usage of consecutive slots (so as not to overload them)
+    consecutive_slot_count = {}
+    
+    grouping_started = time.perf_counter()
+    for course in courses:
+        if course.is_lab or course.is_lec:
+            paired_courses.setdefault(course.pair_key, []).append(course.clone())
+        else:
+            standalone_courses.append(course.clone())
+    add_time("pair_grouping", time.perf_counter() - grouping_started)
+    
+    if occupancy is not None:
+        all_rooms = occupancy.rooms
+    else:
+        all_rooms = set(course.room for course in courses)
+    pools = room_pools(frozenset(all_rooms))
+    
+    # Lists to store pairs and standalone assignments
+    mwf_pairs = []       # Will store (lecture, lab) tuples
+    tth_pairs = []       # Will store (lecture, lab) tuples
+    mwf_standalone = []
+    tth_standalone = []
+
+    def can_use_single_pattern(yr_level: str, tri: str) -> bool:
+        """
+        Decide if we allow the schedule to be unbalanced (a single pattern).
+        Example rule: For third-year second or third trimester, 30% chance.
+        """
+        if yr_level == "Third" and tri in ["Second", "Third"]:
+            return rng.random() < 0.3
+        return False
+    
+    def should_use_mwf(current_mwf_count: int, current_tth_count: int, 
+                       total_c: int, allow_unbalanced: bool) -> bool:
+        """
+        Decide if the next course/pair should use MWF (True) or TTH (False).
+        Balances usage between MWF and TTH unless unbalanced is allowed.
+        """
+        if allow_unbalanced:
+            return rng.random() < 0.5
+        
+        target_ratio = 0.5  
+        current_ratio = current_mwf_count / max(1, (current_mwf_count + current_tth_count))
+        
+        # If we're significantly off balance, force correction
+        if current_ratio < 0.4:
+            return True
+        if current_ratio > 0.6:
+            return False
+        
+        # Otherwise, slightly bias toward balancing but allow randomness
+        balance_bias = target_ratio - current_ratio
+        random_threshold = 0.5 + (balance_bias * 0.5)
+        return rng.random() < random_threshold
+    
+    def select_room(course: Course, available_rooms: List[str],
+                    slot: TimeSlot = None, is_mwf: bool = True) -> str:
+        """
+        Select an appropriate room for the course.
+        Prefer reusing a room for the same course code if possible.
+        With an occupancy model, only rooms free at the slot are considered
+        and the chosen room is booked.
+        """
+        if course.is_restricted_room_course():
+            if 'NSTP' in course.code:
+                return 'Aud'
+            if 'PathFit' in course.code or 'PATHFit' in course.code:
+                return 'Gym'
+        
+        if occupancy is not None and slot is not None:
+            available_rooms = occupancy.free_rooms(available_rooms, is_mwf, slot.index)
+        
+        base_code = course.base_code
+        
+        # Reuse a previously used room with 60% chance, if available
+        selected_room = None
+        if base_code in course_room_history:
+            previously_used = [r for r in available_rooms if r in course_room_history[base_code]]
+            if previously_used and rng.random() < 0.6:
+                selected_room = rng.choice(previously_used)
+        
+        # Otherwise, pick a random available room
+        if selected_room is None:
+            selected_room = rng.choice(available_rooms)
+            
+            # Record this room usage for future reference
+            course_room_history.setdefault(base_code, set()).add(selected_room)
+        
+        if occupancy is not None and slot is not None:
+            occupancy.reserve(selected_room, is_mwf, slot.index)
+        
+        return selected_room
+
+    # Decide if we can allow unbalanced scheduling
+    allow_unbalanced = can_use_single_pattern(year_level, trimester)
+    total_course_count = len(paired_courses) + len(standalone_courses)
+    
+    # Process paired (lecture+lab) courses
+    pair_keys = list(paired_courses.keys())
+    rng.shuffle(pair_keys)
+    
+    for pair_key in pair_keys:
+        pair = paired_courses[pair_key]
+        # Sort pair so lecture is first, lab is second
+        pair.sort(key=lambda x: 0 if x.is_lec else 1)
+        
+        # Determine rooms for each course in the pair
+        rooms_for_pair = []
+        for c in pair:
+            avail_rooms = get_available_rooms(c, all_rooms, year_level, trimester, pools=pools)
+            if not avail_rooms:
+                break
+            rooms_for_pair.append(avail_rooms)
+        
+        # If any course in this pair has no available rooms, skip
+        if len(rooms_for_pair) != len(pair):
+            count_skip("no_eligible_room", len(pair))
+            continue
+        
+        try:
+            # First, assign lecture time slot and pattern
+            lec_course = next(c for c in pair if c.is_lec)
+            lab_course = next(c for c in pair if c.is_lab)
+        except StopIteration:
+            # If either lecture or lab is missing in this pair, skip it
+            count_skip("missing_partner", len(pair))
+            continue
+        # Only one lecture and one lab per pair key are ever placed
+        count_skip("extra_pair_member", len(pair) - 2)
+
+        
+        # Decide if we should use MWF
+        current_mwf_count = len(mwf_pairs)*2 + len(mwf_standalone)
+        current_tth_count = len(tth_pairs)*2 + len(tth_standalone)
+        use_mwf = should_use_mwf(current_mwf_count, current_tth_count, 
+                                 total_course_count, allow_unbalanced)
+        
+        lec_pattern = TIME_GRID.lecture[use_mwf]
+        lab_pattern = DAY_PATTERN_PAIRS[lec_pattern]
+        
+        is_mwf_lec = TIME_GRID.side(lec_pattern)
+        is_mwf_lab = TIME_GRID.side(lab_pattern)
+        
+        # Find consecutive slots for 2 classes
+        lec_sequences = get_consecutive_time_slots(time_slots, is_mwf_lec, 2)
+        
+        # Keep only blocks where both lecture and lab still have a free room
+        if occupancy is not None:
+            lec_sequences = [
+                seq for seq in lec_sequences
+                if occupancy.free_rooms(rooms_for_pair[0], is_mwf_lec, seq[0].index)
+                and occupancy.free_rooms(rooms_for_pair[1], is_mwf_lab, seq[1].index)
+            ]
+        if not lec_sequences:
+            count_skip("no_consecutive_slots", 2)
+            continue
+        
+        # Choose one consecutive block
+        consecutive_slots = rng.choice(lec_sequences)
+        
+        # Mark the two chosen slots as used: first for lecture, second for lab
+        lec_slot = consecutive_slots[0]
+        lab_slot = consecutive_slots[1]
+        time_slots.mark_used(lec_slot.index, is_mwf_lec)
+        time_slots.mark_used(lab_slot.index, is_mwf_lab)
+        
+        # Lecture scheduling
+        lec_course.assign_slot(lec_slot, lec_pattern)
+        lec_course.room = select_room(lec_course, rooms_for_pair[0], lec_slot, is_mwf_lec)
+        
+        # Lab scheduling (right after lecture)
+        lab_course.assign_slot(lab_slot, lab_pattern)
+        lab_course.room = select_room(lab_course, rooms_for_pair[1], lab_slot, is_mwf_lab)
+        
+        # Store the pair in appropriate list
+        if is_mwf_lec:
+            mwf_pairs.append((lec_course, lab_course))
+        else:
+            tth_pairs.append((lec_course, lab_course))
+    
+    # Process standalone courses
+    rng.shuffle(standalone_courses)
+    for course in standalone_courses:
+        available_rooms = get_available_rooms(course, all_rooms, year_level, trimester, pools=pools)
+        if not available_rooms:
+            count_skip("no_eligible_room")
+            continue
+        
+        current_mwf_count = len(mwf_pairs)*2 + len(mwf_standalone)
+        current_tth_count = len(tth_pairs)*2 + len(tth_standalone)
+        use_mwf = should_use_mwf(current_mwf_count, current_tth_count, 
+                                 total_course_count, allow_unbalanced)
+        
+        # Decide pattern
+        # For PathFit codes, assign strictly MW or TTH.
+        # For all others, assign MWF or TTHS.
+        if 'PathFit' in course.code or 'PATHFit' in course.code:
+            pattern = TIME_GRID.pathfit[use_mwf]
+        else:
+            pattern = TIME_GRID.standalone[use_mwf]
+        
+        is_mwf = TIME_GRID.side(pattern)
+        
+        # Pick one available slot
+        possible_slots = [ts for ts in time_slots.slots if time_slots.is_available(ts.index, is_mwf)]
+        if occupancy is not None:
+            possible_slots = [ts for ts in possible_slots
+                              if occupancy.free_rooms(available_rooms, is_mwf, ts.index)]
+        if not possible_slots:
+            count_skip("no_free_slot")
+            continue
+        
+        selected_slot = rng.choice(possible_slots)
+        time_slots.mark_used(selected_slot.index, is_mwf)
+        
+        # Manage a simple "consecutive slot" rule for standalone courses
+        day_key = 'mwf' if is_mwf else 'tth'
+        consecutive_slot_count.setdefault(day_key, 0)
+        
+        # If we used 1 slot in a row, mark the next slot as used (simulate break)
+        if consecutive_slot_count[day_key] == 1:
+            idx = selected_slot.index
+            if idx + 1 < len(time_slots.slots):
+                time_slots.mark_used(idx + 1, is_mwf)
+            consecutive_slot_count[day_key] = 0
+        else:
+            consecutive_slot_count[day_key] += 1
+        
+        # Assign final scheduling info
+        course.assign_slot(selected_slot, pattern)
+        course.room = select_room(course, available_rooms, selected_slot, is_mwf)
+        
+        if is_mwf:
+            mwf_standalone.append(course)
+        else:
+            tth_standalone.append(course)
+    
+    # Combine MWF pairs + standalones
+    mwf_courses = []
+    for lec, lab in mwf_pairs:
+        mwf_courses.extend([lec, lab])
+    mwf_courses.extend(mwf_standalone)
+    mwf_courses.sort(key=lambda x: x.start_minute)
+    
+    # Combine TTH pairs + standalones
+    tth_courses = []
+    for lec, lab in tth_pairs:
+        tth_courses.extend([lec, lab])
+    tth_courses.extend(tth_standalone)
+    tth_courses.sort(key=lambda x: x.start_minute)
+    
+    # Final combined list
+    return mwf_courses + tth_courses
+
+
+############################################
+#          BATCH GENERATION (NO UI)        #
+############################################
+
+# Programs and their available years, in workbook order
+PROGRAM_YEARS = {
+    "BSIT(WebTech)": ["First", "Second", "Third"],
+    "BSIT(Netsec)": ["First", "Second", "Third"],
+    "BSIT(ERP)": ["First", "Second", "Third"],
+    "BSCS": ["First", "Second", "Third"],
+    "BSDA": ["First", "Second", "Third"],
+    "BMMA": ["First", "Second", "Third"]
+}
+
+YEAR_NUMBERS = {
+    "First": "1",
+    "Second": "2",
+    "Third": "3"
+}
+
+GROUPS = ['A', 'B']
+
+# How the groups divide campus resources; see group_occupancy
+GROUP_MODES = ["shared", "rooms", "halves"]
+
+
+class SectionSchedule:
+    """
+    The placed courses of one section in one group, plus the labels the
+    exporters need to write its header row.
+    """
+    def __init__(self, group: str, program: str, year: str, trimester: str,
+                 section_index: int, courses: List[Course]):
+        self.group = group
+        self.program = program
+        self.year = year
+        self.trimester = trimester
+        self.section_index = section_index
+        self.courses = courses
+        self.section_name = f"{YEAR_NUMBERS.get(year, '?')}{chr(65 + section_index)}"
+
+    @property
+    def title(self) -> str:
+        return (f"{self.program}, {self.year} Year, {self.trimester} "
+                f"Trimester Section {self.section_name}")
+
+    @property
+    def mwf_courses(self) -> List[Course]:
+        return [c for c in self.courses if TIME_GRID.side(c.days) is True]
+
+    @property
+    def tth_courses(self) -> List[Course]:
+        return [c for c in self.courses if TIME_GRID.side(c.days) is False]
+
+
+def section_tasks(section_counts: Dict[str, Dict[str, int]],
+                  groups: Sequence[str] = GROUPS) -> List[Tuple[str, str, str, int]]:
+    """
+    (group, program, year, section index) for every configured section,
+    in workbook order.
+    """
+    return [
+        (group_name, program, year, section_num)
+        for group_name in groups
+        for program, year_dict in section_counts.items()
+        for year, num_sections in year_dict.items()
+        for section_num in range(int(num_sections))
+    ]
+
+
+def derive_seed(seed: int, *parts) -> int:
+    """
+    Stable 32-bit seed for one unit of work, derived from the run seed and
+    the parts identifying it. Independent of process and hash randomization.
+    """
+    key = "|".join(str(p) for p in (seed,) + parts)
+    return random.Random(key).getrandbits(32)
+
+
+def new_seed() -> int:
+    return random.SystemRandom().getrandbits(32)
+
+
+def section_rng(seed: int, program: str, year: str, section_num: int, group_name: str) -> random.Random:
+    """
+    The Random a section is generated with. Depends only on the run seed and
+    the section's identity, so serial, parallel and partial runs agree.
+    """
+    return random.Random(derive_seed(seed, program, year, section_num, group_name))
+
+
+############################################
+#          GROUP RESOURCE SPLITS           #
+############################################
+
+def slot_blocks(num_groups: int, num_slots: int = None) -> List[range]:
+    """
+    Contiguous slot ranges, one per group: for two groups the morning
+    (7:30am-11:30am starts) and the afternoon (12:50pm-6:10pm starts).
+    """
+    if num_slots is None:
+        num_slots = len(BASE_TIMES)
+    bounds = [i * num_slots // num_groups for i in range(num_groups + 1)]
+    return [range(bounds[i], bounds[i + 1]) for i in range(num_groups)]
+
+
+def partition_rooms(rooms: Set[str], num_groups: int) -> Tuple[List[Set[str]], Set[str]]:
+    """
+    Deal rooms out to groups so every group gets a share of every room
+    class. Scarcest classes are dealt first, each room going to the group
+    that holds the fewest rooms of that class so far. Classes with fewer
+    rooms than groups cannot be dealt out and are returned as shared.
+    """
+    owned: List[Set[str]] = [set() for _ in range(num_groups)]
+    owner: Dict[str, int] = {}
+    shared: Set[str] = set()
+    pools = room_pools(frozenset(rooms))
+    for room_class, pool in sorted(pools.items(), key=lambda item: len(item[1])):
+        pool = [r for r in pool if r not in RESTRICTED_ROOMS]
+        if len(pool) < num_groups:
+            shared.update(r for r in pool if r not in owner)
+            continue
+        for room in pool:
+            if room in owner or room in shared:
+                continue
+            group = min(range(num_groups),
+                        key=lambda g: (sum(1 for r in pool if owner.get(r) == g), g))
+            owner[room] = group
+            owned[group].add(room)
+    # Rooms no class claims still need an owner
+    for i, room in enumerate(sorted(rooms - set(owner) - shared - RESTRICTED_ROOMS)):
+        owned[i % num_groups].add(room)
+    return owned, shared
+
+
+def group_occupancy(rooms: Set[str], group_index: int, num_groups: int,
+                    mode: str = "rooms") -> RoomOccupancy:
+    """
+    Occupancy model for one group with everything outside its share
+    booked out up front, so the engines' normal free-room checks keep the
+    group inside it and groups can be generated independently.
+
+    "rooms" gives each group its own rooms (partition_rooms); rooms that
+    must be shared are split by slot_blocks instead, and the shared venues
+    (Gym, Aud) stay open to both groups all day, as in "shared". "halves"
+    gives each group every room, venues included, but only in its slot
+    block, so NSTP and PathFit follow the group's half of the day too.
+    """
+    occupancy = RoomOccupancy(rooms)
+    blocks = slot_blocks(num_groups, occupancy.num_slots)
+    own_slots = blocks[group_index]
+    if mode == "rooms":
+        owned, shared = partition_rooms(rooms, num_groups)
+        for room in sorted(rooms):
+            for slot_index in range(occupancy.num_slots):
+                if room in owned[group_index] or (room in shared and slot_index in own_slots):
+                    continue
+                occupancy.reserve(room, True, slot_index)
+                occupancy.reserve(room, False, slot_index)
+    elif mode == "halves":
+        for room in sorted(rooms | RESTRICTED_ROOMS):
+            for slot_index in range(occupancy.num_slots):
+                if slot_index not in own_slots:
+                    occupancy.close(room, True, slot_index)
+                    occupancy.close(room, False, slot_index)
+    else:
+        raise ValueError(f"Unknown group mode {mode!r}; expected 'rooms' or 'halves'")
+    return occupancy
+
+
+def _place_sections(catalog: CourseCatalog, tasks: List[Tuple[str, str, str, int]],
+                    trimester: str, seed: int, engine: Callable,
+                    occupancies: Dict[str, Optional[RoomOccupancy]],
+                    cache=None) -> Iterator[SectionSchedule]:
+    """
+    Place tasks in order, each group booking into occupancies[group]
+    (None for independent sections).
+    """
+    run_key = cache.run_key(catalog, trimester, seed, engine) if cache is not None else None
+    
+    for group_name, program, year, section_num in tasks:
+        occupancy = occupancies[group_name]
+        courses = None
+        if cache is not None:
+            key = cache.section_key(run_key, group_name, program, year, section_num, occupancy)
+            courses = cache.get(key)
+            if courses is not None and occupancy is not None:
+                occupancy.reserve_courses(courses)
+        if courses is None:
+            started = time.perf_counter()
+            requested = catalog.get_courses(program, year, trimester)
+            placing = time.perf_counter()
+            courses = engine(
+                requested, year, trimester, occupancy,
+                section_rng(seed, program, year, section_num, group_name)
+            )
+            finished = time.perf_counter()
+            add_time("filter", placing - started)
+            add_time("placement", finished - placing)
+            if cache is not None:
+                cache.put(key, courses)
+        yield SectionSchedule(group_name, program, year, trimester, section_num, courses)
+
+
+def iter_sections(catalog: CourseCatalog, section_counts: Dict[str, Dict[str, int]],
+                  trimester: str, workers: int = 1, seed: int = None,
+                  engine: Callable = None, share_rooms: bool = True,
+                  cache=None, group_mode: str = "shared") -> Iterator[SectionSchedule]:
+    """
+    Generate every configured section for both groups, one at a time.
+
+    section_counts maps program -> year -> number of sections, e.g.
+    {"BSCS": {"First": 3, "Second": 2}}. Sections are yielded grouped by
+    group, then in section_counts order, which is the workbook order, so
+    exporters can stream them straight to disk.
+
+    engine places one section's courses and defaults to
+    balance_and_shuffle_courses; anything with the same signature works
+    (e.g. solver.solve_section_courses).
+
+    Each section draws from section_rng(seed, ...), so the same seed gives
+    the same schedule. Pass seed=None for a fresh one (see new_seed to pick
+    it up front and record it). share_rooms books every placement in one
+    campus-wide occupancy model; without it sections are independent.
+
+    With workers > 1 sections are generated in a process pool instead (see
+    iter_sections_parallel), which never shares room occupancy and matches
+    a serial run with share_rooms=False.
+
+    cache (a schedule_cache.ScheduleCache) reuses sections placed by an
+    earlier run with the same inputs instead of placing them again.
+
+    group_mode decides how the groups split campus resources when rooms
+    are shared: "shared" books both groups into one occupancy model, while
+    "rooms" and "halves" give each group its own share (see group_occupancy).
+    The split modes make groups independent, so with workers > 1 each group
+    runs in its own process with full room booking (iter_groups_parallel).
+    """
+    if engine is None:
+        engine = balance_and_shuffle_courses
+    if seed is None:
+        seed = new_seed()
+    if group_mode not in GROUP_MODES:
+        raise ValueError(f"Unknown group mode {group_mode!r}; expected one of {GROUP_MODES}")
+    split_groups = share_rooms and group_mode != "shared"
+    if workers > 1 and split_groups:
+        sections = iter_groups_parallel(catalog, section_counts, trimester, workers, seed, engine,
+                                        cache, group_mode)
+    elif workers > 1:
+        sections = iter_sections_parallel(catalog, section_counts, trimester, workers, seed, engine,
+                                          cache)
+    else:
+        if split_groups:
+            occupancies = {
+                group_name: group_occupancy(catalog.rooms, i, len(GROUPS), group_mode)
+                for i, group_name in enumerate(GROUPS)
+            }
+        else:
+            # One occupancy model for the whole run so no two sections share a room slot
+            occupancy = RoomOccupancy(catalog.rooms) if share_rooms else None
+            occupancies = {group_name: occupancy for group_name in GROUPS}
+        sections = _place_sections(catalog, section_tasks(section_counts), trimester, seed, engine,
+                                   occupancies, cache)
+
+    stats = active_stats()
+    if stats is None:
+        yield from sections
+        return
+    for section in sections:
+        requested = catalog.get_courses(section.program, section.year, trimester)
+        stats.record_section(len(requested), section.courses)
+        yield section
+
+
+############################################
+#          PARALLEL GENERATION             #
+############################################
+
+# Catalog handed to each pool worker once by its initializer
+_worker_catalog: CourseCatalog = None
+
+
+def init_worker(catalog: CourseCatalog, grid_config: Dict[str, object] = None):
+    """
+    Pool initializer: keep catalog for the worker's tasks and switch to
+    the parent's time grid.
+    """
+    global _worker_catalog
+    _worker_catalog = catalog
+    # Spawned workers start from the default grid
+    if grid_config is not None:
+        set_time_grid(TimeGrid.from_config(grid_config))
+
+
+def worker_catalog() -> CourseCatalog:
+    """
+    The catalog init_worker gave this pool worker.
+    """
+    return _worker_catalog
+
+
+def _generate_section_task(task: Tuple[str, str, str, str, int, int, Callable]) -> SectionSchedule:
+    group_name, program, year, trimester, section_num, seed, engine = task
+    courses = engine(
+        _worker_catalog.get_courses(program, year, trimester), year, trimester, None,
+        section_rng(seed, program, year, section_num, group_name)
+    )
+    return SectionSchedule(group_name, program, year, trimester, section_num, courses)
+
+
+def iter_sections_parallel(catalog: CourseCatalog, section_counts: Dict[str, Dict[str, int]],
+                           trimester: str, workers: int = None, seed: int = None,
+                           engine: Callable = None, cache=None) -> Iterator[SectionSchedule]:
+    """
+    Fan sections out across a ProcessPoolExecutor and yield them back in
+    workbook order.
+
+    Every section is seeded through section_rng, so the same seed gives the
+    same workbook whatever the worker count. Rooms are chosen per section
+    only: the campus-wide occupancy model cannot be shared across processes,
+    so room collisions between sections are possible in this mode.
+    Sections found in cache are yielded from it; only the rest reach the pool.
+    """
+    if seed is None:
+        seed = new_seed()
+    if engine is None:
+        engine = balance_and_shuffle_courses
+    tasks = [
+        (group_name, program, year, trimester, section_num, seed, engine)
+        for group_name, program, year, section_num in section_tasks(section_counts)
+    ]
+    cached: Dict[int, SectionSchedule] = {}
+    keys = {}
+    if cache is not None:
+        run_key = cache.run_key(catalog, trimester, seed, engine)
+        for i, (group_name, program, year, _, section_num, _, _) in enumerate(tasks):
+            keys[i] = cache.section_key(run_key, group_name, program, year, section_num)
+            courses = cache.get(keys[i])
+            if courses is not None:
+                cached[i] = SectionSchedule(group_name, program, year, trimester, section_num, courses)
+    pending = [task for i, task in enumerate(tasks) if i not in cached]
+    if not pending:
+        for i in range(len(tasks)):
+            yield cached[i]
+        return
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(pending) // (workers * 4))
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(catalog, TIME_GRID.to_config())) as executor:
+        results = executor.map(_generate_section_task, pending, chunksize=chunksize)
+        for i in range(len(tasks)):
+            if i in cached:
+                yield cached[i]
+                continue
+            section = next(results)
+            if cache is not None:
+                cache.put(keys[i], section.courses)
+            yield section
+
+
+def _generate_group_task(task: Tuple) -> List[SectionSchedule]:
+    group_name, group_index, tasks, trimester, seed, engine, group_mode, cache = task
+    occupancy = group_occupancy(_worker_catalog.rooms, group_index, len(GROUPS), group_mode)
+    return list(_place_sections(_worker_catalog, tasks, trimester, seed, engine,
+                                {group_name: occupancy}, cache))
+
+
+def iter_groups_parallel(catalog: CourseCatalog, section_counts: Dict[str, Dict[str, int]],
+                         trimester: str, workers: int = None, seed: int = None,
+                         engine: Callable = None, cache=None,
+                         group_mode: str = "rooms") -> Iterator[SectionSchedule]:
+    """
+    Generate each group in its own process with that group's share of the
+    campus (group_occupancy), so rooms are fully booked within a group and
+    cannot collide across groups. Yields in workbook order and matches a
+    serial run with the same group_mode.
+
+    Workers get a copy of cache: they reuse its entries and write new ones
+    to its directory, if it has one, but memory-only additions stay behind.
+    """
+    if seed is None:
+        seed = new_seed()
+    if engine is None:
+        engine = balance_and_shuffle_courses
+    jobs = [
+        (group_name, i, section_tasks(section_counts, [group_name]), trimester, seed, engine,
+         group_mode, cache)
+        for i, group_name in enumerate(GROUPS)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(catalog, TIME_GRID.to_config())) as executor:
+        futures = [executor.submit(_generate_group_task, job) for job in jobs]
+        for future in futures:
+            yield from future.result()
+
+
+def generate_schedule(catalog: CourseCatalog, section_counts: Dict[str, Dict[str, int]],
+                      trimester: str, workers: int = 1, seed: int = None,
+                      engine: Callable = None, share_rooms: bool = True,
+                      cache=None, group_mode: str = "shared") -> List[SectionSchedule]:
+    return list(iter_sections(catalog, section_counts, trimester, workers, seed, engine, share_rooms,
+                              cache, group_mode))
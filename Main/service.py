@@ -0,0 +1,501 @@
+"""
+Local HTTP scheduling service, so other tools can generate schedules
+without the GUI.
+
+    python service.py --csv Data.csv --port 8765 --workers 2
+
+Endpoints (JSON bodies and replies unless noted):
+
+    GET  /health     served catalog, jobs running, requests coalesced
+    POST /catalog    catalog CSV as the body; validated, then served
+    POST /generate   {"trimester": "First", "sections": {"BSCS": {"First": 3}},
+                      "seed": 7, "engine": "greedy", "group_mode": "shared"}
+                     -> {"seed": 7, "sections": 3, "courses": [...]}
+    POST /export     same body -> the .xlsx workbook, sent in chunks
+    POST /validate   .xlsx workbook as the body -> {"issues": [...], "counts": {...}}
+
+Every generate/export field is optional; sections defaults to the GUI's
+three per program and year, and takes catalog programs only, with 0 to
+MAX_SECTIONS sections per year. Courses come back as the flat records
+of the .jsonl export, with the courses that could not be placed listed
+under "unplaced".
+
+Built on asyncio streams alone. The parsed catalog stays in memory: the
+service holds it and every pool worker gets it once, through
+scheduler.init_worker, so a request only ships its parameters.
+Generation, export and validation run in a ProcessPoolExecutor, never on
+the event loop. Its workers are spawned, not forked, so they do not
+inherit the server's open sockets; a forked worker would hold every
+client connection open and the client would never see the reply end.
+Identical requests that arrive while one is still running share its
+result instead of starting another job; requests without a seed share
+the seed picked for the first one, which every reply reports.
+
+An export is written whole to a temporary file by the worker (a .xlsx
+is a zip archive and is only complete once saved) and then read and
+sent to the client in CHUNK_SIZE pieces, so the workbook never passes
+through the event loop's memory in one piece.
+"""
+import argparse
+import asyncio
+import functools
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from typing import AsyncIterator, Callable, Dict, Set, Tuple
+
+from cli import ENGINES, default_section_counts, section_counts_from_config
+from export import RECORD_FIELDS, course_records, export_workbook, run_metadata
+from ingest import load_catalog_cached, read_catalog_csv, validate_catalog
+from schedule_cache import catalog_fingerprint
+from scheduler import (
+    GROUP_MODES, YEAR_NUMBERS, CourseCatalog, init_worker, iter_sections, load_time_grid,
+    new_seed, set_time_grid, time_grid, worker_catalog
+)
+from solver import DEFAULT_TIME_BUDGET, solve_section_courses
+from validate import UnplacedCourses, validate_workbook
+from workbook import read_metadata, recorded_time_grid
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+TRIMESTERS = ["First", "Second", "Third"]
+
+# Largest request body accepted (catalog CSVs and workbooks)
+MAX_BODY = 32 * 1024 * 1024
+# Bytes per chunk when sending a workbook back
+CHUNK_SIZE = 64 * 1024
+# Sections per program and year; section names run from A to Z
+MAX_SECTIONS = 26
+# Longest solver search per section a request may ask for, in seconds
+MAX_TIME_BUDGET = 10.0
+
+JSON_TYPE = "application/json"
+XLSX_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+############################################
+#               POOL WORKERS               #
+############################################
+
+def _sections(params: Dict[str, object], unplaced: UnplacedCourses):
+    engine = ENGINES[params["engine"]]
+    if engine is solve_section_courses:
+        engine = functools.partial(solve_section_courses, time_budget=params["time_budget"])
+    return unplaced.track(iter_sections(worker_catalog(), params["sections"], params["trimester"],
+                                        seed=params["seed"], engine=engine,
+                                        group_mode=params["group_mode"]))
+
+
+def _generate_job(params: Dict[str, object]) -> Dict[str, object]:
+    unplaced = UnplacedCourses(worker_catalog())
+    sections = 0
+    courses = []
+    for section in _sections(params, unplaced):
+        sections += 1
+        courses.extend(dict(zip(RECORD_FIELDS, record)) for record in course_records(section))
+    return {"seed": params["seed"], "sections": sections, "courses": courses,
+            "unplaced": {"count": unplaced.count, "requested": unplaced.requested,
+                         "courses": unplaced.by_section}}
+
+
+def _export_job(params: Dict[str, object]) -> str:
+    """
+    Write the workbook to a temporary file and return its path; the
+    service deletes it once every client waiting for it has it.
+    """
+    unplaced = UnplacedCourses(worker_catalog())
+    metadata = run_metadata(params["seed"], params["trimester"], params["engine"],
+                            params["group_mode"])
+
+    def sections():
+        yield from _sections(params, unplaced)
+        # Before the exporter writes Run Info
+        unplaced.record(metadata)
+
+    fd, path = tempfile.mkstemp(prefix="schedule-", suffix=".xlsx")
+    os.close(fd)
+    try:
+        export_workbook(sections(), path, metadata)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _validate_job(workbook: bytes) -> Dict[str, object]:
+    # Check against the grid the workbook was made with, as cli.py validate does
+    grid = recorded_time_grid(read_metadata(io.BytesIO(workbook)))
+    served = time_grid()
+    if grid is not None:
+        set_time_grid(grid)
+    try:
+        issues = validate_workbook(io.BytesIO(workbook))
+    finally:
+        set_time_grid(served)
+    counts: Dict[str, int] = {}
+    for issue in issues:
+        counts[issue.kind] = counts.get(issue.kind, 0) + 1
+    return {"issues": [issue._asdict() for issue in issues], "counts": counts}
+
+
+############################################
+#                 SERVICE                  #
+############################################
+
+def _whole_number(value) -> bool:
+    # JSON true/false arrive as bool, which is an int subclass
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def section_counts(sections: object, programs: Set[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Checked program -> year -> count mapping from a request. Raises
+    HTTPError(400) for anything that is not a catalog program, a year
+    name, or a count from 0 to MAX_SECTIONS.
+    """
+    if not isinstance(sections, dict) or not all(isinstance(years, dict)
+                                                 for years in sections.values()):
+        raise HTTPError(400, 'sections must look like {"BSCS": {"First": 3}}')
+    for program, years in sections.items():
+        if program not in programs:
+            raise HTTPError(400, f"Unknown program {program!r}; the catalog has "
+                                 f"{', '.join(sorted(programs))}")
+        for year, count in years.items():
+            if year not in YEAR_NUMBERS:
+                raise HTTPError(400, f"Unknown year {year!r}; expected one of {list(YEAR_NUMBERS)}")
+            if not _whole_number(count) or not 0 <= count <= MAX_SECTIONS:
+                raise HTTPError(400, f"sections[{program!r}][{year!r}] must be a whole number "
+                                     f"from 0 to {MAX_SECTIONS}")
+    return section_counts_from_config(sections)
+
+
+def generation_params(body: bytes, programs: Set[str]) -> Dict[str, object]:
+    """
+    Checked generate/export parameters with defaults filled in; seed stays
+    None when not given. programs are the catalog's. Raises HTTPError(400)
+    for anything invalid.
+    """
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError as e:
+        raise HTTPError(400, f"Body is not JSON: {e}") from None
+    if not isinstance(request, dict):
+        raise HTTPError(400, "Body must be a JSON object")
+    unknown = set(request) - {"trimester", "sections", "seed", "engine", "group_mode",
+                              "time_budget"}
+    if unknown:
+        raise HTTPError(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    params = {
+        "trimester": request.get("trimester", "First"),
+        "seed": request.get("seed"),
+        "engine": request.get("engine", "greedy"),
+        "group_mode": request.get("group_mode", "shared"),
+        "time_budget": request.get("time_budget", DEFAULT_TIME_BUDGET),
+    }
+    if params["trimester"] not in TRIMESTERS:
+        raise HTTPError(400, f"trimester must be one of {TRIMESTERS}")
+    if params["engine"] not in ENGINES:
+        raise HTTPError(400, f"engine must be one of {sorted(ENGINES)}")
+    if params["group_mode"] not in GROUP_MODES:
+        raise HTTPError(400, f"group_mode must be one of {GROUP_MODES}")
+    if params["seed"] is not None and (not _whole_number(params["seed"]) or params["seed"] < 0):
+        raise HTTPError(400, "seed must be a whole number")
+    budget = params["time_budget"]
+    if (isinstance(budget, bool) or not isinstance(budget, (int, float))
+            or not 0 < budget <= MAX_TIME_BUDGET):
+        raise HTTPError(400, f"time_budget must be a number of seconds from 0 to {MAX_TIME_BUDGET:g}")
+    sections = request.get("sections")
+    params["sections"] = (section_counts(sections, programs) if sections is not None
+                          else default_section_counts())
+    return params
+
+
+class SchedulingService:
+    """
+    The served catalog, the worker pool and the jobs in flight, keyed by
+    what they compute so identical requests can share one.
+    """
+    def __init__(self, catalog: CourseCatalog, workers: int = 1):
+        self.workers = max(1, workers)
+        self.catalog = catalog
+        self.fingerprint = catalog_fingerprint(catalog)
+        self.programs = self._programs()
+        self.pool = self._new_pool()
+        self.inflight: Dict[Tuple, asyncio.Future] = {}
+        # Clients still sending each export job's file
+        self.readers: Dict[asyncio.Future, int] = {}
+        self.coalesced = 0
+
+    def _programs(self) -> Set[str]:
+        return {program for program, _, _ in self.catalog.index}
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Spawned, so workers do not inherit the listening and client sockets
+        return ProcessPoolExecutor(max_workers=self.workers,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=init_worker,
+                                   initargs=(self.catalog, time_grid().to_config()))
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    def set_catalog(self, catalog: CourseCatalog):
+        """
+        Serve catalog from now on. Jobs already running finish on the old
+        one; their keys hold the old fingerprint, so nothing mixes.
+        """
+        old = self.pool
+        self.catalog = catalog
+        self.fingerprint = catalog_fingerprint(catalog)
+        self.programs = self._programs()
+        self.pool = self._new_pool()
+        old.shutdown(wait=False)
+
+    def share(self, key: Tuple, job: Callable, make_arg: Callable[[], object]) -> asyncio.Future:
+        """
+        Future of job(make_arg()) in the pool, or of the identical job
+        already running under key.
+        """
+        future = self.inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self.pool, job, make_arg())
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return future
+
+    async def run(self, key: Tuple, job: Callable, make_arg: Callable[[], object]):
+        # A client hanging up must not cancel the job others are waiting for
+        return await asyncio.shield(self.share(key, job, make_arg))
+
+    def generation_key(self, kind: str, params: Dict[str, object]) -> Tuple:
+        return (kind, self.fingerprint, json.dumps(params, sort_keys=True))
+
+    def with_seed(self, params: Dict[str, object]) -> Callable[[], Dict[str, object]]:
+        return lambda: dict(params, seed=params["seed"] if params["seed"] is not None else new_seed())
+
+    async def generate(self, body: bytes) -> Dict[str, object]:
+        params = generation_params(body, self.programs)
+        return await self.run(self.generation_key("generate", params), _generate_job,
+                              self.with_seed(params))
+
+    @asynccontextmanager
+    async def export(self, body: bytes) -> AsyncIterator[str]:
+        """
+        Path of the exported workbook, valid inside the with block. The
+        file is deleted when the last client sharing it is done.
+        """
+        params = generation_params(body, self.programs)
+        future = self.share(self.generation_key("export", params), _export_job,
+                            self.with_seed(params))
+        self.readers[future] = self.readers.get(future, 0) + 1
+        try:
+            yield await asyncio.shield(future)
+        finally:
+            self.readers[future] -= 1
+            if not self.readers[future]:
+                del self.readers[future]
+                if future.done():
+                    self._discard(future)
+                else:
+                    future.add_done_callback(self._discard)
+
+    def _discard(self, future: asyncio.Future):
+        # Everyone hung up, or is done; unless a new client joined meanwhile
+        if future in self.readers or future.cancelled() or future.exception() is not None:
+            return
+        try:
+            os.remove(future.result())
+        except OSError:
+            pass
+
+    async def validate(self, body: bytes) -> Dict[str, object]:
+        if not body:
+            raise HTTPError(400, "Send the .xlsx workbook as the request body")
+        key = ("validate", hashlib.sha256(body).hexdigest())
+        return await self.run(key, _validate_job, lambda: body)
+
+    async def load_catalog(self, body: bytes) -> Dict[str, object]:
+        def parse():
+            return CourseCatalog.from_dataframe(validate_catalog(read_catalog_csv(io.BytesIO(body))))
+        catalog = await asyncio.get_running_loop().run_in_executor(None, parse)
+        self.set_catalog(catalog)
+        return self.health()
+
+    def health(self) -> Dict[str, object]:
+        return {
+            "status": "ok",
+            "catalog": self.fingerprint,
+            "programs": len(self.programs),
+            "jobs": len(self.inflight),
+            "coalesced": self.coalesced,
+        }
+
+
+############################################
+#                   HTTP                   #
+############################################
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request headers too large") from None
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line") from None
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Bad Content-Length") from None
+    if length > MAX_BODY:
+        raise HTTPError(413, f"Body over {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+def _head(status: int, content_type: str, extra: Dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+             f"Content-Type: {content_type}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in extra.items()]
+    return ("\r\n".join(lines) + "\r\n").encode("latin-1")
+
+
+async def send(writer: asyncio.StreamWriter, status: int, content_type: str, body: bytes,
+               extra: Dict[str, str] = None):
+    writer.write(_head(status, content_type, extra or {})
+                 + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+
+
+async def send_json(writer: asyncio.StreamWriter, status: int, payload: object):
+    await send(writer, status, JSON_TYPE, json.dumps(payload, default=str).encode())
+
+
+async def stream_file(writer: asyncio.StreamWriter, status: int, content_type: str, path: str,
+                      extra: Dict[str, str] = None):
+    """
+    Send a file with chunked transfer encoding, CHUNK_SIZE bytes at a
+    time, waiting for the client to keep up after every chunk.
+    """
+    writer.write(_head(status, content_type, extra or {}) + b"Transfer-Encoding: chunked\r\n\r\n")
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+            await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+ROUTES = {
+    ("GET", "/health"), ("POST", "/catalog"), ("POST", "/generate"),
+    ("POST", "/export"), ("POST", "/validate"),
+}
+
+
+async def handle(service: SchedulingService, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+    try:
+        try:
+            method, path, _, body = await read_request(reader)
+            if (method, path) not in ROUTES:
+                known = any(path == route for _, route in ROUTES)
+                raise HTTPError(405 if known else 404, f"No {method} {path}")
+            if path == "/health":
+                await send_json(writer, 200, service.health())
+            elif path == "/catalog":
+                await send_json(writer, 200, await service.load_catalog(body))
+            elif path == "/generate":
+                await send_json(writer, 200, await service.generate(body))
+            elif path == "/export":
+                async with service.export(body) as workbook:
+                    await stream_file(writer, 200, XLSX_TYPE, workbook,
+                                      {"Content-Disposition": 'attachment; filename="schedule.xlsx"'})
+            elif path == "/validate":
+                await send_json(writer, 200, await service.validate(body))
+        except HTTPError as e:
+            await send_json(writer, e.status, {"error": e.message})
+        except ValueError as e:
+            # Bad catalogs and workbooks (CatalogValidationError, WorkbookFormatError, ...)
+            await send_json(writer, 400, {"error": str(e)})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            await send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(service: SchedulingService, host: str = DEFAULT_HOST,
+                       port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+    """
+    Start serving; port 0 picks a free port (see server.sockets).
+    """
+    return await asyncio.start_server(functools.partial(handle, service), host, port)
+
+
+async def serve(service: SchedulingService, host: str, port: int):
+    server = await start_server(service, host, port)
+    bound = server.sockets[0].getsockname()
+    print(f"Serving on http://{bound[0]}:{bound[1]}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve schedule generation over local HTTP.")
+    parser.add_argument("--csv", required=True, help="course catalog CSV to serve")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=1, help="generation processes")
+    parser.add_argument("--time-grid", help="JSON file of slot times, meeting lengths and day patterns")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.time_grid:
+            set_time_grid(load_time_grid(args.time_grid))
+        catalog = load_catalog_cached(args.csv)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    service = SchedulingService(catalog, args.workers)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Constraint-solver engine for placing one section's courses.
+
+A drop-in alternative to balance_and_shuffle_courses: same arguments, same
+result shape. Instead of placing greedily and skipping whatever does not
+fit, each lec+lab pair and each standalone course becomes a variable whose
+domain is every (day side, start slot) it could take, and the section is
+solved by backtracking with forward checking and most-constrained-first
+ordering. A course is only left out when no complete placement exists (or
+the time budget runs out), and then the fewest possible courses are dropped.
+"""
+import random
+import time
+from typing import List, Dict, Tuple, Set, Optional, Sequence
+
+from scheduler import (
+    BASE_SLOTS, BASE_TIMES, Course, RoomOccupancy, get_available_rooms, room_pools,
+    time_grid
+)
+from instrument import count_skip
+
+# Seconds of search allowed per section before settling for the best found
+DEFAULT_TIME_BUDGET = 0.2
+
+# (is_mwf, start slot index)
+Value = Tuple[bool, int]
+
+
+class Placement:
+    """
+    One unit to schedule: a lec+lab pair (two consecutive slots, lecture
+    first) or a single course. patterns holds the day pattern of each
+    meeting for the MWF side (True) and the TTH side (False).
+    """
+    def __init__(self, courses: List[Course], patterns: Dict[bool, List[str]]):
+        self.courses = courses
+        self.patterns = patterns
+        self.rooms: List[Sequence[str]] = []
+        self.domain: List[Value] = []
+        self.cells: Dict[Value, Set[Tuple[bool, int]]] = {}
+
+    def build_domain(self, all_rooms: Set[str], year_level: str, trimester: str,
+                     occupancy: RoomOccupancy = None):
+        pools = room_pools(frozenset(all_rooms))
+        self.rooms = [get_available_rooms(c, all_rooms, year_level, trimester, pools=pools)
+                      for c in self.courses]
+        span = len(self.courses)
+        for is_mwf in (True, False):
+            for start in range(len(BASE_TIMES) - span + 1):
+                if all(self.free_rooms(k, is_mwf, start + k, occupancy) for k in range(span)):
+                    value = (is_mwf, start)
+                    self.domain.append(value)
+                    self.cells[value] = {(is_mwf, start + k) for k in range(span)}
+
+    def free_rooms(self, k: int, is_mwf: bool, slot_index: int,
+                   occupancy: RoomOccupancy = None) -> Sequence[str]:
+        if occupancy is None:
+            return self.rooms[k]
+        return occupancy.free_rooms(self.rooms[k], is_mwf, slot_index)
+
+
+def build_placements(courses: List[Course]) -> List[Placement]:
+    """
+    Group cloned courses into placements. Pairs without a partner are
+    placed on their own with the pattern they would have had in a pair.
+    """
+    grid = time_grid()
+    paired_courses = {}
+    placements = []
+    for course in courses:
+        if course.is_lab or course.is_lec:
+            paired_courses.setdefault(course.pair_key, []).append(course.clone())
+        else:
+            if 'PathFit' in course.code or 'PATHFit' in course.code:
+                patterns = {side: [grid.pathfit[side]] for side in (True, False)}
+            else:
+                patterns = {side: [grid.standalone[side]] for side in (True, False)}
+            placements.append(Placement([course.clone()], patterns))
+
+    lec_side = grid.lecture
+    lab_side = grid.lab
+    for pair in paired_courses.values():
+        lecs = [c for c in pair if c.is_lec]
+        labs = [c for c in pair if c.is_lab]
+        while lecs and labs:
+            placements.append(Placement(
+                [lecs.pop(0), labs.pop(0)],
+                {side: [lec_side[side], lab_side[side]] for side in (True, False)}
+            ))
+        for c in lecs:
+            placements.append(Placement([c], {side: [lec_side[side]] for side in (True, False)}))
+        for c in labs:
+            placements.append(Placement([c], {side: [lab_side[side]] for side in (True, False)}))
+    return placements
+
+
+class _Search:
+    """
+    Branch-and-bound backtracking over placements. Every variable may also
+    be dropped (tried last), so the search always ends with the assignment
+    that drops the fewest courses it has seen, and stops early once it
+    finds one that drops none. The deadline only counts once the first
+    descent has reached a complete assignment, so even a tiny budget
+    places what that greedy descent can.
+    """
+    def __init__(self, placements: List[Placement], deadline: float, rng: random.Random):
+        self.placements = placements
+        self.rng = rng
+        self.deadline = deadline
+        self.best: Dict[int, Optional[Value]] = {}
+        self.best_drops = float('inf')
+        self.timed_out = False
+
+    def run(self):
+        domains = {i: list(p.domain) for i, p in enumerate(self.placements)}
+        self.search(list(domains), domains, {}, 0, {True: 0, False: 0})
+
+    def search(self, unassigned: List[int], domains: Dict[int, List[Value]],
+               assignment: Dict[int, Optional[Value]], drops: int,
+               side_counts: Dict[bool, int]) -> bool:
+        """
+        Returns True when the search should stop (perfect or out of time).
+        """
+        # Lower bound: every variable whose domain is already empty must drop
+        forced = sum(len(self.placements[v].courses) for v in unassigned if not domains[v])
+        if drops + forced >= self.best_drops:
+            return False
+        if not unassigned:
+            self.best = dict(assignment)
+            self.best_drops = drops
+            return drops == 0
+        if self.best_drops != float('inf') and time.perf_counter() > self.deadline:
+            self.timed_out = True
+            return True
+
+        # Most constrained first; bigger placements break ties
+        var = min(unassigned, key=lambda v: (len(domains[v]), -len(self.placements[v].courses)))
+        rest = [v for v in unassigned if v != var]
+        placement = self.placements[var]
+
+        for value in self.order_values(domains[var], side_counts, self.rng):
+            cells = placement.cells[value]
+            # Forward check: strip values that now collide with this one
+            new_domains = {
+                v: [x for x in domains[v] if not (self.placements[v].cells[x] & cells)]
+                for v in rest
+            }
+            assignment[var] = value
+            side_counts[value[0]] += len(placement.courses)
+            stop = self.search(rest, new_domains, assignment, drops, side_counts)
+            side_counts[value[0]] -= len(placement.courses)
+            del assignment[var]
+            if stop:
+                return True
+
+        assignment[var] = None
+        stop = self.search(rest, {v: domains[v] for v in rest}, assignment,
+                           drops + len(placement.courses), side_counts)
+        del assignment[var]
+        return stop
+
+    @staticmethod
+    def order_values(domain: List[Value], side_counts: Dict[bool, int],
+                     rng: random.Random) -> List[Value]:
+        """
+        Random order, then the less used day side first to keep MWF/TTH balanced.
+        """
+        values = list(domain)
+        rng.shuffle(values)
+        values.sort(key=lambda v: side_counts[v[0]])
+        return values
+
+
+def solve_section_courses(courses: List[Course], year_level: str, trimester: str,
+                          occupancy: RoomOccupancy = None, rng: random.Random = None,
+                          time_budget: float = DEFAULT_TIME_BUDGET) -> List[Course]:
+    """
+    Place one section's courses by constraint search. Same contract as
+    balance_and_shuffle_courses, but a course is only missing from the
+    result when no schedule places everything within the time budget.
+    Runs that hit the time budget may differ even with the same rng.
+    """
+    if rng is None:
+        rng = random.Random()
+
+    if occupancy is not None:
+        all_rooms = occupancy.rooms
+    else:
+        all_rooms = set(course.room for course in courses)
+
+    placements = build_placements(courses)
+    for placement in placements:
+        placement.build_domain(all_rooms, year_level, trimester, occupancy)
+
+    search = _Search(placements, time.perf_counter() + time_budget, rng)
+    search.run()
+    count_skip("solver_dropped", sum(len(p.courses) for i, p in enumerate(placements)
+                                     if search.best.get(i) is None))
+
+    course_room_history = {}
+    mwf_courses = []
+    tth_courses = []
+
+    for i, placement in enumerate(placements):
+        value = search.best.get(i)
+        if value is None:
+            continue
+        is_mwf, start = value
+        previous_room = None
+        for k, course in enumerate(placement.courses):
+            slot = BASE_SLOTS[start + k]
+            rooms = placement.free_rooms(k, is_mwf, slot.index, occupancy)
+
+            # Keep a lab in its lecture's room, or a course in a room it used before
+            preferred = [r for r in rooms
+                         if r == previous_room or r in course_room_history.get(course.base_code, ())]
+            room = rng.choice(preferred or rooms)
+            course_room_history.setdefault(course.base_code, set()).add(room)
+            if occupancy is not None:
+                occupancy.reserve(room, is_mwf, slot.index)
+            previous_room = room
+
+            course.assign_slot(slot, placement.patterns[is_mwf][k])
+            course.room = room
+            (mwf_courses if is_mwf else tth_courses).append(course)
+
+    mwf_courses.sort(key=lambda x: x.start_minute)
+    tth_courses.sort(key=lambda x: x.start_minute)
+    return mwf_courses + tth_courses
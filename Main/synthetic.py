@@ -0,0 +1,123 @@
+"""
+Synthetic course catalogs for scale and load testing.
+
+    python synthetic.py --out big.csv --programs 40 --courses 12 --seed 7
+
+Writes a CSV in exactly the Data.csv schema (Course_Code, Description,
+Units, Time, Days, Room, Program, Year_Level, Trimester), one row at a
+time, so catalogs of any size stream straight to disk. Every program gets
+every (year, trimester) term. Per course, the generator picks a lec+lab
+pair, an NSTP/PathFit course, a major subject or a general course with
+the configured ratios, all from one seeded Random, so the same arguments
+always produce the same file.
+
+Lab and major courses use the scheduler's own LAB_ROOMS / MAJOR_ROOMS
+(those classes are fixed in scheduler.py); regular_rooms sets how many
+general-purpose rooms (R001, R002, ...) the catalog introduces.
+"""
+import argparse
+import csv
+import random
+import sys
+from typing import Iterator, List
+
+from scheduler import BASE_TIMES, LAB_ROOMS, MAJOR_ROOMS, CourseCatalog
+
+YEARS = ["First", "Second", "Third"]
+TRIMESTERS = ["First", "Second", "Third"]
+
+# Major codes start with CCS, which MAJOR_SUBJECTS claims by prefix
+MAJOR_PREFIX = "CCS"
+GENERAL_PREFIX = "GEN"
+
+
+def synthetic_rows(programs: int = 24, courses_per_term: int = 10, pair_ratio: float = 0.4,
+                   pe_share: float = 0.1, major_share: float = 0.5, regular_rooms: int = 20,
+                   seed: int = 0) -> Iterator[List[object]]:
+    """
+    Yield catalog rows (without the header) in CourseCatalog.COLUMNS order.
+
+    pair_ratio of courses become a lec+lab pair (two rows), pe_share become
+    NSTP or PathFit, and of the rest major_share are major subjects.
+    """
+    rng = random.Random(seed)
+    lab_rooms = sorted(LAB_ROOMS)
+    major_rooms = sorted(MAJOR_ROOMS)
+    general_rooms = [f"R{i:03d}" for i in range(1, regular_rooms + 1)] or major_rooms
+    course_id = 0
+
+    def slot_time() -> str:
+        index = rng.randrange(len(BASE_TIMES) - 1)
+        return f"{BASE_TIMES[index]}-{BASE_TIMES[index + 1]}"
+
+    for p in range(1, programs + 1):
+        program = f"PROG{p:02d}"
+        for year in YEARS:
+            for trimester in TRIMESTERS:
+                term = [program, year, trimester]
+                for _ in range(courses_per_term):
+                    course_id += 1
+                    roll = rng.random()
+                    if roll < pair_ratio:
+                        code = f"{MAJOR_PREFIX}{course_id}"
+                        title = f"Synthetic Major {course_id}"
+                        yield [code, f"{title} (Lec)", 2, slot_time(), "MW",
+                               rng.choice(major_rooms)] + term
+                        yield [code, f"{title} (Lab)", 1, slot_time(), "MWF",
+                               rng.choice(lab_rooms)] + term
+                    elif roll < pair_ratio + pe_share:
+                        if rng.random() < 0.5:
+                            yield [f"NSTP{course_id}", f"National Service {course_id}", 3,
+                                   slot_time(), "SAT", "Aud"] + term
+                        else:
+                            yield [f"PathFit{course_id}", f"Fitness Activities {course_id}", 2,
+                                   slot_time(), rng.choice(["MW", "TTH"]), "Gym"] + term
+                    elif rng.random() < major_share:
+                        yield [f"{MAJOR_PREFIX}{course_id}", f"Synthetic Major {course_id}", 3,
+                               slot_time(), rng.choice(["MWF", "TTHS"]),
+                               rng.choice(major_rooms)] + term
+                    else:
+                        yield [f"{GENERAL_PREFIX}{course_id}", f"General Education {course_id}", 3,
+                               slot_time(), rng.choice(["MWF", "TTHS"]),
+                               rng.choice(general_rooms)] + term
+
+
+def write_synthetic_catalog(path: str, **options) -> int:
+    """
+    Stream a synthetic catalog to path; options as for synthetic_rows.
+    Returns the number of rows written.
+    """
+    written = 0
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CourseCatalog.COLUMNS)
+        for row in synthetic_rows(**options):
+            writer.writerow(row)
+            written += 1
+    return written
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic course catalog CSV.")
+    parser.add_argument("--out", required=True, help="output CSV path")
+    parser.add_argument("--programs", type=int, default=24)
+    parser.add_argument("--courses", type=int, default=10, help="courses per program term")
+    parser.add_argument("--pair-ratio", type=float, default=0.4, help="share of lec+lab pairs")
+    parser.add_argument("--pe-share", type=float, default=0.1, help="share of NSTP/PathFit courses")
+    parser.add_argument("--major-share", type=float, default=0.5,
+                        help="share of major subjects among the remaining courses")
+    parser.add_argument("--regular-rooms", type=int, default=20, help="general-purpose rooms")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    written = write_synthetic_catalog(
+        args.out, programs=args.programs, courses_per_term=args.courses,
+        pair_ratio=args.pair_ratio, pe_share=args.pe_share, major_share=args.major_share,
+        regular_rooms=args.regular_rooms, seed=args.seed
+    )
+    print(f"Wrote {written} rows to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Faculty assignment against an exact matching on instances small enough
+to solve exactly, and the search budgets on larger ones.
+"""
+import random
+
+import faculty as faculty_module
+from scheduler import BASE_SLOTS, Course, SectionSchedule
+from faculty import FacultyAssigner, Instructor, assign_faculty
+
+
+def placed_course(i: int, slot_index: int) -> Course:
+    slot = BASE_SLOTS[slot_index]
+    return Course(f"C{i}", f"Course {i}", 3, f"{slot.start_time_str}-{slot.end_time_str}",
+                  "MWF", "M301")
+
+
+def maximum_matching(courses, faculty) -> int:
+    """
+    Kuhn's augmenting paths, one course per instructor.
+    """
+    owner = {}
+
+    def place(i, seen):
+        for f, instructor in enumerate(faculty):
+            if courses[i].code in instructor.courses and f not in seen:
+                seen.add(f)
+                if f not in owner or place(owner[f], seen):
+                    owner[f] = i
+                    return True
+        return False
+
+    return sum(place(i, set()) for i in range(len(courses)))
+
+
+def test_single_slot_matches_maximum_matching():
+    # With every course in one slot, an instructor teaches at most one
+    for trial in range(300):
+        rng = random.Random(trial)
+        courses = [placed_course(i, 0) for i in range(rng.randint(3, 20))]
+        faculty = [Instructor(f"I{f}", 3 * rng.randint(1, 3),
+                              frozenset(c.code for c in courses if rng.random() < 0.2))
+                   for f in range(rng.randint(2, 14))]
+        sections = [SectionSchedule("A", "BSCS", "First", "First", 0, courses)]
+        expected = maximum_matching(courses, faculty)
+        assert assign_faculty(sections, faculty)["assigned"] == expected, trial
+
+
+def test_assignment_respects_units_and_clashes():
+    rng = random.Random(7)
+    courses = [placed_course(i, rng.randrange(3)) for i in range(40)]
+    faculty = [Instructor(f"I{f}", 3 * rng.randint(1, 3),
+                          frozenset(c.code for c in courses if rng.random() < 0.2))
+               for f in range(12)]
+    assign_faculty([SectionSchedule("A", "BSCS", "First", "First", 0, courses)], faculty)
+    by_name = {f.name: f for f in faculty}
+    for instructor in faculty:
+        taught = [c for c in courses if c.instructor == instructor.name]
+        assert sum(c.units for c in taught) <= instructor.max_units
+        assert len({c.start_minute for c in taught}) == len(taught)
+    for c in courses:
+        if c.instructor:
+            assert c.code in by_name[c.instructor].courses
+
+
+
+def test_last_pass_stays_within_its_budget(monkeypatch):
+    rng = random.Random(0)
+    codes = [f"C{i}" for i in range(40)]
+    courses = [Course(rng.choice(codes), "x", rng.choice([1, 2, 3, 3]),
+                      f"{slot.start_time_str}-{slot.end_time_str}", rng.choice(["MWF", "TTHS"]),
+                      "M301")
+               for slot in (rng.choice(BASE_SLOTS) for _ in range(600))]
+    faculty = [Instructor(f"I{f}", rng.choice([21, 24]),
+                          frozenset(rng.sample(codes, rng.randint(2, 6))))
+               for f in range(57)]
+    sections = [SectionSchedule("A", "BSCS", "First", "First", 0, courses)]
+
+    def run(final_expansions):
+        monkeypatch.setattr(faculty_module, "FINAL_EXPANSIONS", final_expansions)
+        assigner = FacultyAssigner(sections, faculty)
+        assigner.run()
+        return assigner.expansions, sum(1 for f in assigner.owner if f >= 0)
+
+    # No last pass, a one-state-per-course pass, and one as long as it likes
+    (capped, assigned), (budgeted, _), (free, most) = run(0), run(1), run(10 ** 9)
+    assert free - capped > len(courses)
+    assert budgeted - capped <= len(courses)
+    assert assigned <= most
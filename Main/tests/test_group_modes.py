@@ -0,0 +1,79 @@
+"""
+How the group modes split campus rooms and time between the groups.
+"""
+import os
+
+import pytest
+
+from ingest import load_catalog_cached
+from scheduler import (
+    GROUPS, PROGRAM_YEARS, RESTRICTED_ROOMS, SLOT_BY_MINUTE, iter_sections, partition_rooms,
+    room_pools, slot_blocks
+)
+from validate import validate_sections
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+COUNTS = {program: {year: 2 for year in years} for program, years in PROGRAM_YEARS.items()}
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_catalog_cached(DATA_CSV, use_cache=False)
+
+
+def signature(sections):
+    return [(s.group, s.title, [(c.code, c.time, c.days, c.room) for c in s.courses])
+            for s in sections]
+
+
+def placed(catalog, group_mode, trimester="First", workers=1):
+    return list(iter_sections(catalog, COUNTS, trimester, workers, seed=6, group_mode=group_mode))
+
+
+def test_rooms_are_dealt_out_by_class(catalog):
+    owned, shared = partition_rooms(catalog.rooms, len(GROUPS))
+    assert not owned[0] & owned[1]
+    assert not (owned[0] | owned[1]) & shared
+    assert (owned[0] | owned[1] | shared) == catalog.rooms - RESTRICTED_ROOMS
+    for room_class, pool in room_pools(frozenset(catalog.rooms)).items():
+        pool = set(pool) - RESTRICTED_ROOMS - shared
+        if pool:
+            assert owned[0] & pool and owned[1] & pool, room_class
+
+
+@pytest.mark.parametrize("group_mode", ["shared", "rooms", "halves"])
+def test_no_conflicts(catalog, group_mode):
+    sections = placed(catalog, group_mode)
+    assert sum(len(s.courses) for s in sections) > 0
+    assert validate_sections(sections) == []
+
+
+@pytest.mark.parametrize("group_mode", ["rooms", "halves"])
+def test_worker_count_does_not_change_the_schedule(catalog, group_mode):
+    serial = signature(placed(catalog, group_mode))
+    assert signature(placed(catalog, group_mode, workers=2)) == serial
+    assert signature(placed(catalog, group_mode, workers=3)) == serial
+
+
+def test_rooms_mode_keeps_groups_in_their_rooms(catalog):
+    owned, shared = partition_rooms(catalog.rooms, len(GROUPS))
+    blocks = slot_blocks(len(GROUPS))
+    for section in placed(catalog, "rooms"):
+        g = GROUPS.index(section.group)
+        for c in section.courses:
+            if c.room in RESTRICTED_ROOMS or c.room in owned[g]:
+                continue
+            assert c.room in shared and SLOT_BY_MINUTE[c.start_minute] in blocks[g], c.room
+
+
+@pytest.mark.parametrize("trimester", ["First", "Third"])
+def test_halves_mode_keeps_groups_in_their_block(catalog, trimester):
+    blocks = slot_blocks(len(GROUPS))
+    sections = placed(catalog, "halves", trimester)
+    # NSTP and PathFit meet in the shared venues, which halves splits as well
+    assert any(c.room in RESTRICTED_ROOMS for s in sections for c in s.courses)
+    for section in sections:
+        block = blocks[GROUPS.index(section.group)]
+        for c in section.courses:
+            assert SLOT_BY_MINUTE[c.start_minute] in block, (section.group, c.code, c.time)
@@ -0,0 +1,114 @@
+"""
+Catalog and faculty CSV validation, and the parsed-catalog cache.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import ingest
+from ingest import (
+    CatalogValidationError, FacultyValidationError, load_catalog_cached, load_faculty,
+    read_catalog_csv
+)
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+ROW = {"Course_Code": "GE1", "Description": "Understanding the Self", "Units": "3",
+       "Time": "7:30am-8:50am", "Days": "MWF", "Room": "S106", "Program": "BSCS",
+       "Year_Level": "First", "Trimester": "First"}
+
+
+def write_catalog(path, *changes, drop=()):
+    rows = [{**ROW, **change} for change in changes or ({},)]
+    frame = pd.DataFrame(rows).drop(columns=list(drop))
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+def errors(path):
+    with pytest.raises(CatalogValidationError) as raised:
+        load_catalog_cached(path, use_cache=False)
+    return raised.value.errors
+
+
+def test_data_csv_is_valid():
+    catalog = load_catalog_cached(DATA_CSV, use_cache=False)
+    assert set(read_catalog_csv(DATA_CSV)["Room"]) == catalog.rooms
+
+
+def test_missing_columns(tmp_path):
+    path = write_catalog(tmp_path / "c.csv", drop=("Room", "Trimester"))
+    assert errors(path) == [(1, "missing column Room"), (1, "missing column Trimester")]
+
+
+def test_bad_times_units_and_blanks_are_all_listed(tmp_path):
+    path = write_catalog(tmp_path / "c.csv",
+                         {},
+                         {"Time": "7:30-8:50"},
+                         {"Time": "13:00am-1:00pm"},
+                         {"Time": "9:00am-8:00am"},
+                         {"Units": "2.5"},
+                         {"Room": None})
+    assert errors(path) == [
+        (3, "Time '7:30-8:50' is not like '7:30am-8:50am'"),
+        (4, "Time '13:00am-1:00pm' has an impossible clock time"),
+        (5, "Time '9:00am-8:00am' ends before it starts"),
+        (6, "Units '2.5' is not a whole number"),
+        (7, "Room is empty"),
+    ]
+
+
+def test_cache_hits_and_invalidation(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    path = write_catalog(tmp_path / "c.csv")
+    first = load_catalog_cached(path, cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A hit never parses the CSV again
+    def no_parsing(_):
+        raise AssertionError("parsed a cached catalog")
+    monkeypatch.setattr(ingest, "read_catalog_csv", no_parsing)
+    assert load_catalog_cached(path, cache_dir).rooms == first.rooms
+    monkeypatch.undo()
+
+    # New content is a new key, so the edit shows up
+    write_catalog(path, {"Room": "S122"})
+    assert "S122" in load_catalog_cached(path, cache_dir).rooms
+    assert len(os.listdir(cache_dir)) == 2
+
+    # So is a new mtime, even with the same bytes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    load_catalog_cached(path, cache_dir)
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_unreadable_cache_entries_are_rebuilt(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    path = write_catalog(tmp_path / "c.csv")
+    load_catalog_cached(path, cache_dir)
+    (entry,) = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, entry), "wb") as f:
+        f.write(b"not a pickle")
+    assert "S106" in load_catalog_cached(path, cache_dir).rooms
+
+
+def test_faculty_rows(tmp_path):
+    path = tmp_path / "faculty.csv"
+    path.write_text("Name,Max_Units,Courses\n"
+                    "Ada,18,CC1; CC2\n"
+                    "Ada,12,CC3\n"
+                    "Bo,zero,CC4\n"
+                    ",9,\n")
+    with pytest.raises(FacultyValidationError) as raised:
+        load_faculty(str(path))
+    assert raised.value.errors == [
+        (3, "Ada is listed twice"),
+        (4, "Max_Units 'zero' is not a positive whole number"),
+        (5, "Name is empty"),
+        (5, "Courses is empty"),
+    ]
+    path.write_text("Name,Max_Units,Courses\nAda,18,CC1; CC2\n")
+    (ada,) = load_faculty(str(path))
+    assert ada.max_units == 18 and ada.courses == {"CC1", "CC2"}
@@ -0,0 +1,58 @@
+"""
+The whole-run optimizer and what generate reports after it.
+"""
+import os
+
+import pytest
+
+from cli import run_generate
+from ingest import load_catalog_cached
+from optimizer import optimize_schedule
+from scheduler import PROGRAM_YEARS, iter_sections
+from validate import UnplacedCourses, validate_sections
+from workbook import read_workbook
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+COUNTS = {program: {year: 2 for year in years} for program, years in PROGRAM_YEARS.items()}
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_catalog_cached(DATA_CSV, use_cache=False)
+
+
+def placed(sections) -> int:
+    return sum(len(s.courses) for s in sections)
+
+
+def test_no_placed_course_is_dropped(catalog):
+    # Per-section rooms collide; dropping the colliding courses would be cheaper
+    sections = list(iter_sections(catalog, COUNTS, "First", seed=4, share_rooms=False))
+    before = placed(sections)
+    conflicts = sum(i.kind == "room_conflict" for i in validate_sections(sections))
+    result = optimize_schedule(sections, catalog, iterations=50000, seed=4)
+    assert result["final_dropped"] <= result["initial_dropped"]
+    assert placed(sections) >= before
+    assert result["final_conflicts"] < result["initial_conflicts"]
+    assert sum(i.kind == "room_conflict" for i in validate_sections(sections)) < conflicts
+
+
+def test_time_budget_alone_ends_the_run(catalog):
+    sections = list(iter_sections(catalog, {"BSCS": {"First": 2}}, "First", seed=4))
+    result = optimize_schedule(sections, catalog, iterations=None, time_budget=0.3, seed=4)
+    assert result["seconds"] >= 0.3
+
+
+@pytest.mark.parametrize("share_rooms", [True, False])
+def test_generate_reports_what_the_workbook_lacks(catalog, tmp_path, share_rooms):
+    out = str(tmp_path / "sched.xlsx")
+    result = run_generate(DATA_CSV, out, "First", COUNTS, seed=4, share_rooms=share_rooms,
+                          optimize=0.2, use_cache=False)
+    sections, metadata = read_workbook(out)
+    recount = UnplacedCourses(catalog)
+    for section in sections:
+        recount.add(section)
+    assert placed(sections) + recount.count == recount.requested
+    assert result["unplaced"].count == recount.count
+    assert metadata["Unplaced"] == recount.summary()
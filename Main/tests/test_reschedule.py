@@ -0,0 +1,56 @@
+"""
+Rescheduling one section of an exported workbook.
+"""
+import os
+
+import pytest
+
+from cli import main, run_generate, run_reschedule
+from validate import validate_workbook
+from workbook import diff_sections, read_workbook
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+COUNTS = {"BSCS": {"First": 2, "Second": 3}, "BSDA": {"Second": 2}}
+TARGET = "Group A: BSCS, Second Year, First Trimester Section 2B"
+
+
+@pytest.fixture
+def published(tmp_path):
+    path = str(tmp_path / "sched.xlsx")
+    run_generate(DATA_CSV, path, "First", COUNTS, seed=3, use_cache=False)
+    assert validate_workbook(path) == []
+    return path
+
+
+@pytest.mark.parametrize("group_mode", ["shared", "rooms"])
+def test_edit_stays_conflict_free(published, tmp_path, group_mode):
+    out = str(tmp_path / "edited.xlsx")
+    edited = run_reschedule(published, DATA_CSV, out, "A", "BSCS", "2B", seed=99,
+                            group_mode=group_mode, use_cache=False)
+    assert edited.section_name == "2B" and edited.courses
+    assert validate_workbook(out) == []
+
+    before, _ = read_workbook(published)
+    after, metadata = read_workbook(out)
+    assert {change.section for change in diff_sections(before, after)} == {TARGET}
+    assert metadata["Rescheduled"] == "Group A: " + edited.title
+    assert metadata["Reschedule Seed"] == 99
+
+
+def test_same_seed_same_edit(published, tmp_path):
+    first, second = str(tmp_path / "one.xlsx"), str(tmp_path / "two.xlsx")
+    for out in (first, second):
+        run_reschedule(published, DATA_CSV, out, "A", "BSCS", "2B", seed=5, use_cache=False)
+    assert diff_sections(read_workbook(first)[0], read_workbook(second)[0]) == []
+
+
+def test_rejected_edit_changes_nothing(published, tmp_path):
+    out = str(tmp_path / "edited.xlsx")
+    with open(published, "rb") as f:
+        original = f.read()
+    assert main(["reschedule", published, "--csv", DATA_CSV, "--program", "BSCS",
+                 "--section", "9Z", "--out", out]) == 2
+    assert not os.path.exists(out)
+    with open(published, "rb") as f:
+        assert f.read() == original
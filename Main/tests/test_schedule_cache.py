@@ -0,0 +1,87 @@
+"""
+Cached regeneration against fresh runs, and how many sections it reuses.
+"""
+import copy
+import os
+
+import pytest
+
+from ingest import load_catalog_cached
+from schedule_cache import ScheduleCache
+from scheduler import PROGRAM_YEARS, iter_sections
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+COUNTS = {program: {year: 2 for year in years} for program, years in PROGRAM_YEARS.items()}
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_catalog_cached(DATA_CSV, use_cache=False)
+
+
+def signature(sections):
+    return [(s.group, s.title, [(c.code, c.time, c.days, c.room) for c in s.courses])
+            for s in sections]
+
+
+def one_more_bscs_second(counts):
+    changed = copy.deepcopy(counts)
+    changed["BSCS"]["Second"] += 1
+    return changed
+
+
+def run(catalog, counts, **options):
+    return list(iter_sections(catalog, counts, "First", seed=8, **options))
+
+
+@pytest.mark.parametrize("options", [
+    {"group_mode": "shared"},
+    {"group_mode": "rooms"},
+    {"group_mode": "halves"},
+    {"share_rooms": False},
+])
+def test_cached_regeneration_matches_a_fresh_run(catalog, options):
+    cache = ScheduleCache()
+    first = run(catalog, COUNTS, cache=cache, **options)
+    assert signature(run(catalog, COUNTS, cache=cache, **options)) == signature(first)
+    assert cache.hits == len(first)
+
+    changed = one_more_bscs_second(COUNTS)
+    cached = run(catalog, changed, cache=cache, **options)
+    assert signature(cached) == signature(run(catalog, changed, **options))
+
+
+def test_reuse_counts(catalog):
+    changed = one_more_bscs_second(COUNTS)
+    order = [(s.group, s.program, s.year, s.section_index) for s in run(catalog, changed)]
+    # Where the new section lands in each group
+    new_a = order.index(("A", "BSCS", "Second", 2))
+    new_b = order.index(("B", "BSCS", "Second", 2))
+    group_b = next(i for i, key in enumerate(order) if key[0] == "B")
+    expected = {
+        # Everything after the new section in workbook order is placed again
+        "shared": new_a,
+        # Each group only depends on its own earlier sections
+        "rooms": new_a + (new_b - group_b),
+    }
+    for group_mode, hits in expected.items():
+        cache = ScheduleCache()
+        run(catalog, COUNTS, cache=cache, group_mode=group_mode)
+        cache.hits = cache.misses = 0
+        run(catalog, changed, cache=cache, group_mode=group_mode)
+        assert (cache.hits, cache.misses) == (hits, len(order) - hits), group_mode
+
+    # Independent sections: only the two new ones are placed
+    cache = ScheduleCache()
+    run(catalog, COUNTS, cache=cache, share_rooms=False)
+    cache.hits = 0
+    run(catalog, changed, cache=cache, share_rooms=False)
+    assert cache.hits == len(order) - 2
+
+
+def test_disk_cache_survives_the_process(catalog, tmp_path):
+    first = run(catalog, COUNTS, cache=ScheduleCache(directory=str(tmp_path)))
+    cache = ScheduleCache(directory=str(tmp_path))
+    assert signature(run(catalog, COUNTS, cache=cache)) == signature(first)
+    assert cache.hits == len(first) and cache.misses == 0
@@ -0,0 +1,85 @@
+"""
+Checks for the precomputed scheduling tables against the code they replaced.
+"""
+import pytest
+
+from scheduler import (
+    BASE_SLOTS, MAJOR_SUBJECTS, SlotGrid, classify_room_class, get_consecutive_time_slots,
+    major_prefix_collisions, match_major_subject
+)
+
+
+############################################
+#        CONSECUTIVE SLOT SEQUENCES        #
+############################################
+
+def original_scan(available, num_slots):
+    """
+    The slot scan get_consecutive_time_slots used before the tables, on a
+    list of per-slot availability flags.
+    """
+    sequences = []
+    for i in range(len(available) - num_slots + 1):
+        sequence = []
+        valid = True
+        current, last_used = i, None
+        while len(sequence) < num_slots and current < len(available):
+            if available[current]:
+                if last_used is not None and current - last_used > 1:
+                    valid = False
+                    break
+                sequence.append(current)
+                last_used = current
+            current += 1
+        if valid and len(sequence) == num_slots:
+            sequences.append(sequence)
+    return sequences
+
+
+@pytest.mark.parametrize("num_slots", [1, 2, 3])
+@pytest.mark.parametrize("is_mwf", [True, False])
+def test_sequences_match_original_scan_for_every_mask(num_slots, is_mwf):
+    n = len(BASE_SLOTS)
+    for used_mask in range(1 << n):
+        grid = SlotGrid()
+        for i in range(n):
+            if (used_mask >> i) & 1:
+                grid.mark_used(i, is_mwf)
+        available = [not (used_mask >> i) & 1 for i in range(n)]
+        found = [[slot.index for slot in seq]
+                 for seq in get_consecutive_time_slots(grid, is_mwf, num_slots)]
+        assert found == original_scan(available, num_slots), bin(used_mask)
+
+
+def test_sequences_longer_than_grid():
+    assert get_consecutive_time_slots(SlotGrid(), True, len(BASE_SLOTS) + 1) == []
+
+
+############################################
+#          MAJOR SUBJECT PREFIXES          #
+############################################
+
+def test_exact_major_subject():
+    assert match_major_subject("CC10") == "CC10"
+    assert match_major_subject("CIT13") == "CIT13"
+
+
+def test_shadowed_code_resolves_to_longest_entry():
+    # CC100 is not a major subject itself; the CC10 entry claims it
+    assert "CC100" not in MAJOR_SUBJECTS
+    assert match_major_subject("CC100") == "CC10"
+    assert match_major_subject("CC1A") == "CC1"
+    assert classify_room_class("CC100", False) == classify_room_class("CC10", False)
+
+
+def test_non_major_code():
+    assert match_major_subject("GE1") is None
+    assert match_major_subject("C") is None
+
+
+def test_prefix_collisions():
+    codes = {"CC1", "CC10", "CC100", "CIT1", "GE2"}
+    assert major_prefix_collisions(codes) == {"CC1": ["CC10", "CC100"], "CC10": ["CC100"]}
+    collisions = major_prefix_collisions()
+    assert collisions["CC1"] == sorted(c for c in MAJOR_SUBJECTS if c.startswith("CC1") and c != "CC1")
+    assert "CC10" not in collisions
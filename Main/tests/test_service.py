@@ -0,0 +1,182 @@
+"""
+The HTTP service end to end, on a free localhost port.
+"""
+import asyncio
+import glob
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import service
+from export import export_workbook, run_metadata
+from ingest import load_catalog_cached
+from scheduler import TimeGrid, iter_sections, set_time_grid
+from workbook import iter_sections as read_sections, read_metadata
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+SMALL = {"sections": {"BSCS": {"First": 2}}, "seed": 7}
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_catalog_cached(DATA_CSV, use_cache=False)
+
+
+@pytest.fixture(scope="module")
+def server(catalog):
+    scheduling = service.SchedulingService(catalog, workers=1)
+    loop = asyncio.new_event_loop()
+    listening = loop.run_until_complete(service.start_server(scheduling, "127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    host, port = listening.sockets[0].getsockname()[:2]
+    yield scheduling, f"http://{host}:{port}", (host, port)
+    loop.call_soon_threadsafe(listening.close)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    scheduling.close()
+
+
+def call(base, method, path, body=None):
+    request = urllib.request.Request(base + path, data=body, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=120) as reply:
+            return reply.status, reply.headers, reply.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def post_json(base, path, payload):
+    return call(base, "POST", path, json.dumps(payload).encode())
+
+
+def test_health(server):
+    _, base, _ = server
+    status, _, body = call(base, "GET", "/health")
+    assert status == 200
+    assert json.loads(body)["status"] == "ok"
+
+
+def test_reply_ends_with_the_connection(server):
+    # Clients that read until EOF hang if a pool worker holds the socket open
+    _, _, address = server
+    body = json.dumps(SMALL).encode()
+    with socket.create_connection(address, timeout=60) as conn:
+        conn.sendall(b"POST /generate HTTP/1.1\r\nHost: localhost\r\n"
+                     + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        reply = b""
+        while True:
+            data = conn.recv(65536)
+            if not data:
+                break
+            reply += data
+    assert reply.startswith(b"HTTP/1.1 200 OK")
+
+
+def test_generate_is_reproducible(server):
+    _, base, _ = server
+    status, _, first = post_json(base, "/generate", SMALL)
+    assert status == 200
+    reply = json.loads(first)
+    assert reply["seed"] == 7
+    assert reply["sections"] == 4
+    assert {c["Program"] for c in reply["courses"]} == {"BSCS"}
+    assert reply["unplaced"]["requested"] >= len(reply["courses"])
+    assert post_json(base, "/generate", SMALL)[2] == first
+
+
+def test_export_streams_a_workbook_that_validates(server):
+    _, base, _ = server
+    before = set(glob.glob(os.path.join(tempfile.gettempdir(), "schedule-*.xlsx")))
+    status, headers, workbook = post_json(base, "/export", SMALL)
+    assert status == 200
+    assert headers["Transfer-Encoding"] == "chunked"
+    assert len(list(read_sections(io.BytesIO(workbook)))) == 4
+    metadata = read_metadata(io.BytesIO(workbook))
+    assert metadata["Seed"] == 7 and metadata["Groups"] == "shared"
+    assert "Unplaced" in metadata
+    # The worker's temporary file is gone once it has been sent
+    assert set(glob.glob(os.path.join(tempfile.gettempdir(), "schedule-*.xlsx"))) <= before
+
+    status, _, body = call(base, "POST", "/validate", workbook)
+    assert status == 200
+    assert json.loads(body) == {"issues": [], "counts": {}}
+
+
+def test_validate_uses_the_recorded_time_grid(server, catalog):
+    _, base, _ = server
+    grid = TimeGrid(["8:00am", "9:00am", "10:00am", "11:00am", "1:00pm", "2:00pm", "3:00pm"], 50)
+    set_time_grid(grid)
+    try:
+        out = io.BytesIO()
+        export_workbook(iter_sections(catalog, {"BSCS": {"First": 2}}, "First", seed=3), out,
+                        run_metadata(3, "First"))
+    finally:
+        set_time_grid(TimeGrid())
+    status, _, body = call(base, "POST", "/validate", out.getvalue())
+    assert status == 200
+    assert json.loads(body)["counts"] == {}
+
+
+def test_identical_requests_share_one_job(server):
+    scheduling, base, _ = server
+    coalesced = scheduling.coalesced
+    start = threading.Barrier(4)
+    replies = []
+
+    def request():
+        start.wait()
+        replies.append(post_json(base, "/generate", {"trimester": "Second"}))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [status for status, _, _ in replies] == [200] * 4
+    # No seed was given, so sharing shows as one seed for everyone
+    assert len({json.loads(body)["seed"] for _, _, body in replies}) == 1
+    assert scheduling.coalesced > coalesced
+
+
+@pytest.mark.parametrize("payload", [
+    {"seed": True},
+    {"seed": -1},
+    {"time_budget": True},
+    {"time_budget": 0},
+    {"engine": "fastest"},
+    {"trimester": "Fourth"},
+    {"group_mode": "none"},
+    {"colour": "blue"},
+    {"sections": [1]},
+    {"sections": {"BSCS": [1]}},
+    {"sections": {"BSCS": {"First": -1}}},
+    {"sections": {"BSCS": {"First": 27}}},
+    {"sections": {"BSCS": {"First": True}}},
+    {"sections": {"BSCS": {"Fifth": 1}}},
+    {"sections": {"NOPE": {"First": 1}}},
+])
+def test_bad_parameters(server, payload):
+    _, base, _ = server
+    for path in ("/generate", "/export"):
+        status, _, body = post_json(base, path, payload)
+        assert status == 400, (path, payload)
+        assert "error" in json.loads(body)
+
+
+def test_bad_bodies_and_routes(server):
+    _, base, _ = server
+    assert call(base, "POST", "/generate", b"{not json")[0] == 400
+    assert call(base, "POST", "/validate", b"not a workbook")[0] == 400
+    assert call(base, "POST", "/validate", b"")[0] == 400
+    assert call(base, "POST", "/catalog", b"a,b\n1,2\n")[0] == 400
+    assert call(base, "GET", "/generate")[0] == 405
+    assert call(base, "GET", "/nowhere")[0] == 404
@@ -0,0 +1,48 @@
+"""
+The constraint-solver engine on Data.csv.
+"""
+import functools
+import os
+import random
+
+import pytest
+
+from ingest import load_catalog_cached
+from scheduler import PROGRAM_YEARS, RoomOccupancy, SectionSchedule, iter_sections
+from solver import solve_section_courses
+from validate import validate_sections
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_catalog_cached(DATA_CSV, use_cache=False)
+
+
+@pytest.mark.parametrize("time_budget", [0.0, 1e-5, 0.2])
+def test_any_budget_places_the_section(catalog, time_budget):
+    courses = catalog.get_courses("BSCS", "Second", "Second")
+    placed = solve_section_courses(courses, "Second", "Second", rng=random.Random(1),
+                                   time_budget=time_budget)
+    assert len(placed) == len(courses) == 9
+    section = SectionSchedule("A", "BSCS", "Second", "Second", 0, placed)
+    assert validate_sections([section]) == []
+
+
+def test_booked_rooms_are_left_alone(catalog):
+    courses = catalog.get_courses("BSCS", "Second", "Second")
+    occupancy = RoomOccupancy(catalog.rooms)
+    first = solve_section_courses(courses, "Second", "Second", occupancy, random.Random(1))
+    second = solve_section_courses(courses, "Second", "Second", occupancy, random.Random(2))
+    sections = [SectionSchedule("A", "BSCS", "Second", "Second", n, placed)
+                for n, placed in enumerate([first, second])]
+    assert validate_sections(sections) == []
+
+
+def test_whole_run_has_no_conflicts(catalog):
+    counts = {program: {year: 2 for year in years} for program, years in PROGRAM_YEARS.items()}
+    engine = functools.partial(solve_section_courses, time_budget=0.01)
+    sections = list(iter_sections(catalog, counts, "Second", seed=5, engine=engine))
+    assert sum(len(s.courses) for s in sections) > 0
+    assert validate_sections(sections) == []
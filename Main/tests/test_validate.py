@@ -0,0 +1,91 @@
+"""
+The whole-run validator finds seeded conflicts and unplaced courses.
+"""
+import os
+
+import pytest
+
+from export import export_workbook
+from ingest import load_catalog_cached
+from scheduler import Course, SectionSchedule, iter_sections
+from validate import UnplacedCourses, validate_sections, validate_workbook
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_catalog_cached(DATA_CSV, use_cache=False)
+
+
+def section(index: int, *courses: Course) -> SectionSchedule:
+    return SectionSchedule("A", "BSCS", "Second", "Second", index, list(courses))
+
+
+def course(code: str, time: str, days: str, room: str) -> Course:
+    return Course(code, f"{code} title", 3, time, days, room)
+
+
+def kinds(issues):
+    return sorted(issue.kind for issue in issues)
+
+
+def test_generated_run_is_clean(catalog):
+    sections = list(iter_sections(catalog, {"BSCS": {"Second": 3}}, "Second", seed=5))
+    assert validate_sections(sections) == []
+
+
+def test_room_double_booking():
+    sections = [section(0, course("GE1", "7:30am-8:50am", "MWF", "S106")),
+                section(1, course("GE2", "8:00am-9:20am", "MW", "S106"))]
+    issues = validate_sections(sections)
+    assert kinds(issues) == ["room_conflict", "room_conflict"]
+    by_code = {issue.code: issue for issue in issues}
+    assert by_code["GE1"].detail.startswith("S106 is also booked for GE2")
+    assert by_code["GE2"].detail.startswith("S106 is also booked for GE1")
+
+
+def test_shared_venues_and_other_days_do_not_conflict():
+    sections = [section(0, course("NSTP1", "7:30am-8:50am", "MWF", "Aud"),
+                        course("GE2", "8:50am-10:10am", "MWF", "S106")),
+                section(1, course("NSTP1", "7:30am-8:50am", "MWF", "Aud"),
+                        course("GE4", "8:50am-10:10am", "TTH", "S106"))]
+    assert validate_sections(sections) == []
+
+
+def test_section_overlap():
+    sections = [section(0, course("GE1", "7:30am-8:50am", "MWF", "S106"),
+                        course("GE2", "8:00am-9:20am", "MW", "S122"))]
+    issues = validate_sections(sections)
+    assert kinds(issues) == ["section_overlap", "section_overlap"]
+    assert issues[0].section == "Group A: BSCS, Second Year, Second Trimester Section 2A"
+
+
+def test_pair_and_room_class():
+    lec = Course("CCS8", "Software Engineering (Lec)", 3, "7:30am-8:50am", "MWF", "M301")
+    lab = Course("CCS8", "Software Engineering (Lab)", 1, "12:50pm-2:10pm", "MWF", "S106")
+    issues = validate_sections([section(0, lec, lab)])
+    assert kinds(issues) == ["pair_adjacency", "room_class"]
+
+
+def test_exported_workbook(tmp_path):
+    path = str(tmp_path / "sched.xlsx")
+    export_workbook([section(0, course("GE1", "7:30am-8:50am", "MWF", "S106")),
+                     section(1, course("GE2", "7:30am-8:50am", "MWF", "S106"))], path)
+    assert kinds(validate_workbook(path)) == ["room_conflict", "room_conflict"]
+
+
+def test_unplaced_course(catalog):
+    placed = list(iter_sections(catalog, {"BSCS": {"Second": 1}}, "Second", seed=5))[0]
+    requested = len(catalog.get_courses("BSCS", "Second", "Second"))
+    assert len(placed.courses) == requested
+    dropped = placed.courses.pop()
+
+    unplaced = UnplacedCourses(catalog)
+    unplaced.add(placed)
+    assert unplaced.count == 1
+    assert unplaced.summary() == f"1 of {requested} courses unplaced"
+    assert unplaced.lines() == [f"Group A: {placed.title}: {dropped.code}"]
+    metadata = {}
+    unplaced.record(metadata)
+    assert metadata["Unplaced Courses"] == unplaced.lines()[0]
@@ -0,0 +1,72 @@
+"""
+Exported workbooks read back into the sections they were written from.
+"""
+import os
+
+import openpyxl
+import pytest
+
+from export import export_workbook, run_metadata
+from ingest import load_catalog_cached
+from scheduler import iter_sections
+from workbook import WorkbookFormatError, diff_sections, read_workbook
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data.csv")
+
+COUNTS = {"BSCS": {"First": 2, "Second": 2}, "BMMA": {"Third": 1}}
+
+
+@pytest.fixture(scope="module")
+def sections():
+    catalog = load_catalog_cached(DATA_CSV, use_cache=False)
+    sections = list(iter_sections(catalog, COUNTS, "Second", seed=11))
+    # Instructors on some sections only, so both header layouts are written
+    for n, section in enumerate(sections[::2]):
+        for k, course in enumerate(section.courses):
+            course.instructor = f"Instructor {n}-{k}"
+    return sections
+
+
+def placements(section):
+    return [(c.code, c.description, c.units, c.time, c.days, c.room, c.instructor)
+            for c in section.mwf_courses + section.tth_courses]
+
+
+def test_round_trip(sections, tmp_path):
+    path = str(tmp_path / "sched.xlsx")
+    metadata = run_metadata(11, "Second", "greedy", "shared")
+    export_workbook(sections, path, metadata)
+    read, recorded = read_workbook(path)
+
+    assert len(read) == len(sections)
+    for before, after in zip(sections, read):
+        assert (after.group, after.program, after.year, after.trimester, after.section_index) == \
+               (before.group, before.program, before.year, before.trimester, before.section_index)
+        assert after.title == before.title
+        assert placements(after) == placements(before)
+        assert [(c.start_minute, c.end_minute) for c in after.courses] == \
+               [(c.start_minute, c.end_minute) for c in before.mwf_courses + before.tth_courses]
+    assert recorded == metadata
+    assert diff_sections(sections, read) == []
+
+
+def test_moved_course_shows_in_diff(sections, tmp_path):
+    path = str(tmp_path / "sched.xlsx")
+    export_workbook(sections, path)
+    read, _ = read_workbook(path)
+    moved = read[1].courses[0]
+    moved.room = "ELSEWHERE"
+    changes = diff_sections(sections, read)
+    assert len(changes) == 1
+    assert changes[0].code == moved.code and changes[0].after[2] == "ELSEWHERE"
+
+
+def test_malformed_rows_say_where(tmp_path):
+    path = str(tmp_path / "bad.xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Group A"
+    ws.append(["GE1", "Course", 3, "7:30am-8:50am", "MWF", "S106"])
+    wb.save(path)
+    with pytest.raises(WorkbookFormatError, match="Group A row 1"):
+        read_workbook(path)
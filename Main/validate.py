@@ -0,0 +1,247 @@
+"""
+Whole-run schedule validation.
+
+Every placed course of a run (or of an exported .xlsx) becomes one row of
+NumPy arrays: section id, room id, day bitmask, start and end minute.
+Checks then run over the arrays instead of course by course:
+
+- room_conflict: two courses in one room on a shared day at overlapping
+  times (Gym and Aud are shared venues and never conflict)
+- section_overlap: two courses of one section on a shared day at
+  overlapping times
+- pair_adjacency: a lecture whose lab in the same section is not on the
+  DAY_PATTERN_PAIRS pattern in the slot right after it
+- room_class: a course in a room outside its room class (room_pools)
+
+Overlaps are found by sort-and-sweep: rows sorted by (key, start) are
+compared with the row lag places later, for growing lags, until no row
+starts before its lag-neighbour ends. Each lag is one vectorized pass.
+
+Courses an engine could not place are not in a run at all, so they are
+checked against the catalog instead (UnplacedCourses).
+"""
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scheduler import (
+    DAY_PATTERN_PAIRS, RESTRICTED_ROOMS, SLOT_BY_MINUTE, Course, CourseCatalog, SectionSchedule,
+    day_mask, room_pools
+)
+from workbook import iter_sections
+
+ISSUE_KINDS = ["room_conflict", "section_overlap", "pair_adjacency", "room_class"]
+
+
+class Issue(NamedTuple):
+    kind: str
+    section: str
+    code: str
+    room: str
+    days: str
+    time: str
+    detail: str
+
+
+def section_label(section: SectionSchedule) -> str:
+    return f"Group {section.group}: {section.title}"
+
+
+def section_records(sections: Iterable[SectionSchedule]) -> List[Tuple[str, Course]]:
+    return [(section_label(s), c) for s in sections for c in s.courses]
+
+
+def workbook_records(path: str) -> List[Tuple[str, Course]]:
+    """
+    (section label, course) for every course row of an exported workbook.
+    """
+    return section_records(iter_sections(path))
+
+
+def _sweep_overlaps(key: np.ndarray, mask: np.ndarray, start: np.ndarray,
+                    end: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Index pairs (i, j), i != j, with equal key, a shared day and
+    overlapping [start, end) times.
+    """
+    order = np.lexsort((start, key))
+    k, m, s, e = key[order], mask[order], start[order], end[order]
+    first, second = [], []
+    for lag in range(1, len(order)):
+        # Sorted by start within a key, so once nothing at this lag starts
+        # before its neighbour ends, nothing at a larger lag can either
+        close = (k[lag:] == k[:-lag]) & (s[lag:] < e[:-lag])
+        if not close.any():
+            break
+        hit = np.nonzero(close & ((m[lag:] & m[:-lag]) != 0))[0]
+        first.append(order[hit])
+        second.append(order[hit + lag])
+    if not first:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(first), np.concatenate(second)
+
+
+def _first_partners(a: np.ndarray, b: np.ndarray, n: int) -> List[Tuple[int, int, int]]:
+    """
+    One (row, a partner, number of partners) per row in any pair, so a
+    badly overbooked room gives one issue per course rather than per pair.
+    """
+    rows = np.concatenate([a, b])
+    partners = np.concatenate([b, a])
+    counts = np.bincount(rows, minlength=n)
+    first = np.full(n, -1, dtype=np.intp)
+    # Reversed so the earliest pair listing a row wins
+    first[rows[::-1]] = partners[::-1]
+    return [(int(i), int(first[i]), int(counts[i])) for i in np.nonzero(counts)[0]]
+
+
+def _others(count: int) -> str:
+    return f" and {count - 1} more" if count > 1 else ""
+
+
+def validate_records(records: List[Tuple[str, Course]]) -> List[Issue]:
+    n = len(records)
+    if n == 0:
+        return []
+    labels = [label for label, _ in records]
+    courses = [c for _, c in records]
+
+    section_ids, section_names = pd.factorize(pd.Series(labels))
+    room_ids, room_names = pd.factorize(pd.Series([c.room for c in courses]))
+    days_ids, day_patterns = pd.factorize(pd.Series([c.days for c in courses]))
+    masks = np.array([day_mask(d) for d in day_patterns], dtype=np.int64)[days_ids]
+    start = np.fromiter((c.start_minute for c in courses), dtype=np.int64, count=n)
+    end = np.fromiter((c.end_minute for c in courses), dtype=np.int64, count=n)
+
+    issues: List[Issue] = []
+
+    def issue(kind: str, i: int, detail: str):
+        c = courses[i]
+        issues.append(Issue(kind, labels[i], c.code, c.room, c.days, c.time, detail))
+
+    # Room double-bookings, leaving out the shared venues
+    booked = ~np.isin(np.asarray(room_names)[room_ids], list(RESTRICTED_ROOMS))
+    rows = np.nonzero(booked)[0]
+    a, b = _sweep_overlaps(room_ids[rows], masks[rows], start[rows], end[rows])
+    for i, j, count in _first_partners(rows[a], rows[b], n):
+        issue("room_conflict", i, f"{courses[i].room} is also booked for {courses[j].code} "
+                                  f"({labels[j]}){_others(count)}")
+
+    # Courses of one section on top of each other
+    a, b = _sweep_overlaps(section_ids, masks, start, end)
+    for i, j, count in _first_partners(a, b, n):
+        issue("section_overlap", i, f"overlaps {courses[j].code} at {courses[j].days} "
+                                    f"{courses[j].time}{_others(count)}")
+
+    # Lecture and lab of one pair: lab on the paired pattern, in the next slot
+    frame = pd.DataFrame({
+        'row': np.arange(n), 'section': section_ids,
+        'pair': [c.pair_key for c in courses], 'days': [c.days for c in courses],
+        'slot': [SLOT_BY_MINUTE.get(c.start_minute, -2) for c in courses],
+        'is_lec': [c.is_lec for c in courses], 'is_lab': [c.is_lab for c in courses],
+    })
+    lecs = frame[frame['is_lec']]
+    labs = frame[frame['is_lab']]
+    pairs = lecs.merge(labs, on=['section', 'pair'], suffixes=('_lec', '_lab'))
+    if len(pairs):
+        pairs['ok'] = ((pairs['days_lab'] == pairs['days_lec'].map(DAY_PATTERN_PAIRS))
+                       & (pairs['slot_lab'] == pairs['slot_lec'] + 1))
+        matched = pairs.groupby('row_lec')['ok'].any()
+        for i in matched[~matched].index:
+            expected = DAY_PATTERN_PAIRS.get(courses[i].days, "a paired pattern")
+            issue("pair_adjacency", int(i), f"lab is not on {expected} right after the lecture")
+
+    # Rooms outside the course's room class
+    pools = room_pools(frozenset(room_names))
+    allowed = {name: set(pool) for name, pool in pools.items()}
+    class_ids, class_names = pd.factorize(pd.Series([c.template.room_class for c in courses]))
+    combined = class_ids * len(room_names) + room_ids
+    unique, inverse = np.unique(combined, return_inverse=True)
+    ok = np.array([room_names[u % len(room_names)] in allowed[class_names[u // len(room_names)]]
+                   for u in unique], dtype=bool)
+    for i in np.nonzero(~ok[inverse])[0]:
+        issue("room_class", int(i), f"{courses[i].room} is not a "
+                                    f"{class_names[class_ids[i]].lower()} room")
+
+    issues.sort(key=lambda x: (ISSUE_KINDS.index(x.kind), x.section, x.code))
+    return issues
+
+
+def validate_sections(sections: Iterable[SectionSchedule]) -> List[Issue]:
+    return validate_records(section_records(sections))
+
+
+def validate_workbook(path: str) -> List[Issue]:
+    return validate_records(workbook_records(path))
+
+
+############################################
+#            UNPLACED COURSES              #
+############################################
+
+# Longest "Unplaced Courses" Run Info value; Excel cells hold 32767 characters
+MAX_UNPLACED_TEXT = 30000
+
+
+def unplaced_courses(catalog: CourseCatalog, section: SectionSchedule) -> List[Course]:
+    """
+    Catalog courses of section's program, year and trimester that the
+    engine dropped (no eligible room, no free slot, missing lab partner...),
+    matched by code and description so any engine can be checked.
+    """
+    placed = Counter((c.code, c.description) for c in section.courses)
+    missing = []
+    for c in catalog.get_courses(section.program, section.year, section.trimester):
+        key = (c.code, c.description)
+        if placed[key] > 0:
+            placed[key] -= 1
+        else:
+            missing.append(c)
+    return missing
+
+
+class UnplacedCourses:
+    """
+    The courses a run asked for but could not place, gathered section by
+    section as the run streams past.
+    """
+    def __init__(self, catalog: CourseCatalog):
+        self.catalog = catalog
+        self.requested = 0
+        self.by_section: Dict[str, List[str]] = {}
+
+    def add(self, section: SectionSchedule):
+        self.requested += len(self.catalog.get_courses(section.program, section.year,
+                                                       section.trimester))
+        missing = unplaced_courses(self.catalog, section)
+        if missing:
+            self.by_section[section_label(section)] = [c.code for c in missing]
+
+    def track(self, sections: Iterable[SectionSchedule]) -> Iterator[SectionSchedule]:
+        for section in sections:
+            self.add(section)
+            yield section
+
+    @property
+    def count(self) -> int:
+        return sum(len(codes) for codes in self.by_section.values())
+
+    def summary(self) -> str:
+        return f"{self.count} of {self.requested} courses unplaced"
+
+    def lines(self) -> List[str]:
+        return [f"{label}: {', '.join(codes)}" for label, codes in self.by_section.items()]
+
+    def record(self, metadata: Dict[str, object]):
+        """
+        Write the count and, if any, the course list into Run Info metadata.
+        """
+        metadata["Unplaced"] = self.summary()
+        metadata.pop("Unplaced Courses", None)
+        if self.by_section:
+            text = "; ".join(self.lines())
+            if len(text) > MAX_UNPLACED_TEXT:
+                text = text[:MAX_UNPLACED_TEXT] + " ..."
+            metadata["Unplaced Courses"] = text
@@ -0,0 +1,206 @@
+"""
+Round-trip reader for exported schedule workbooks.
+
+Reads back what export_workbook writes: one "Group X" sheet per group
+holding, per section, a title row, the column header row (with an
+INSTRUCTOR column when instructors were assigned), the MWF courses, the
+"End of MWF Schedule" separator, the TTH courses and a blank spacer row,
+plus the key/value "Run Info" sheet.
+
+The workbook is opened read-only and walked once with values-only
+iteration, so no cell objects or sheet model are built and memory stays
+flat however many sections there are. iter_sections yields each
+SectionSchedule as soon as its last row has been read; courses of one
+catalog entry share a single CourseTemplate, as they do after generation.
+"""
+import json
+import re
+import zipfile
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
+
+from export import HEADERS, INSTRUCTOR_HEADER, MWF_SEPARATOR, RUN_INFO_SHEET
+from scheduler import Course, CourseTemplate, SectionSchedule, TimeGrid
+
+GROUP_SHEET_PREFIX = "Group "
+
+# "BSCS, Second Year, First Trimester Section 2B"
+SECTION_TITLE = re.compile(
+    r'^(?P<program>.+), (?P<year>\w+) Year, (?P<trimester>\w+) Trimester '
+    r'Section (?P<number>\d+)(?P<letter>.)$', re.DOTALL
+)
+
+
+class WorkbookFormatError(ValueError):
+    """
+    A row that does not fit the exported layout; sheet and row (1-based)
+    say where.
+    """
+    def __init__(self, sheet: str, row: int, message: str):
+        self.sheet = sheet
+        self.row = row
+        super().__init__(f"{sheet} row {row}: {message}")
+
+
+class Change(NamedTuple):
+    section: str
+    code: str
+    before: Optional[Tuple[str, str, str]]  # (time, days, room), None if added
+    after: Optional[Tuple[str, str, str]]   # None if removed
+
+
+def parse_section_title(title: str) -> Tuple[str, str, str, int]:
+    """
+    (program, year, trimester, section index) of a section title row.
+    """
+    match = SECTION_TITLE.match(str(title))
+    if match is None:
+        raise ValueError(f"Not a section title: {title!r}")
+    return (match['program'], match['year'], match['trimester'],
+            ord(match['letter']) - ord('A'))
+
+
+def open_workbook(path):
+    """
+    Open path (or a binary file object) read-only. Files that are not .xlsx
+    workbooks raise ValueError instead of openpyxl's and zipfile's errors;
+    a missing file still raises OSError.
+    """
+    try:
+        return openpyxl.load_workbook(path, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+        where = f"{path}: " if isinstance(path, str) else ""
+        raise ValueError(f"{where}not an .xlsx workbook ({e})") from None
+
+
+def _text(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _sheet_sections(ws, group: str, templates: Dict[Tuple, CourseTemplate]
+                    ) -> Iterator[SectionSchedule]:
+    section = None
+    title = None
+    columns = len(HEADERS)
+    for number, row in enumerate(ws.iter_rows(values_only=True), start=1):
+        values = [v for v in row if v is not None and v != '']
+        if not values:
+            continue
+        if tuple(row[:len(HEADERS)]) == tuple(HEADERS):
+            if title is None:
+                raise WorkbookFormatError(ws.title, number, "column headers without a section title")
+            if section is not None:
+                yield section
+            try:
+                program, year, trimester, index = parse_section_title(title)
+            except ValueError as e:
+                raise WorkbookFormatError(ws.title, number - 1, str(e)) from None
+            section = SectionSchedule(group, program, year, trimester, index, [])
+            has_instructor = len(row) > len(HEADERS) and row[len(HEADERS)] == INSTRUCTOR_HEADER
+            columns = len(HEADERS) + (1 if has_instructor else 0)
+            title = None
+        elif len(values) == 1 and isinstance(values[0], str) and row[0] is not None:
+            if values[0] != MWF_SEPARATOR:
+                # A title row; the section before it is complete
+                title = values[0]
+        elif section is None:
+            raise WorkbookFormatError(ws.title, number, "course row outside a section")
+        else:
+            code, description, units, time, days, room, *rest = (list(row) + [None] * 7)[:7]
+            instructor = _text(rest[0]) if columns > len(HEADERS) else ''
+            try:
+                key = (_text(code), _text(description), int(units))
+                template = templates.get(key)
+                if template is None:
+                    template = templates[key] = CourseTemplate.create(*key)
+                course = Course.from_template(template, _text(time), _text(days), _text(room),
+                                              instructor)
+            except (TypeError, ValueError, IndexError) as e:
+                raise WorkbookFormatError(ws.title, number, f"bad course row {row!r}: {e}") from None
+            section.courses.append(course)
+    if title is not None:
+        raise WorkbookFormatError(ws.title, number, f"section title {title!r} without column headers")
+    if section is not None:
+        yield section
+
+
+def iter_sections(path: str) -> Iterator[SectionSchedule]:
+    """
+    Every section of an exported workbook, in workbook order, one at a
+    time. The workbook stays open until the iterator is exhausted or closed.
+    """
+    wb = open_workbook(path)
+    try:
+        templates: Dict[Tuple, CourseTemplate] = {}
+        for ws in wb.worksheets:
+            if ws.title.startswith(GROUP_SHEET_PREFIX):
+                yield from _sheet_sections(ws, ws.title[len(GROUP_SHEET_PREFIX):], templates)
+    finally:
+        wb.close()
+
+
+def read_metadata(path: str) -> Dict[str, object]:
+    """
+    The key/value rows of the "Run Info" sheet, or {} without one.
+    """
+    wb = open_workbook(path)
+    try:
+        if RUN_INFO_SHEET not in wb.sheetnames:
+            return {}
+        return {str(row[0]): row[1] if len(row) > 1 else None
+                for row in wb[RUN_INFO_SHEET].iter_rows(values_only=True)
+                if row and row[0] is not None}
+    finally:
+        wb.close()
+
+
+def recorded_time_grid(metadata: Dict[str, object]) -> Optional[TimeGrid]:
+    """
+    The time grid a workbook's Run Info records (see export.run_metadata),
+    or None for the standard grid. Raises ValueError if it is malformed.
+    """
+    recorded = metadata.get("Time Grid")
+    if not recorded:
+        return None
+    config = json.loads(str(recorded))
+    if not isinstance(config, dict):
+        raise ValueError(f"Time Grid must be a JSON object, not {recorded!r}")
+    return TimeGrid.from_config(config)
+
+
+def read_workbook(path: str) -> Tuple[List[SectionSchedule], Dict[str, object]]:
+    return list(iter_sections(path)), read_metadata(path)
+
+
+def _assignments(section: SectionSchedule) -> Dict[Tuple[str, str], List[Tuple[str, str, str]]]:
+    placed: Dict[Tuple[str, str], List[Tuple[str, str, str]]] = {}
+    for c in section.courses:
+        placed.setdefault((c.code, c.description), []).append((c.time, c.days, c.room))
+    return placed
+
+
+def diff_sections(before: List[SectionSchedule], after: List[SectionSchedule]) -> List[Change]:
+    """
+    Course placements added, removed or moved between two runs, matched
+    by group, section title and course.
+    """
+    def by_label(sections):
+        return {f"Group {s.group}: {s.title}": s for s in sections}
+
+    old, new = by_label(before), by_label(after)
+    changes = []
+    for label in list(old) + [label for label in new if label not in old]:
+        was = _assignments(old[label]) if label in old else {}
+        now = _assignments(new[label]) if label in new else {}
+        for key in list(was) + [key for key in now if key not in was]:
+            a, b = sorted(was.get(key, [])), sorted(now.get(key, []))
+            if a == b:
+                continue
+            for k in range(max(len(a), len(b))):
+                placement_before = a[k] if k < len(a) else None
+                placement_after = b[k] if k < len(b) else None
+                if placement_before != placement_after:
+                    changes.append(Change(label, key[0], placement_before, placement_after))
+    return changes